@@ -11,18 +11,24 @@ from collections import defaultdict
 
 from generators.room_generator import generate_room
 from preview.visualizer import render_room_simple
+from preview.contact_sheet import render_contact_sheets
 from validation import validate_room_simple  # type: ignore
 from variation.variator import generate_variations  # type: ignore
+from utils.grid_hash import get_memo, open_memo_file
 
 
-def batch_generate(num_variations=5, filter_impossible=True):
+def batch_generate(num_variations=5, filter_impossible=True, memo_path=None):
     """
     Generate batch of templates with validation and variations
     
     Args:
         num_variations: Number of variations to create per base template
         filter_impossible: Whether to filter out IMPOSSIBLE tier rooms
+        memo_path: Optional file to keep validation results in between runs
     """
+    if memo_path:
+        open_memo_file(memo_path)
+    
     # Create output directory with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     batch_dir = os.path.join("output", f"batch_{timestamp}")
@@ -68,6 +74,9 @@ def batch_generate(num_variations=5, filter_impossible=True):
         'by_shape': defaultdict(lambda: {'total': 0, 'playable': 0})
     }
     
+    # Saved rooms, collected for the contact sheets
+    sheet_entries = []
+    
     # Generate templates
     for shape_config in shapes_config:
         shape = shape_config["shape"]
@@ -103,6 +112,7 @@ def batch_generate(num_variations=5, filter_impossible=True):
                     output_path = os.path.join(batch_dir, filename)
                     render_room_simple(room, output_path)
                     stats['total_saved'] += 1
+                    sheet_entries.append({'room': room, 'id': filename[:-4], 'tier': tier})
                     
                     tier_emoji = {'EASY': '🟢', 'NORMAL': '🔵', 'HARD': '🟠', 'EXPERT': '🔴', 'IMPOSSIBLE': '⚫'}
                     print(f"  ✓ BASE: {filename} - {tier_emoji.get(tier, '❓')} {tier}")
@@ -131,6 +141,7 @@ def batch_generate(num_variations=5, filter_impossible=True):
                                 var_output = os.path.join(batch_dir, var_filename)
                                 render_room_simple(variant, var_output)
                                 stats['total_saved'] += 1
+                                sheet_entries.append({'room': variant, 'id': var_filename[:-4], 'tier': var_tier})
                                 
                                 print(f"    → VAR{i}: {var_tier}")
                         
@@ -141,6 +152,9 @@ def batch_generate(num_variations=5, filter_impossible=True):
                     stats['base_failed'] += 1
                     print(f"  ✗ FAILED: {shape} d{difficulty} {size} - {e}")
     
+    # Pack every saved room into a few contact sheets for review
+    render_contact_sheets(sheet_entries, batch_dir)
+    
     # Print summary statistics
     print_summary(stats, batch_dir)
 
@@ -163,6 +177,9 @@ def print_summary(stats, batch_dir):
     print("\nTOTAL:")
     print(f"  Files saved:      {stats['total_saved']}")
     print(f"  Total playable:   {stats['base_playable'] + stats['variations_playable']}")
+    memo = get_memo()
+    if memo is not None:
+        print(f"  Validations reused: {memo.hits}/{memo.hits + memo.misses}")
     
     print("\nTIER DISTRIBUTION:")
     for tier in ['EASY', 'NORMAL', 'HARD', 'EXPERT', 'IMPOSSIBLE']:
@@ -8,33 +8,84 @@ Useful for generating a variety of content or testing different parameters.
 import os
 import time
 import json
+import shutil
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 
-from world_generator import WorldConfig, generate_world
-from export.json_exporter import export_world
+from world_generator import (
+    WorldConfig, generate_world_graph, iter_world, print_world_summary, regenerate_levels
+)
+from export.json_exporter import (
+    ExportedLevels, export_world, export_world_graph, export_world_levels, load_world
+)
 from preview.visualizer import render_world_spatial
+from preview.world_tiles import render_world_tiles, update_world_tiles
 from presets.preset_manager import PresetManager
+from curation.assembly_index import AssemblyIndex
+from curation.template_library import TemplateLibrary
+
+
+def _tally_levels(levels: Iterable[Dict], totals: Dict[str, float]) -> Iterator[Dict]:
+    """Pass levels through unchanged, adding up the statistics a batch reports"""
+    for level in levels:
+        entities = level['entities']
+        totals['level_count'] += 1
+        totals['total_enemies'] += len(entities.get('enemies', []))
+        totals['total_obstacles'] += len(entities.get('obstacles', []))
+        totals['total_save_points'] += 1 if entities.get('save_point') else 0
+        totals['quality_sum'] += level['stats']['quality_score']
+        yield level
+
+
+def _new_totals() -> Dict[str, float]:
+    return dict.fromkeys(('level_count', 'total_enemies', 'total_obstacles',
+                          'total_save_points', 'quality_sum'), 0)
 
 
 class BatchWorldGenerator:
     """Manages batch generation of multiple worlds."""
     
-    def __init__(self, output_base_dir: str = "output"):
-        """Initialize batch generator."""
+    def __init__(self, output_base_dir: str = "output", library_path: Optional[str] = None):
+        """
+        Initialize batch generator.
+        
+        Args:
+            output_base_dir: Directory worlds are written into
+            library_path: Optional template library (file or catalog) to
+                          assemble worlds from instead of generating every room
+        """
         self.output_base_dir = Path(output_base_dir)
         self.output_base_dir.mkdir(parents=True, exist_ok=True)
         self.preset_manager = PresetManager()
         self.results: List[Dict] = []
+        self.library = None
+        if library_path is not None:
+            self.library = AssemblyIndex(TemplateLibrary.open(library_path))
     
-    def generate_from_preset(self, preset_name: str, verbose: bool = True) -> Dict:
+    def generate_from_preset(self, preset_name: str, verbose: bool = True,
+                             single_map: bool = True, branches: Optional[int] = None) -> Dict:
         """
         Generate a world from a preset configuration.
         
+        Levels are written as they are generated (world_generator.iter_world
+        into export_world) and the world map is then rendered from the
+        exported files, so memory use does not grow with the level count.
+        The map is written as one PNG of the whole world and as map tiles
+        (<world dir>/map_tiles, see preview.world_tiles); the PNG can be
+        skipped for worlds too large to render in one image.
+        
+        A world with branches is built as a graph instead
+        (world_generator.generate_world_graph, always generating its rooms)
+        and exported with export_world_graph, which adds the
+        {name}_graph.json file with precomputed room distances and the
+        critical path.
+        
         Args:
             preset_name: Name of preset file (with or without .json)
             verbose: Print generation progress
+            single_map: Also render the world map as one PNG (map tiles are always written)
+            branches: Number of branches (default: the preset's 'branches')
         
         Returns:
             Dictionary with generation results and statistics
@@ -46,7 +97,7 @@ class BatchWorldGenerator:
         
         # Load preset
         preset = self.preset_manager.load_preset(preset_name)
-        config = preset.to_world_config()
+        config = self.preset_manager.load_world_config(preset_name)
         
         if verbose:
             print(f"Description: {preset.description}")
@@ -54,42 +105,58 @@ class BatchWorldGenerator:
             print(f"Configuration: {preset.level_count} levels, {preset.difficulty_curve} curve, {100-ratio_pct}%H/{ratio_pct}%V")
             print()
         
-        # Generate world
-        start_time = time.time()
-        levels = generate_world(config, verbose=verbose)
-        generation_time = time.time() - start_time
-        
         # Create output directory
         output_dir = self.output_base_dir / preset.name
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Export JSON files
-        if verbose:
-            print(f"\nExporting to {output_dir}...")
-        export_world(levels, str(output_dir), preset.name)
+        if branches is None:
+            branches = preset.branches
+        summary_path = output_dir / f"{preset.name}_summary.json"
+        graph_path = output_dir / f"{preset.name}_graph.json"
+        totals = _new_totals()
+        start_time = time.time()
+        
+        if branches:
+            # Links between branches need the whole world at once
+            levels = generate_world_graph(config, branch_count=branches, verbose=verbose)
+            levels = list(_tally_levels(levels, totals))
+            if verbose:
+                print(f"\nExporting world graph to {output_dir}...")
+            export_world_graph(levels, str(output_dir), preset.name)
+            stale_path = summary_path
+        else:
+            # Generate world, exporting each level's JSON file as it is ready
+            if verbose:
+                print(f"Exporting to {output_dir} as levels are generated...")
+            levels = iter_world(config, verbose=verbose, library=self.library)
+            export_world(_tally_levels(levels, totals), str(output_dir), preset.name)
+            levels = ExportedLevels(str(output_dir), preset.name)
+            stale_path = graph_path
+        generation_time = time.time() - start_time
+        
+        # Drop what an earlier run of the other kind left behind, so
+        # regenerate_preset_levels can tell which kind of world this is
+        if stale_path.exists():
+            stale_path.unlink()
         
-        # Generate world map visualization
-        map_path = output_dir / f"{preset.name}_world_map.png"
         if verbose:
-            print(f"Rendering world map to {map_path}...")
-        render_world_spatial(levels, str(map_path))
+            print()
+            print_world_summary(levels)
         
-        # Calculate statistics
-        total_enemies = sum(len(level['entities'].get('enemies', [])) for level in levels)
-        total_obstacles = sum(len(level['entities'].get('obstacles', [])) for level in levels)
-        total_save_points = sum(1 if level['entities'].get('save_point') else 0 for level in levels)
-        avg_quality = sum(level['stats']['quality_score'] for level in levels) / len(levels)
+        # Generate world map visualization
+        map_files = self._render_world_map(levels, output_dir, preset.name, single_map, verbose)
         
         result = {
             'preset_name': preset.name,
-            'level_count': len(levels),
-            'total_enemies': total_enemies,
-            'total_obstacles': total_obstacles,
-            'total_save_points': total_save_points,
-            'avg_quality': round(avg_quality, 2),
+            'level_count': totals['level_count'],
+            'total_enemies': totals['total_enemies'],
+            'total_obstacles': totals['total_obstacles'],
+            'total_save_points': totals['total_save_points'],
+            'branches': branches,
+            'avg_quality': round(totals['quality_sum'] / totals['level_count'], 2),
             'generation_time': round(generation_time, 2),
             'output_dir': str(output_dir),
-            'files_generated': len(list(output_dir.glob('*.json'))) + 1  # +1 for PNG
+            'files_generated': len(list(output_dir.glob('*.json'))) + map_files
         }
         
         self.results.append(result)
@@ -103,24 +170,80 @@ class BatchWorldGenerator:
             print(f"  - {result['total_save_points']} save points")
             print(f"  - Average quality: {result['avg_quality']}")
             print(f"  - Generation time: {result['generation_time']}s")
-            print(f"  - Files: {result['files_generated']} (JSON + PNG)")
+            print(f"  - Files: {result['files_generated']} (JSON + map)")
             print(f"{'='*80}")
         
         return result
     
-    def generate_all_presets(self, verbose: bool = True, tags: Optional[List[str]] = None):
+    def regenerate_preset_levels(self, preset_name: str, start: int, end: Optional[int] = None,
+                                 verbose: bool = True) -> List[str]:
+        """
+        Regenerate one level (or a range) of a world previously generated from a preset.
+        
+        The door chain stays consistent with the neighboring levels. Only the
+        regenerated level files and the summary are rewritten; the world map
+        is re-rendered and map tiles (in <world dir>/map_tiles) are updated
+        where they are affected.
+        
+        Args:
+            preset_name: Name of preset file the world was generated from
+            start: 0-based index of the first level to regenerate
+            end: 0-based index of the last level to regenerate (default: start)
+            verbose: Print progress
+        
+        Returns:
+            List of rewritten JSON file paths
+        """
+        if end is None:
+            end = start
+        
+        preset = self.preset_manager.load_preset(preset_name)
+        config = self.preset_manager.load_world_config(preset_name)
+        output_dir = self.output_base_dir / preset.name
+        
+        if (output_dir / f"{preset.name}_graph.json").exists():
+            raise ValueError(f"'{preset.name}' was generated with branches; "
+                             f"only linear worlds can have levels regenerated")
+        levels = load_world(str(output_dir), preset.name)
+        
+        if verbose:
+            print(f"Regenerating levels L{start+1:02d}-L{end+1:02d} of '{preset.name}'...")
+        levels[start:end + 1] = regenerate_levels(config, levels, start, end)
+        
+        files = export_world_levels(levels, str(output_dir), preset.name, range(start, end + 1))
+        
+        map_path = output_dir / f"{preset.name}_world_map.png"
+        if map_path.exists():
+            render_world_spatial(levels, str(map_path))
+        
+        tiles_dir = output_dir / "map_tiles"
+        if (tiles_dir / "tiles.json").exists():
+            update_world_tiles(levels, str(tiles_dir), range(start, end + 1))
+        
+        if verbose:
+            for level in levels[start:end + 1]:
+                stats = level['stats']
+                print(f"  {level['level_id']}: {stats['shape']} (Diff {stats['difficulty']}, "
+                      f"Quality {stats['quality_score']:.1f})")
+        
+        return files
+    
+    def generate_all_presets(self, verbose: bool = True, tags: Optional[List[str]] = None,
+                             single_map: bool = True):
         """
         Generate worlds for all available presets.
         
         Args:
             verbose: Print generation progress
             tags: Optional list of tags to filter presets (e.g., ['beginner', 'test'])
+            single_map: Also render each world map as one PNG (map tiles are always written)
         """
         presets = self.preset_manager.list_presets()
         
         # Filter by tags if specified
         if tags:
-            presets = [p for p in presets if any(tag in p['tags'] for tag in tags)]
+            matching = set(self.preset_manager.get_presets_by_tags(tags))
+            presets = [p for p in presets if p['filename'] in matching]
         
         if verbose:
             print(f"\n{'#'*80}")
@@ -133,7 +256,7 @@ class BatchWorldGenerator:
         
         for preset_info in presets:
             try:
-                self.generate_from_preset(preset_info['filename'], verbose=verbose)
+                self.generate_from_preset(preset_info['filename'], verbose=verbose, single_map=single_map)
             except Exception as e:
                 print(f"\nERROR generating {preset_info['name']}: {e}")
                 import traceback
@@ -144,13 +267,15 @@ class BatchWorldGenerator:
         if verbose:
             self.print_summary(total_time)
     
-    def generate_custom_batch(self, configs: List[WorldConfig], verbose: bool = True):
+    def generate_custom_batch(self, configs: List[WorldConfig], verbose: bool = True,
+                              single_map: bool = True):
         """
         Generate worlds from a list of custom WorldConfig objects.
         
         Args:
             configs: List of WorldConfig objects to generate
             verbose: Print generation progress
+            single_map: Also render each world map as one PNG (map tiles are always written)
         """
         if verbose:
             print(f"\n{'#'*80}")
@@ -166,29 +291,31 @@ class BatchWorldGenerator:
                     print(f"[{i}/{len(configs)}] Generating: {config.world_name}")
                     print(f"{'='*80}")
                 
-                start_time = time.time()
-                levels = generate_world(config, verbose=verbose)
-                generation_time = time.time() - start_time
-                
                 # Create output directory
                 output_dir = self.output_base_dir / config.world_name
                 output_dir.mkdir(parents=True, exist_ok=True)
                 
-                # Export
-                export_world(levels, str(output_dir), config.world_name)
-                map_path = output_dir / f"{config.world_name}_world_map.png"
-                render_world_spatial(levels, str(map_path))
+                # Generate and export level by level, then map the exported world
+                totals = _new_totals()
+                start_time = time.time()
+                levels = iter_world(config, verbose=verbose, library=self.library)
+                export_world(_tally_levels(levels, totals), str(output_dir), config.world_name)
+                generation_time = time.time() - start_time
+                
+                levels = ExportedLevels(str(output_dir), config.world_name)
+                if verbose:
+                    print()
+                    print_world_summary(levels)
+                self._render_world_map(levels, output_dir, config.world_name, single_map, verbose)
                 
                 # Statistics
-                total_enemies = sum(len(level['entities'].get('enemies', [])) for level in levels)
-                total_obstacles = sum(len(level['entities'].get('obstacles', [])) for level in levels)
-                avg_quality = sum(level['stats']['quality_score'] for level in levels) / len(levels)
+                avg_quality = totals['quality_sum'] / totals['level_count']
                 
                 result = {
                     'preset_name': config.world_name,
-                    'level_count': len(levels),
-                    'total_enemies': total_enemies,
-                    'total_obstacles': total_obstacles,
+                    'level_count': totals['level_count'],
+                    'total_enemies': totals['total_enemies'],
+                    'total_obstacles': totals['total_obstacles'],
                     'avg_quality': round(avg_quality, 2),
                     'generation_time': round(generation_time, 2),
                     'output_dir': str(output_dir)
@@ -209,6 +336,32 @@ class BatchWorldGenerator:
         if verbose:
             self.print_summary(total_time)
     
+    def _render_world_map(self, levels: ExportedLevels, output_dir: Path, world_name: str,
+                          single_map: bool, verbose: bool) -> int:
+        """
+        Render a world map as map tiles, and optionally as one PNG
+        
+        Map tiles left by an earlier world in the same directory are
+        replaced. A PNG this run doesn't render is left alone, even if an
+        earlier run wrote it (regenerate_preset_levels re-renders it whole).
+        
+        Returns:
+            Number of map outputs written (tile set and PNG)
+        """
+        tiles_dir = output_dir / "map_tiles"
+        shutil.rmtree(tiles_dir, ignore_errors=True)
+        if verbose:
+            print(f"Rendering world map tiles to {tiles_dir}...")
+        render_world_tiles(levels, str(tiles_dir))
+        
+        if not single_map:
+            return 1
+        map_path = output_dir / f"{world_name}_world_map.png"
+        if verbose:
+            print(f"Rendering world map to {map_path}...")
+        render_world_spatial(levels, str(map_path))
+        return 2
+    
     def print_summary(self, total_time: float):
         """Print summary statistics for batch generation."""
         print(f"\n{'#'*80}")
@@ -276,19 +429,33 @@ def main():
     parser.add_argument('--tags', type=str, nargs='+', help='Filter presets by tags')
     parser.add_argument('--quiet', action='store_true', help='Suppress verbose output')
     parser.add_argument('--output', type=str, default='output', help='Output directory')
+    parser.add_argument('--regenerate', type=str, metavar='N[-M]',
+                        help='With --preset: regenerate level N (or levels N-M, 1-based) of an existing world')
+    parser.add_argument('--library', type=str, metavar='PATH',
+                        help='Assemble worlds from a template library (file or catalog JSON)')
+    parser.add_argument('--no-single-map', dest='single_map', action='store_false',
+                        help='Skip the one-PNG world map, for very large worlds (map tiles are always written)')
+    parser.add_argument('--branches', type=int, metavar='N',
+                        help="With --preset: add N branching side paths (overrides the preset's 'branches')")
     
     args = parser.parse_args()
     
-    generator = BatchWorldGenerator(output_base_dir=args.output)
+    generator = BatchWorldGenerator(output_base_dir=args.output, library_path=args.library)
     verbose = not args.quiet
     
     if args.all:
         # Generate all presets
-        generator.generate_all_presets(verbose=verbose, tags=args.tags)
+        generator.generate_all_presets(verbose=verbose, tags=args.tags, single_map=args.single_map)
+    
+    elif args.preset and args.regenerate:
+        # Regenerate part of an existing world
+        first, _, last = args.regenerate.partition('-')
+        generator.regenerate_preset_levels(args.preset, int(first) - 1, int(last or first) - 1, verbose=verbose)
     
     elif args.preset:
         # Generate specific preset
-        generator.generate_from_preset(args.preset, verbose=verbose)
+        generator.generate_from_preset(args.preset, verbose=verbose, single_map=args.single_map,
+                                       branches=args.branches)
     
     else:
         # Default: generate a selection of presets for demonstration
@@ -298,7 +465,7 @@ def main():
         
         selected = ['ShortTest', 'CaveWorld', 'TowerClimb']
         for preset_name in selected:
-            generator.generate_from_preset(preset_name, verbose=verbose)
+            generator.generate_from_preset(preset_name, verbose=verbose, single_map=args.single_map)
 
 
 if __name__ == '__main__':
@@ -20,6 +20,8 @@ from validation.validator_simple import validate_room_simple
 from validation.quality import score_room_quality
 from validation.spawn_zones import assign_spawn_zones_to_room
 from curation.template_library import TemplateLibrary
+from utils.grid_hash import get_memo, open_memo_file
+from preview.contact_sheet import render_library_contact_sheets
 
 
 # Configuration for room generation
@@ -120,6 +122,11 @@ def curate_library(
     print(f"  Failed quality threshold: {failed_quality}")
     print()
     
+    # Drop near-identical rooms before ranking
+    removed = library.remove_duplicates()
+    if removed:
+        print(f"Removed {removed} near-duplicate templates")
+    
     # Keep only top N
     if len(library.templates) > keep_count:
         print(f"Keeping top {keep_count} templates by quality...")
@@ -145,9 +152,16 @@ def main():
                         help='Enable A* pathfinding validation (slower but more accurate)')
     parser.add_argument('--output', type=str, default='output/template_catalog.json',
                         help='Output catalog file (default: output/template_catalog.json)')
+    parser.add_argument('--contact-sheets', type=str, default=None, metavar='DIR',
+                        help='Also render labeled thumbnail contact sheets into DIR')
+    parser.add_argument('--memo', type=str, default=None, metavar='FILE',
+                        help='Keep validation/quality results in FILE between runs')
     
     args = parser.parse_args()
     
+    if args.memo:
+        open_memo_file(args.memo)
+    
     # Generate library
     start_time = datetime.now()
     
@@ -169,6 +183,9 @@ def main():
     
     print(f"Total templates: {stats['total']}")
     print(f"Average quality: {stats['avg_quality']}")
+    memo = get_memo()
+    if memo is not None:
+        print(f"Memoized results reused: {memo.hits}/{memo.hits + memo.misses}")
     print()
     
     print("By Difficulty Tier:")
@@ -190,6 +207,10 @@ def main():
     print(f"Exporting catalog to {args.output}...")
     library.export_catalog(args.output)
     
+    if args.contact_sheets:
+        print(f"Rendering contact sheets to {args.contact_sheets}...")
+        render_library_contact_sheets(library, args.contact_sheets)
+    
     print()
     print("=" * 60)
     print(f"Curation complete in {elapsed:.1f}s")
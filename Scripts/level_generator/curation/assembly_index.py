@@ -0,0 +1,248 @@
+"""
+Room lookup index for assembling worlds from a template library
+
+Library templates are bucketed by what a world level asks for:
+
+    (shape, entrance direction, exit direction, difficulty tier, size)
+
+Each bucket lists its templates best quality first, so picking a room for
+a level is a dict lookup plus a short scan. Mirrored variants are indexed
+too: a horizontal_right template also serves horizontal_left levels, a
+vertical_up template serves vertical_down levels, and a box template
+serves the level with its left/right doors swapped. Variants are only
+built when picked.
+
+Given the exit the player comes from, rooms are also looked up by door
+signature (utils.door_signature): each bucket gets a secondary index from
+entrance opening row to templates, built the first time the bucket is
+asked for a door match, so finding rooms whose entrance lines up with the
+previous exit is a lookup per opening row.
+"""
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import config
+from curation.template_library import TemplateLibrary
+from generators.shape_generators import vertical_down
+from utils.door_signature import DoorSignature, compute_door_signature, doors_compatible
+from utils.room_template import RoomTemplate
+from variation import transforms
+
+# (shape, entrance direction, exit direction, tier, size)
+AssemblyKey = Tuple[str, str, str, str, str]
+
+TIERS = ['EASY', 'NORMAL', 'HARD', 'EXPERT']
+
+# Door sides of the directional shapes (boxes store theirs per room)
+SHAPE_DOORS = {
+    'horizontal_right': ('left', 'right'),
+    'horizontal_left': ('right', 'left'),
+    'vertical_up': ('down', 'up'),
+    'vertical_down': ('up', 'down')
+}
+
+# Transforms a template can be served through
+MIRROR = 'mirror'  # Left-right mirror
+FLIP = 'flip'      # vertical_up -> vertical_down
+
+_MIRROR_SHAPES = {'horizontal_right': 'horizontal_left', 'horizontal_left': 'horizontal_right',
+                  'box': 'box'}
+_FLIP_SHAPES = {'vertical_up': 'vertical_down'}
+
+
+def difficulty_tier(difficulty: int) -> str:
+    """
+    Map a level difficulty (1-10) to the validator's difficulty tier
+    
+    Returns:
+        'EASY' (1-3), 'NORMAL' (4-5), 'HARD' (6-7) or 'EXPERT' (8-10)
+    """
+    if difficulty <= 3:
+        return 'EASY'
+    elif difficulty <= 5:
+        return 'NORMAL'
+    elif difficulty <= 7:
+        return 'HARD'
+    return 'EXPERT'
+
+
+def size_for_dimensions(shape: str, width: int, height: int) -> Optional[str]:
+    """Get the size name a room's dimensions correspond to, or None"""
+    for size, dimensions in config.SIZE_DIMENSIONS.get(shape, {}).items():
+        if dimensions == (width, height):
+            return size
+    return None
+
+
+class AssemblyIndex:
+    """
+    Index of library templates by level requirements
+    
+    Usage:
+        index = AssemblyIndex(TemplateLibrary.open("library.lib"))
+        picked = index.select('box', 'left', 'up', difficulty=6, size='medium')
+        if picked is not None:
+            room, validation, quality = picked
+    """
+    
+    def __init__(self, library: TemplateLibrary, min_quality: Optional[float] = None):
+        """
+        Build the index
+        
+        Directional shapes are indexed from catalog fields alone; box
+        templates are loaded once to read their door sides. IMPOSSIBLE
+        templates and rooms whose dimensions match no configured size are
+        left out.
+        
+        Args:
+            library: Template library to pick rooms from
+            min_quality: Skip templates below this quality score
+        """
+        self.library = library
+        self.buckets: Dict[AssemblyKey, List[Tuple[int, Optional[str]]]] = {}
+        # Per bucket: entrance signature per entry and opening row -> entry indices
+        self._door_indexes: Dict[AssemblyKey, Tuple[List[DoorSignature], Dict[int, List[int]]]] = {}
+        
+        templates = library.templates
+        order = sorted(range(len(templates)), key=lambda i: templates[i]['quality_score'], reverse=True)
+        for position in order:
+            t = templates[position]
+            if t['tier'] not in TIERS:
+                continue
+            if min_quality is not None and t['quality_score'] < min_quality:
+                continue
+            size = size_for_dimensions(t['shape'], t['width'], t['height'])
+            if size is None:
+                continue
+            
+            shape = t['shape']
+            if shape == 'box':
+                connections = t['room'].connections
+                if 'entrance' not in connections or 'exit' not in connections:
+                    continue
+                doors = (connections['entrance']['direction'], connections['exit']['direction'])
+            elif shape in SHAPE_DOORS:
+                doors = SHAPE_DOORS[shape]
+            else:
+                continue
+            
+            self._add(shape, doors, t['tier'], size, position, None)
+            if shape in _MIRROR_SHAPES:
+                mirrored = tuple(transforms.MIRROR_H_DIRECTIONS[d] for d in doors)
+                self._add(_MIRROR_SHAPES[shape], mirrored, t['tier'], size, position, MIRROR)
+            if shape in _FLIP_SHAPES:
+                self._add(_FLIP_SHAPES[shape], SHAPE_DOORS[_FLIP_SHAPES[shape]], t['tier'], size,
+                          position, FLIP)
+    
+    def _add(self, shape: str, doors: Tuple[str, str], tier: str, size: str,
+             position: int, transform: Optional[str]):
+        key = (shape, doors[0], doors[1], tier, size)
+        self.buckets.setdefault(key, []).append((position, transform))
+    
+    def __len__(self) -> int:
+        return len(self.buckets)
+    
+    def candidates(self, shape: str, entrance_dir: str, exit_dir: str, tier: str,
+                   size: str) -> List[Tuple[int, Optional[str]]]:
+        """Get the (template position, transform) entries of one bucket, best first"""
+        return self.buckets.get((shape, entrance_dir, exit_dir, tier, size), [])
+    
+    def _door_index(self, key: AssemblyKey) -> Tuple[List[DoorSignature], Dict[int, List[int]]]:
+        """Get (building on first use) the entrance door index of a bucket"""
+        door_index = self._door_indexes.get(key)
+        if door_index is None:
+            templates = self.library.templates
+            signatures = []
+            by_row: Dict[int, List[int]] = {}
+            for entry_index, (position, transform) in enumerate(self.buckets.get(key, ())):
+                room = self._build(templates[position], transform)[0] if transform else templates[position]['room']
+                signature = compute_door_signature(room, 'entrance')
+                signatures.append(signature)
+                for row in signature.rows():
+                    by_row.setdefault(row, []).append(entry_index)
+            door_index = (signatures, by_row)
+            self._door_indexes[key] = door_index
+        return door_index
+    
+    def compatible(self, key: AssemblyKey, after: DoorSignature) -> List[Tuple[int, Optional[str]]]:
+        """
+        Get the entries of a bucket whose entrance lines up with an exit
+        
+        Args:
+            key: Bucket key
+            after: Signature of the exit the player comes through
+        
+        Returns:
+            (template position, transform) entries, best first
+        """
+        signatures, by_row = self._door_index(key)
+        matches = set()
+        for row in after.rows():
+            matches.update(by_row.get(row, ()))
+        entries = self.buckets[key]
+        return [entries[i] for i in sorted(matches) if doors_compatible(after, signatures[i])]
+    
+    def select(self, shape: str, entrance_dir: str, exit_dir: str, difficulty: int,
+               size: str, exclude: Optional[Set[str]] = None, choices: int = 3,
+               after: Optional[DoorSignature] = None) -> Optional[Tuple[RoomTemplate, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Pick a library room for a level
+        
+        The level's own tier is tried first, then the nearest tiers. Within
+        a tier one of the best `choices` templates not yet used is picked at
+        random; used templates are only picked again when nothing else fits.
+        With `after`, rooms whose entrance lines up with that exit are
+        preferred over closer tiers; if none does, any room is picked.
+        
+        Args:
+            shape: Level shape type
+            entrance_dir: Side of the entrance door
+            exit_dir: Side of the exit door
+            difficulty: Level difficulty (1-10)
+            size: Level size
+            exclude: Template ids already used (picked ids are added)
+            choices: Number of top templates to pick among
+            after: Signature of the previous room's exit
+        
+        Returns:
+            (room copy, validation, quality), or None if no template fits
+        """
+        target = TIERS.index(difficulty_tier(difficulty))
+        keys = [(shape, entrance_dir, exit_dir, TIERS[i], size)
+                for i in sorted(range(len(TIERS)), key=lambda i: (abs(i - target), i))]
+        keys = [key for key in keys if key in self.buckets]
+        if not keys:
+            return None
+        
+        entries = None
+        if after is not None:
+            for key in keys:
+                entries = self.compatible(key, after)
+                if entries:
+                    break
+        if not entries:
+            entries = self.buckets[keys[0]]
+        
+        templates = self.library.templates
+        if exclude is not None:
+            unused = [e for e in entries if templates[e[0]]['id'] not in exclude]
+            entries = unused or entries
+        position, transform = random.choice(entries[:choices])
+        
+        template = templates[position]
+        if exclude is not None:
+            exclude.add(template['id'])
+        return self._build(template, transform)
+    
+    def _build(self, template: Dict[str, Any],
+               transform: Optional[str]) -> Tuple[RoomTemplate, Dict[str, Any], Dict[str, Any]]:
+        """Get a fresh room (transformed if needed) with its validation and quality"""
+        room = template['room']
+        if transform == MIRROR:
+            # Left-right mirroring keeps every jump, so the scores still hold
+            return transforms.mirror_horizontal(room), template['validation'], template['quality']
+        if transform == FLIP:
+            # Going down is a different climb; let the caller re-score
+            return vertical_down.from_vertical_up(room), None, None
+        return room.copy(), template['validation'], template['quality']
+
@@ -0,0 +1,164 @@
+"""
+Lazy template loading for TemplateLibrary
+
+A lazily loaded library only reads catalog data up front (id, shape,
+tier, quality, tags, dimensions and the feature counts catalogs list). The heavy parts of a template - the
+RoomTemplate and its full validation/quality dicts - are loaded from the
+source on first access and kept in a shared LRU cache, so filtering and
+listing never touch tile data and memory stays bounded.
+
+Sources:
+- LibraryFileSource: a single-file library (curation.library_file)
+- CatalogSource: a catalog from TemplateLibrary.export_catalog plus the
+  per-room JSON files from export_library_to_json_batch
+"""
+import json
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Tuple
+
+from curation.library_file import LibraryFile
+from export.json_exporter import import_room_from_json, room_from_json
+
+# Keys that are loaded on demand rather than stored in the template dict
+LAZY_KEYS = ('room', 'validation', 'quality')
+
+
+class RoomCache:
+    """
+    LRU cache of hydrated templates, shared by all templates of a library
+    
+    Entries are (room, validation, quality) tuples keyed by source key.
+    """
+    
+    def __init__(self, source, max_size: int = 256):
+        """
+        Args:
+            source: Object with a load(key) -> (room, validation, quality) method
+            max_size: Maximum number of hydrated templates kept in memory
+        """
+        self.source = source
+        self.max_size = max_size
+        self.entries: "OrderedDict[Hashable, Tuple[Any, Dict, Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Tuple[Any, Dict, Dict]:
+        """Get a hydrated template, loading it from the source on a miss"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        
+        self.misses += 1
+        entry = self.source.load(key)
+        self.entries[key] = entry
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return entry
+
+
+class LazyTemplate(dict):
+    """
+    Template dict whose 'room', 'validation' and 'quality' load on access
+    
+    Catalog keys ('id', 'tags', 'shape', 'tier', 'quality_score', 'width',
+    'height', 'spike_count', 'platform_count', 'floor_coverage') are stored
+    normally. The lazy keys are served from the
+    library's RoomCache on every access instead of being stored, so the
+    cache alone decides what stays in memory.
+    """
+    
+    __slots__ = ('cache', 'key')
+    
+    def __init__(self, cache: RoomCache, key: Hashable, catalog: Dict[str, Any]):
+        super().__init__(catalog)
+        self.cache = cache
+        self.key = key
+    
+    def __missing__(self, name: str) -> Any:
+        if name in LAZY_KEYS:
+            return self.cache.get(self.key)[LAZY_KEYS.index(name)]
+        raise KeyError(name)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in LAZY_KEYS or super().__contains__(name)
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in LAZY_KEYS:
+            return self[name]
+        return super().get(name, default)
+
+
+class LibraryFileSource:
+    """Templates stored in a single-file library"""
+    
+    def __init__(self, filename: str):
+        self.library_file = LibraryFile(filename)
+    
+    def catalog(self) -> Iterator[Tuple[Hashable, Dict[str, Any]]]:
+        """Yield (key, catalog dict) for every template (record table only)"""
+        for index in range(len(self.library_file)):
+            record = self.library_file.record(index)
+            yield index, {
+                'id': record['id'],
+                'tags': record['tags'],
+                'shape': record['shape'],
+                'tier': record['tier'],
+                'quality_score': record['quality'],
+                'width': record['width'],
+                'height': record['height'],
+                'spike_count': record['spike_count'],
+                'platform_count': record['platform_count'],
+                'floor_coverage': record['floor_coverage']
+            }
+    
+    def load(self, index: int) -> Tuple[Any, Dict, Dict]:
+        template = self.library_file.load_template(index)
+        return template['room'], template['validation'], template['quality']
+    
+    def close(self) -> None:
+        self.library_file.close()
+
+
+class CatalogSource:
+    """Templates listed in a JSON catalog, with one JSON file per room"""
+    
+    def __init__(self, catalog_filename: str, rooms_dir: str = None, prefix: str = "room"):
+        """
+        Args:
+            catalog_filename: Catalog written by TemplateLibrary.export_catalog
+            rooms_dir: Directory of room files from export_library_to_json_batch
+                       (default: the catalog's directory)
+            prefix: Filename prefix used for the room files
+        """
+        with open(catalog_filename, 'r') as f:
+            self.entries = json.load(f)['templates']
+        self.rooms_dir = rooms_dir if rooms_dir is not None else os.path.dirname(catalog_filename)
+        self.prefix = prefix
+    
+    def catalog(self) -> Iterator[Tuple[Hashable, Dict[str, Any]]]:
+        """Yield (key, catalog dict) for every catalog entry"""
+        for entry in self.entries:
+            filename = f"{self.prefix}_{entry['shape']}_{entry['id']}.json"
+            yield os.path.join(self.rooms_dir, filename), {
+                'id': entry['id'],
+                'tags': [sys.intern(tag) for tag in entry['tags']],
+                'shape': sys.intern(entry['shape']),
+                'tier': sys.intern(entry['tier']),
+                'quality_score': entry['quality'],
+                'width': entry['dimensions']['width'],
+                'height': entry['dimensions']['height'],
+                'spike_count': entry['features']['spike_count'],
+                'platform_count': entry['features']['platform_count'],
+                'floor_coverage': entry['features']['floor_coverage']
+            }
+    
+    def load(self, filepath: str) -> Tuple[Any, Dict, Dict]:
+        data = import_room_from_json(filepath)
+        return room_from_json(data), data.get('validation', {}), data.get('quality', {})
+    
+    def close(self) -> None:
+        pass
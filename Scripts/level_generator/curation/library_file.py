@@ -0,0 +1,299 @@
+"""
+Single-file, memory-mappable template library format
+
+Layout (all integers little-endian):
+    
+    header      fixed size, see HEADER
+    blobs       per room: packed tiles (width * height bytes, row-major)
+                followed by a JSON blob (room metadata, connections,
+                spawn zones, validation and quality dicts)
+    records     fixed-size metadata table, one RECORD per room
+    strings     JSON string table: shape/tier names records refer to by
+                index, and tag names in tag bitmask order
+
+Opening a file only reads the header and the string table; each room's
+record and blobs are read from the memory map when that room is fetched.
+"""
+import json
+import mmap
+import struct
+import sys
+from typing import Any, Dict, List, Optional
+
+from utils.room_template import RoomTemplate
+
+MAGIC = b'LMNTLIB1'
+FORMAT_VERSION = 2
+
+# magic, version, record size, room count, records offset, strings offset, strings length
+HEADER = struct.Struct('<8sHHIQQQ')
+
+# id, width, height, shape index, tier index, quality, tag bitmask,
+# tiles offset, tiles length, json offset, json length,
+# spike count, platform count, floor coverage
+RECORD = struct.Struct('<16sHHHHdQQIQIHHd')
+
+MAX_TAGS = 64  # One bit per distinct tag in the record bitmask
+
+
+def write_library_file(templates: List[Dict], filename: str) -> None:
+    """
+    Write templates to a single-file library
+    
+    Args:
+        templates: Template dicts (as stored by TemplateLibrary)
+        filename: Output file path
+    
+    Raises:
+        ValueError: If the templates use more than MAX_TAGS distinct tags
+    """
+    strings: List[str] = []
+    string_index: Dict[str, int] = {}
+    tag_bits: Dict[str, int] = {}
+    
+    def intern_string(value: str) -> int:
+        if value not in string_index:
+            string_index[value] = len(strings)
+            strings.append(value)
+        return string_index[value]
+    
+    records = []
+    
+    with open(filename, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        offset = HEADER.size
+        
+        for t in templates:
+            room = t['room']
+            tiles = room.tile_bytes()
+            
+            data = room.to_json()
+            data['tilemap'] = {'width': room.width, 'height': room.height}
+            data['library'] = {'validation': t['validation'], 'quality': t['quality']}
+            blob = json.dumps(data, separators=(',', ':')).encode('utf-8')
+            
+            tag_mask = 0
+            for tag in t['tags']:
+                if tag not in tag_bits:
+                    if len(tag_bits) >= MAX_TAGS:
+                        raise ValueError(f"Library file supports at most {MAX_TAGS} distinct tags")
+                    tag_bits[tag] = len(tag_bits)
+                tag_mask |= 1 << tag_bits[tag]
+            
+            room_id = t['id'].encode('utf-8')
+            if len(room_id) > 16:
+                raise ValueError(f"Room ID {t['id']!r} is longer than 16 bytes")
+            
+            records.append(RECORD.pack(
+                room_id,
+                room.width,
+                room.height,
+                intern_string(t['shape']),
+                intern_string(t['tier']),
+                t['quality_score'],
+                tag_mask,
+                offset, len(tiles),
+                offset + len(tiles), len(blob),
+                t['spike_count'], t['platform_count'], t['floor_coverage']
+            ))
+            
+            f.write(tiles)
+            f.write(blob)
+            offset += len(tiles) + len(blob)
+        
+        records_offset = offset
+        f.write(b''.join(records))
+        
+        # Tags are listed in bit order so readers can decode the bitmask
+        table = json.dumps({
+            'strings': strings,
+            'tags': sorted(tag_bits, key=tag_bits.get)
+        }, separators=(',', ':')).encode('utf-8')
+        strings_offset = records_offset + len(records) * RECORD.size
+        f.write(table)
+        
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, len(records),
+                            records_offset, strings_offset, len(table)))
+
+
+class LibraryFile:
+    """
+    Read-only, memory-mapped view of a library file
+    
+    Usage:
+        with LibraryFile("library.lmlib") as lib:
+            info = lib.record(0)
+            template = lib.load_template(0)
+    """
+    
+    def __init__(self, filename: str):
+        """
+        Open a library file
+        
+        Args:
+            filename: Path to a file written by write_library_file
+        
+        Raises:
+            ValueError: If the file is not a library file of a supported version
+        """
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"{filename} is not a template library file")
+        
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{filename} is not a template library file")
+        
+        (magic, version, record_size, self.count,
+         self._records_offset, strings_offset, strings_length) = HEADER.unpack_from(self._map, 0)
+        
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{filename} is not a template library file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported library file version {version} in {filename}")
+        
+        table = json.loads(self._map[strings_offset:strings_offset + strings_length])
+        self.strings: List[str] = [sys.intern(s) for s in table['strings']]
+        self.tags: List[str] = [sys.intern(s) for s in table['tags']]
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __enter__(self) -> 'LibraryFile':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release the memory map and file handle"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if not self._file.closed:
+            self._file.close()
+    
+    def _raw_record(self, index: int) -> tuple:
+        if not 0 <= index < self.count:
+            raise IndexError(f"Room index {index} out of range for library of {self.count}")
+        return RECORD.unpack_from(self._map, self._records_offset + index * RECORD.size)
+    
+    def decode_tags(self, tag_mask: int) -> List[str]:
+        """Convert a record tag bitmask to tag strings"""
+        return [tag for bit, tag in enumerate(self.tags) if tag_mask >> bit & 1]
+    
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Get the metadata record of one room (no tile or JSON data is read)
+        
+        Args:
+            index: Room index (0 to len - 1)
+        
+        Returns:
+            Dict with id, shape, tier, quality, tags, width, height,
+            spike_count, platform_count and floor_coverage
+        """
+        (room_id, width, height, shape_ix, tier_ix, quality, tag_mask,
+         _, _, _, _, spike_count, platform_count, floor_coverage) = self._raw_record(index)
+        return {
+            'id': room_id.rstrip(b'\0').decode('utf-8'),
+            'shape': self.strings[shape_ix],
+            'tier': self.strings[tier_ix],
+            'quality': quality,
+            'tags': self.decode_tags(tag_mask),
+            'width': width,
+            'height': height,
+            'spike_count': spike_count,
+            'platform_count': platform_count,
+            'floor_coverage': floor_coverage
+        }
+    
+    def read_tiles(self, index: int) -> bytes:
+        """
+        Read one room's packed tiles (row-major, one byte per tile)
+        
+        Args:
+            index: Room index
+        
+        Returns:
+            width * height bytes
+        """
+        record = self._raw_record(index)
+        tiles_offset, tiles_length = record[7], record[8]
+        return self._map[tiles_offset:tiles_offset + tiles_length]
+    
+    def load_room(self, index: int) -> RoomTemplate:
+        """
+        Load one room as a RoomTemplate
+        
+        Args:
+            index: Room index
+        
+        Returns:
+            RoomTemplate (the room's validation/quality dicts are discarded;
+            use load_template to keep them)
+        """
+        return self.load_template(index)['room']
+    
+    def load_template(self, index: int) -> Dict[str, Any]:
+        """
+        Load one room as a TemplateLibrary template dict
+        
+        Only this room's record, tiles and JSON blob are read.
+        
+        Args:
+            index: Room index
+        
+        Returns:
+            Dict with 'room', 'validation', 'quality', 'tags', 'id' and the
+            catalog fields ('shape', 'tier', 'quality_score', 'width', 'height',
+            'spike_count', 'platform_count', 'floor_coverage')
+        """
+        (room_id, width, height, shape_ix, tier_ix, quality, tag_mask,
+         tiles_offset, tiles_length, json_offset, json_length,
+         spike_count, platform_count, floor_coverage) = self._raw_record(index)
+        
+        data = json.loads(self._map[json_offset:json_offset + json_length])
+        tiles = self._map[tiles_offset:tiles_offset + tiles_length]
+        data['tilemap']['tiles'] = [tiles[y * width:(y + 1) * width] for y in range(height)]
+        library = data.pop('library')
+        
+        return {
+            'room': RoomTemplate.from_json(data),
+            'validation': library['validation'],
+            'quality': library['quality'],
+            'tags': self.decode_tags(tag_mask),
+            'id': room_id.rstrip(b'\0').decode('utf-8'),
+            'shape': self.strings[shape_ix],
+            'tier': self.strings[tier_ix],
+            'quality_score': quality,
+            'width': width,
+            'height': height,
+            'spike_count': spike_count,
+            'platform_count': platform_count,
+            'floor_coverage': floor_coverage
+        }
+    
+    def find(self, room_id: str) -> Optional[int]:
+        """
+        Find the index of a room by ID (scans the record table only)
+        
+        Args:
+            room_id: Room ID
+        
+        Returns:
+            Room index, or None if not present
+        """
+        key = room_id.encode('utf-8')
+        for index in range(self.count):
+            if self._raw_record(index)[0].rstrip(b'\0') == key:
+                return index
+        return None
@@ -0,0 +1,133 @@
+"""
+Secondary indexes for fast template library queries
+
+Templates are ranked by quality and every index is a bitset (a Python
+int) over those ranks:
+- tier, shape and tag inverted indexes map each value to a bitset
+- a quality range is a contiguous run of ranks, so its bitset is a mask
+
+A filter is then an AND of a few ints, and the matching templates are
+read off the set bits.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+
+def _bit_positions(bits: int) -> List[int]:
+    """Get the positions of the set bits in an int, lowest first"""
+    positions = []
+    if not bits:
+        return positions
+    
+    # Walk 64-bit words, skipping empty ones, and peel bits off small ints
+    # (words are decoded little-endian explicitly, whatever the host order)
+    data = bits.to_bytes((bits.bit_length() + 63) // 64 * 8, 'little')
+    for base in range(0, len(data) * 8, 64):
+        word = int.from_bytes(data[base // 8:base // 8 + 8], 'little')
+        while word:
+            low = word & -word
+            positions.append(base + low.bit_length() - 1)
+            word ^= low
+    return positions
+
+
+def _bits_from_positions(positions: Iterable[int], size: int) -> int:
+    """Build an int with the given bit positions set"""
+    data = bytearray((size + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, 'little')
+
+
+class TemplateIndex:
+    """
+    Read-only query index over a list of template dicts
+    
+    The index is a snapshot: it is rebuilt (by TemplateLibrary) when the
+    library's revision changes.
+    """
+    
+    def __init__(self, templates: List[Dict], revision: int = 0):
+        """
+        Build the index
+        
+        Args:
+            templates: Template dicts (as stored by TemplateLibrary)
+            revision: TemplateLibrary.revision the templates were read at
+        """
+        self.templates = templates
+        self.revision = revision
+        self.size = len(templates)
+        
+        # Rank templates by quality; bit r of every bitset is order[r]
+        qualities = [t['quality_score'] for t in templates]
+        self.order = sorted(range(self.size), key=qualities.__getitem__)
+        self.qualities = [qualities[i] for i in self.order]
+        self.all_bits = (1 << self.size) - 1
+        
+        # Collect ranks per value, then pack each list into one bitset
+        tier_ranks: Dict[str, List[int]] = {}
+        shape_ranks: Dict[str, List[int]] = {}
+        tag_ranks: Dict[str, List[int]] = {}
+        
+        for rank, position in enumerate(self.order):
+            t = templates[position]
+            tier_ranks.setdefault(t['tier'], []).append(rank)
+            shape_ranks.setdefault(t['shape'], []).append(rank)
+            for tag in t['tags']:
+                tag_ranks.setdefault(tag, []).append(rank)
+        
+        size = self.size
+        self.by_tier = {k: _bits_from_positions(v, size) for k, v in tier_ranks.items()}
+        self.by_shape = {k: _bits_from_positions(v, size) for k, v in shape_ranks.items()}
+        self.by_tag = {k: _bits_from_positions(v, size) for k, v in tag_ranks.items()}
+    
+    def is_current(self, templates: List[Dict], revision: int) -> bool:
+        """Check whether this index still describes the given template list and revision"""
+        return templates is self.templates and revision == self.revision
+    
+    def quality_bits(self, min_quality: Optional[float] = None,
+                     max_quality: Optional[float] = None) -> int:
+        """
+        Get the bitset of templates within a quality range (inclusive)
+        """
+        low = 0 if min_quality is None else bisect_left(self.qualities, min_quality)
+        high = self.size if max_quality is None else bisect_right(self.qualities, max_quality)
+        if low >= high:
+            return 0
+        return ((1 << high) - 1) ^ ((1 << low) - 1)
+    
+    def query(self, min_quality: Optional[float] = None,
+              max_quality: Optional[float] = None,
+              tier: Optional[str] = None,
+              tags: Optional[Iterable[str]] = None,
+              shape: Optional[str] = None) -> int:
+        """
+        Get the bitset of templates matching all given criteria
+        
+        Returns:
+            Bitset over quality ranks (use positions() to decode)
+        """
+        bits = self.all_bits
+        if min_quality is not None or max_quality is not None:
+            bits = self.quality_bits(min_quality, max_quality)
+        if tier is not None:
+            bits &= self.by_tier.get(tier, 0)
+        if shape is not None:
+            bits &= self.by_shape.get(shape, 0)
+        if tags is not None:
+            for tag in tags:
+                if not bits:
+                    break
+                bits &= self.by_tag.get(tag, 0)
+        return bits
+    
+    def positions(self, bits: int) -> List[int]:
+        """
+        Decode a bitset into template list positions
+        
+        Returns:
+            Positions into the template list, in list order
+        """
+        order = self.order
+        return sorted(order[rank] for rank in _bit_positions(bits))
@@ -0,0 +1,290 @@
+"""
+Tile-grid similarity for near-duplicate detection
+
+Rooms are compared by the Jaccard similarity of their non-empty interior
+cells, where a cell only matches if it has the same position and tile
+ID. The border ring (boundary walls, and the floor's bottom row) is the
+same in nearly every room of a shape, so it is left out of both the
+signature and the exact similarity. Each room gets a MinHash signature of
+that cell set (one-permutation hashing: one hash per cell, 64 bins) and
+signatures are banded into an LSH index, so finding near-duplicates only
+compares rooms that share a band instead of all pairs. The banding is
+picked from the similarity threshold being searched for (lsh_banding).
+"""
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+SIGNATURE_BINS = 64
+LSH_BANDS = 8  # Default banding (find_similar), tuned for ~0.95
+LSH_ROWS = SIGNATURE_BINS // LSH_BANDS
+LSH_RECALL = 0.99  # Chance a pair at the threshold must become a candidate
+
+_BIN_BITS = 6  # log2(SIGNATURE_BINS)
+_HASH_MASK = (1 << 64) - 1
+_EMPTY_BIN = 1 << 58  # Larger than any bin value (64-bit hash >> 6)
+
+# Per-tile lists of cell hashes, grown on demand (_cell_hashes[tile][index]).
+# Only rooms up to _MAX_CACHED_CELLS use them; larger rooms (stitched
+# chunk-library rooms) hash their cells per call so the tables stay small.
+_MAX_CACHED_CELLS = 2048  # Covers every SIZE_DIMENSIONS room
+_cell_hashes: Dict[int, List[int]] = {}
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer - spreads an integer over 64 bits"""
+    value = (value + 0x9E3779B97F4A7C15) & _HASH_MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _HASH_MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _HASH_MASK
+    return value ^ (value >> 31)
+
+
+def _hashes_for_tile(tile_id: int, cells: int) -> List[int]:
+    """Get the cell hash table for one tile ID, covering at least `cells` cells"""
+    table = _cell_hashes.setdefault(tile_id, [])
+    for index in range(len(table), cells):
+        table.append(_mix64((index << 8) | tile_id))
+    return table
+
+
+def _interior_rows(room) -> Iterator[Tuple[int, bytes]]:
+    """Yield (flat index of the first cell, tiles) for each interior row, border ring excluded"""
+    flat = room.tile_bytes()
+    width = room.width
+    for y in range(1, room.height - 1):
+        start = y * width + 1
+        yield start, flat[start:start + width - 2]
+
+
+def tile_signature(room) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a room's non-empty interior cells
+    
+    Args:
+        room: RoomTemplate object
+    
+    Returns:
+        Tuple of SIGNATURE_BINS ints (equal fraction estimates Jaccard similarity)
+    """
+    cells = room.width * room.height
+    cached = cells <= _MAX_CACHED_CELLS
+    tables = {}
+    signature = [_EMPTY_BIN] * SIGNATURE_BINS
+    bin_mask = SIGNATURE_BINS - 1
+    
+    for start, row in _interior_rows(room):
+        for offset, tile_id in enumerate(row):
+            if not tile_id:
+                continue
+            if not cached:
+                h = _mix64(((start + offset) << 8) | tile_id)
+            else:
+                table = tables.get(tile_id)
+                if table is None:
+                    table = tables[tile_id] = _hashes_for_tile(tile_id, cells)
+                h = table[start + offset]
+            value = h >> _BIN_BITS
+            b = h & bin_mask
+            if value < signature[b]:
+                signature[b] = value
+    
+    # Densify: empty bins borrow the next filled bin (rotation), offset by
+    # distance so they only match rooms with the same borrowing pattern
+    if _EMPTY_BIN in signature and any(v != _EMPTY_BIN for v in signature):
+        dense = list(signature)
+        for b in range(SIGNATURE_BINS):
+            if signature[b] == _EMPTY_BIN:
+                distance = 1
+                while signature[(b + distance) % SIGNATURE_BINS] == _EMPTY_BIN:
+                    distance += 1
+                dense[b] = signature[(b + distance) % SIGNATURE_BINS] + distance * _EMPTY_BIN
+        signature = dense
+    
+    return tuple(signature)
+
+
+def estimate_similarity(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+    """
+    Estimate Jaccard similarity from two signatures
+    
+    Returns:
+        Fraction of matching bins (0.0-1.0)
+    """
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / SIGNATURE_BINS
+
+
+def tile_similarity(room_a, room_b) -> float:
+    """
+    Exact Jaccard similarity of two rooms' non-empty interior cells
+    
+    Rooms with different dimensions are never similar.
+    
+    Returns:
+        Similarity from 0.0 (nothing shared) to 1.0 (identical tiles)
+    """
+    if room_a.width != room_b.width or room_a.height != room_b.height:
+        return 0.0
+    
+    shared = 0
+    union = 0
+    for (_, row_a), (_, row_b) in zip(_interior_rows(room_a), _interior_rows(room_b)):
+        if row_a == row_b:
+            filled = len(row_a) - row_a.count(0)
+            shared += filled
+            union += filled
+            continue
+        for a, b in zip(row_a, row_b):
+            if a or b:
+                union += 1
+                if a == b:
+                    shared += 1
+    
+    return shared / union if union else 1.0
+
+
+def lsh_banding(threshold: float, recall: float = LSH_RECALL) -> Tuple[int, int]:
+    """
+    Pick the LSH banding for finding pairs at least `threshold` similar
+    
+    Signature bins match with the Jaccard similarity j of the rooms'
+    (cell, tile) sets, so a pair becomes a candidate with probability
+    1 - (1 - j**rows)**bands. tile_similarity counts a cell whose tile
+    changed once in the union where the sets count it twice, so a pair at
+    tile similarity s can have j as low as s / (2 - s). This picks the most
+    selective banding (most rows per band) that still reaches `recall`
+    at that lowest j.
+    
+    Args:
+        threshold: Lowest similarity that must be found
+        recall: Required candidate probability for a pair at the threshold
+    
+    Returns:
+        (bands, rows); (1, 0) when no banding reaches the recall, which
+        makes every room of the same shape and dimensions a candidate
+    """
+    jaccard = threshold / (2 - threshold) if threshold > 0 else 0.0
+    for rows in range(SIGNATURE_BINS, 0, -1):
+        bands = SIGNATURE_BINS // rows
+        if 1 - (1 - jaccard ** rows) ** bands >= recall:
+            return bands, rows
+    return 1, 0
+
+
+def _signature_key(room) -> Tuple[str, int, int]:
+    """Rooms are only compared within the same shape and dimensions"""
+    return (room.shape_type, room.width, room.height)
+
+
+class SimilarityIndex:
+    """
+    LSH index over room tile signatures
+    
+    Signatures are split into bands of bins; two rooms become candidates
+    if any band matches exactly. By default that is LSH_BANDS bands of
+    LSH_ROWS: pairs at 0.95 similarity are practically always found, pairs
+    around 0.7 a third of the time or less and pairs below 0.5 almost never.
+    Pass a threshold to band for it instead (see lsh_banding).
+    """
+    
+    def __init__(self, threshold: Optional[float] = None):
+        """
+        Initialize an empty index
+        
+        Args:
+            threshold: Similarity the index must find with LSH_RECALL
+                       (default: LSH_BANDS x LSH_ROWS banding)
+        """
+        if threshold is None:
+            self.bands, self.rows = LSH_BANDS, LSH_ROWS
+        else:
+            self.bands, self.rows = lsh_banding(threshold)
+        self.buckets: Dict[Hashable, List[int]] = {}
+        self.items: List[Any] = []
+        self.rooms: List[Any] = []
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def _band_keys(self, room, signature: Tuple[int, ...]) -> List[Hashable]:
+        key = _signature_key(room)
+        rows = self.rows
+        return [
+            (key, band, signature[band * rows:(band + 1) * rows])
+            for band in range(self.bands)
+        ]
+    
+    def add(self, room, item: Any = None, signature: Tuple[int, ...] = None) -> None:
+        """
+        Add a room to the index
+        
+        Args:
+            room: RoomTemplate object
+            item: Value returned by queries for this room (default: the room)
+            signature: Precomputed tile_signature(room), if available
+        """
+        if signature is None:
+            signature = tile_signature(room)
+        position = len(self.items)
+        self.items.append(room if item is None else item)
+        self.rooms.append(room)
+        for band_key in self._band_keys(room, signature):
+            self.buckets.setdefault(band_key, []).append(position)
+    
+    def candidates(self, room, signature: Tuple[int, ...] = None) -> List[int]:
+        """
+        Get positions of indexed rooms sharing at least one band with `room`
+        
+        Args:
+            room: RoomTemplate object
+            signature: Precomputed tile_signature(room), if available
+        
+        Returns:
+            List of positions (indexes into self.items), in insertion order
+        """
+        if signature is None:
+            signature = tile_signature(room)
+        found = set()
+        for band_key in self._band_keys(room, signature):
+            found.update(self.buckets.get(band_key, ()))
+        return sorted(found)
+    
+    def first_match(self, room, min_similarity: float,
+                    signature: Tuple[int, ...] = None) -> Optional[Any]:
+        """
+        Find any indexed room at least min_similarity similar to `room`
+        
+        Candidates are checked in insertion order and the search stops at
+        the first match, so duplicate checks don't score every candidate.
+        
+        Returns:
+            The matching item, or None
+        """
+        for position in self.candidates(room, signature):
+            if tile_similarity(room, self.rooms[position]) >= min_similarity:
+                return self.items[position]
+        return None
+    
+    def query(self, room, k: int = 5, min_similarity: float = 0.0,
+              signature: Tuple[int, ...] = None) -> List[Tuple[Any, float]]:
+        """
+        Find the most similar indexed rooms
+        
+        Candidates come from the LSH buckets and are ranked by exact
+        similarity, so rooms below ~0.7 similarity are usually not returned.
+        
+        Args:
+            room: RoomTemplate object
+            k: Maximum number of results
+            min_similarity: Drop results below this similarity
+            signature: Precomputed tile_signature(room), if available
+        
+        Returns:
+            List of (item, similarity) tuples, most similar first
+        """
+        scored = []
+        for position in self.candidates(room, signature):
+            similarity = tile_similarity(room, self.rooms[position])
+            if similarity >= min_similarity:
+                scored.append((similarity, position))
+        
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [(self.items[position], similarity) for similarity, position in scored[:k]]
@@ -4,7 +4,13 @@ Template library management system
 Manages a curated collection of high-quality room templates.
 """
 import json
-from typing import List, Dict, Any, Optional
+import sys
+from typing import List, Dict, Any, Optional, Tuple
+
+from curation.lazy_loading import CatalogSource, LazyTemplate, LibraryFileSource, RoomCache
+from curation.library_file import MAGIC, LibraryFile, write_library_file
+from curation.query_index import TemplateIndex
+from curation.similarity import SimilarityIndex, tile_signature
 
 
 class TemplateLibrary:
@@ -13,10 +19,67 @@ class TemplateLibrary:
     
     Provides filtering, tagging, and export capabilities for building
     a curated library of reusable room templates.
+    
+    Each template is a dict with 'room', 'validation', 'quality', 'tags'
+    and 'id', plus flat catalog fields ('shape', 'tier', 'quality_score',
+    'width', 'height', 'spike_count', 'platform_count', 'floor_coverage')
+    used for filtering, statistics and catalogs. Libraries opened
+    with TemplateLibrary.open() load 'room', 'validation' and 'quality' on
+    demand, so anything that only uses catalog fields never reads tiles.
+    
+    Changes to the template list go through the methods below, which bump
+    `revision`; code that edits `templates` directly calls mark_changed().
     """
     
     def __init__(self):
         self.templates = []
+        self.revision = 0              # Bumped on every change to templates
+        self._similarity_index = None  # Built on first find_similar()
+        self._query_index = None       # Built on first filter() after a change
+        self._source = None            # Set for libraries opened lazily
+        self._cache = None
+    
+    @classmethod
+    def open(cls, filename: str, cache_size: int = 256,
+             rooms_dir: Optional[str] = None, prefix: str = "room") -> 'TemplateLibrary':
+        """
+        Open a library lazily, reading only its catalog up front
+        
+        Accepts either a single-file library (export_library_file) or a
+        JSON catalog (export_catalog) next to the room files written by
+        export_library_to_json_batch. Rooms are loaded on first access and
+        kept in an LRU cache of cache_size hydrated templates.
+        
+        Args:
+            filename: Library file or catalog JSON path
+            cache_size: Maximum number of hydrated templates kept in memory
+            rooms_dir: Room JSON directory (catalog only; default: catalog's directory)
+            prefix: Room JSON filename prefix (catalog only)
+        
+        Returns:
+            TemplateLibrary whose templates load on demand
+        """
+        with open(filename, 'rb') as f:
+            is_library_file = f.read(len(MAGIC)) == MAGIC
+        
+        if is_library_file:
+            source = LibraryFileSource(filename)
+        else:
+            source = CatalogSource(filename, rooms_dir, prefix)
+        
+        library = cls()
+        library._source = source
+        library._cache = RoomCache(source, cache_size)
+        library.templates = [
+            LazyTemplate(library._cache, key, catalog)
+            for key, catalog in source.catalog()
+        ]
+        return library
+    
+    def close(self):
+        """Close the backing file of a lazily opened library"""
+        if self._source is not None:
+            self._source.close()
     
     def add_template(self, room, validation: Dict, quality: Dict):
         """
@@ -27,14 +90,62 @@ class TemplateLibrary:
             validation: Validation results dict
             quality: Quality scoring results dict
         """
-        template = {
+        template = self._make_template(room, validation, quality)
+        self.templates.append(template)
+        self.revision += 1
+        
+        if self._similarity_index is not None:
+            self._similarity_index.add(room, template)
+    
+    def replace_template(self, position: int, room, validation: Dict, quality: Dict):
+        """
+        Replace the template at a position in the library
+        
+        Args:
+            position: Index into templates
+            room: RoomTemplate object
+            validation: Validation results dict
+            quality: Quality scoring results dict
+        """
+        self.templates[position] = self._make_template(room, validation, quality)
+        self.mark_changed()
+    
+    def remove_template(self, template_id: str) -> bool:
+        """
+        Remove a template by id
+        
+        Returns:
+            True if a template was removed
+        """
+        for position, t in enumerate(self.templates):
+            if t['id'] == template_id:
+                del self.templates[position]
+                self.mark_changed()
+                return True
+        return False
+    
+    def mark_changed(self):
+        """Record a change to the template list (indexes are rebuilt on next use)"""
+        self.revision += 1
+        self._similarity_index = None
+    
+    def _make_template(self, room, validation: Dict, quality: Dict) -> Dict:
+        """Build the template dict stored for a room"""
+        return {
             'room': room,
             'validation': validation,
             'quality': quality,
             'tags': self._auto_tag(room, validation, quality),
-            'id': room.id
+            'id': room.id,
+            'shape': room.shape_type,
+            'tier': validation.get('tier', 'NORMAL'),
+            'quality_score': quality.get('overall', 0),
+            'width': room.width,
+            'height': room.height,
+            'spike_count': validation.get('spike_count', 0),
+            'platform_count': validation.get('platform_count', 0),
+            'floor_coverage': validation.get('floor_coverage', 0)
         }
-        self.templates.append(template)
     
     def _auto_tag(self, room, validation: Dict, quality: Dict) -> List[str]:
         """
@@ -48,7 +159,7 @@ class TemplateLibrary:
             quality: Quality scores
         
         Returns:
-            List of tag strings
+            List of tag strings (interned, so every template shares them)
         """
         tags = []
         
@@ -87,7 +198,7 @@ class TemplateLibrary:
         if quality.get('has_secret_area', False):
             tags.append('has_secret')
         
-        return tags
+        return [sys.intern(tag) for tag in tags]
     
     def filter(
         self,
@@ -110,31 +221,16 @@ class TemplateLibrary:
         Returns:
             List of matching template dicts
         """
-        results = self.templates
-        
-        # Filter by quality range
-        if min_quality is not None:
-            results = [t for t in results if t['quality']['overall'] >= min_quality]
-        
-        if max_quality is not None:
-            results = [t for t in results if t['quality']['overall'] <= max_quality]
-        
-        # Filter by tier
-        if tier is not None:
-            results = [t for t in results if t['validation']['tier'] == tier]
-        
-        # Filter by shape
-        if shape is not None:
-            results = [t for t in results if t['room'].shape_type == shape]
-        
-        # Filter by tags (must have ALL specified tags)
-        if tags is not None:
-            results = [
-                t for t in results
-                if all(tag in t['tags'] for tag in tags)
-            ]
-        
-        return results
+        index = self._get_query_index()
+        bits = index.query(min_quality, max_quality, tier, tags, shape)
+        templates = self.templates
+        return [templates[i] for i in index.positions(bits)]
+    
+    def _get_query_index(self) -> TemplateIndex:
+        """Get the query index, rebuilding it if the template list changed"""
+        if self._query_index is None or not self._query_index.is_current(self.templates, self.revision):
+            self._query_index = TemplateIndex(self.templates, self.revision)
+        return self._query_index
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -152,28 +248,39 @@ class TemplateLibrary:
                 'quality_distribution': {}
             }
         
-        # Count by tier
+        # Single pass: counts by tier/shape, quality sum and distribution
         by_tier = {}
-        for t in self.templates:
-            tier = t['validation']['tier']
-            by_tier[tier] = by_tier.get(tier, 0) + 1
-        
-        # Count by shape
         by_shape = {}
+        total_quality = 0.0
+        exceptional = high = good = acceptable = poor = 0
+        
         for t in self.templates:
-            shape = t['room'].shape_type
+            tier = t['tier']
+            by_tier[tier] = by_tier.get(tier, 0) + 1
+            shape = t['shape']
             by_shape[shape] = by_shape.get(shape, 0) + 1
+            
+            overall = t['quality_score']
+            total_quality += overall
+            if overall >= 8.0:
+                exceptional += 1
+            elif overall >= 7.0:
+                high += 1
+            elif overall >= 6.0:
+                good += 1
+            elif overall >= 5.0:
+                acceptable += 1
+            else:
+                poor += 1
+        
+        avg_quality = total_quality / len(self.templates)
         
-        # Average quality
-        avg_quality = sum(t['quality']['overall'] for t in self.templates) / len(self.templates)
-        
-        # Quality distribution
         quality_dist = {
-            'exceptional (8.0+)': len([t for t in self.templates if t['quality']['overall'] >= 8.0]),
-            'high (7.0-7.9)': len([t for t in self.templates if 7.0 <= t['quality']['overall'] < 8.0]),
-            'good (6.0-6.9)': len([t for t in self.templates if 6.0 <= t['quality']['overall'] < 7.0]),
-            'acceptable (5.0-5.9)': len([t for t in self.templates if 5.0 <= t['quality']['overall'] < 6.0]),
-            'poor (<5.0)': len([t for t in self.templates if t['quality']['overall'] < 5.0])
+            'exceptional (8.0+)': exceptional,
+            'high (7.0-7.9)': high,
+            'good (6.0-6.9)': good,
+            'acceptable (5.0-5.9)': acceptable,
+            'poor (<5.0)': poor
         }
         
         return {
@@ -189,6 +296,8 @@ class TemplateLibrary:
         Export a catalog of templates (metadata only, no tilemap data)
         
         Creates a JSON file with template metadata for quick lookup.
+        Only catalog fields are read, so lazily opened libraries export
+        without loading any room.
         
         Args:
             filename: Output JSON file path
@@ -199,18 +308,18 @@ class TemplateLibrary:
             'templates': [
                 {
                     'id': t['id'],
-                    'shape': t['room'].shape_type,
+                    'shape': t['shape'],
                     'dimensions': {
-                        'width': t['room'].width,
-                        'height': t['room'].height
+                        'width': t['width'],
+                        'height': t['height']
                     },
-                    'tier': t['validation']['tier'],
-                    'quality': round(t['quality']['overall'], 2),
+                    'tier': t['tier'],
+                    'quality': round(t['quality_score'], 2),
                     'tags': t['tags'],
                     'features': {
-                        'spike_count': t['validation'].get('spike_count', 0),
-                        'platform_count': t['validation'].get('platform_count', 0),
-                        'floor_coverage': round(t['validation'].get('floor_coverage', 0), 2)
+                        'spike_count': t['spike_count'],
+                        'platform_count': t['platform_count'],
+                        'floor_coverage': round(t['floor_coverage'], 2)
                     }
                 }
                 for t in self.templates
@@ -220,6 +329,34 @@ class TemplateLibrary:
         with open(filename, 'w') as f:
             json.dump(catalog, f, indent=2)
     
+    def export_library_file(self, filename: str):
+        """
+        Export the full library (tiles included) to a single binary file
+        
+        The file can be memory-mapped and read back one room at a time
+        (see curation.library_file).
+        
+        Args:
+            filename: Output file path
+        """
+        write_library_file(self.templates, filename)
+    
+    @classmethod
+    def load_library_file(cls, filename: str) -> 'TemplateLibrary':
+        """
+        Load a library written by export_library_file
+        
+        Args:
+            filename: Library file path
+        
+        Returns:
+            TemplateLibrary with every template loaded
+        """
+        library = cls()
+        with LibraryFile(filename) as library_file:
+            library.templates = [library_file.load_template(i) for i in range(len(library_file))]
+        return library
+    
     def sort_by_quality(self, descending: bool = True):
         """
         Sort templates by quality score
@@ -228,9 +365,10 @@ class TemplateLibrary:
             descending: If True, best quality first
         """
         self.templates.sort(
-            key=lambda t: t['quality']['overall'],
+            key=lambda t: t['quality_score'],
             reverse=descending
         )
+        self.revision += 1
     
     def keep_top_n(self, n: int):
         """
@@ -241,25 +379,74 @@ class TemplateLibrary:
         """
         self.sort_by_quality(descending=True)
         self.templates = self.templates[:n]
+        self.mark_changed()
     
-    def remove_duplicates(self, similarity_threshold: float = 0.95):
+    def remove_duplicates(self, similarity_threshold: float = 0.95) -> int:
         """
-        Remove near-duplicate templates (placeholder for future implementation)
+        Remove exact-ID and near-duplicate templates
+        
+        Similarity is the Jaccard similarity of non-empty interior tile
+        cells (see curation.similarity). Candidates come from an LSH index
+        over tile signatures. The default banding is tuned for 0.95 and
+        would miss about a third of pairs at 0.8 and most pairs at 0.7, so
+        the index is banded for the threshold instead: at any threshold,
+        99% of pairs at the threshold become candidates (see
+        similarity.lsh_banding). Lower thresholds cost more candidate
+        checks: below ~0.5 most templates of the same shape and size are
+        compared, and below ~0.1 all of them are. Each template stops at
+        its first duplicate. Within a group of near-duplicates, the
+        highest-quality template is kept.
         
         Args:
             similarity_threshold: How similar templates must be to be considered duplicates
+        
+        Returns:
+            Number of templates removed
         """
-        # TODO: Implement similarity detection
-        # For now, just remove exact ID duplicates
         seen_ids = set()
-        unique_templates = []
-        
-        for t in self.templates:
-            if t['id'] not in seen_ids:
-                seen_ids.add(t['id'])
-                unique_templates.append(t)
-        
+        index = SimilarityIndex(similarity_threshold)
+        keep = set()
+        
+        # Best first, so the survivor of each group is the best one
+        by_quality = sorted(self.templates, key=lambda t: t['quality_score'], reverse=True)
+        
+        for t in by_quality:
+            if t['id'] in seen_ids:
+                continue
+            seen_ids.add(t['id'])
+            
+            room = t['room']
+            signature = tile_signature(room)
+            if index.first_match(room, similarity_threshold, signature) is not None:
+                continue
+            
+            index.add(room, t, signature)
+            keep.add(id(t))
+        
+        unique_templates = [t for t in self.templates if id(t) in keep]
         removed = len(self.templates) - len(unique_templates)
         self.templates = unique_templates
+        self.mark_changed()
         
         return removed
+    
+    def find_similar(self, room, k: int = 5) -> List[Tuple[Dict, float]]:
+        """
+        Find the library templates most similar to a room
+        
+        Only templates with the same shape and dimensions are considered,
+        and templates below ~0.7 similarity are usually not found.
+        
+        Args:
+            room: RoomTemplate object
+            k: Maximum number of results
+        
+        Returns:
+            List of (template dict, similarity) tuples, most similar first
+        """
+        if self._similarity_index is None:
+            self._similarity_index = SimilarityIndex()
+            for t in self.templates:
+                self._similarity_index.add(t['room'], t)
+        
+        return self._similarity_index.query(room, k)
@@ -176,14 +176,14 @@ def place_enemies(room, difficulty: int = 5, density_multiplier: float = 1.0) ->
     # Place enemies
     placements = []
     for zone in selected_zones:
-        zone_type = zone.get('type', 'ground')
+        zone_type = zone.type
         enemy_type = select_enemy_type(difficulty, zone_type)
         
         if enemy_type:
             placement = {
                 'type': enemy_type,
-                'position': zone['position'].copy(),
-                'zone_id': zone.get('id', 'unknown'),
+                'position': zone.position,
+                'zone_id': zone.id,
                 'properties': {
                     'threat_level': ENEMY_TYPES[enemy_type]['threat_level'],
                     'movement': ENEMY_TYPES[enemy_type]['movement'],
@@ -195,6 +195,10 @@ def place_enemies(room, difficulty: int = 5, density_multiplier: float = 1.0) ->
     return placements
 
 
+# Themes understood by apply_enemy_theme ('balanced' leaves placements as-is)
+ENEMY_THEMES = ['balanced', 'aggressive', 'sparse', 'aerial_focus', 'ground_focus']
+
+
 def apply_enemy_theme(placements: List[Dict], theme: str) -> List[Dict]:
     """
     Apply thematic filtering to enemy placements
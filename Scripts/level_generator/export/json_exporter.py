@@ -5,8 +5,12 @@ Exports room templates to JSON format for use in Unreal Engine 5.
 """
 import json
 import os
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Any, Iterable, Optional, List
+from utils.room_template import RoomTemplate
 from utils.tile_constants import TILE_LEGEND
+from utils.world_graph import critical_path, goal_index, level_links, room_distances
 
 
 def export_room_to_json(
@@ -65,15 +69,16 @@ def build_room_json(
             "width": room.width,
             "height": room.height,
             "difficulty": room.metadata.get('difficulty', 1),
-            "size_category": room.metadata.get('size', 'medium'),
-            "features": room.metadata.get('features', [])
+            "size_category": room.metadata.get('length', 'medium'),
+            "features": room.metadata.get('features', []),
+            "tags": list(room.metadata.get('tags', ()))
         }
     
     # Tilemap data (essential for UE5)
     data["tilemap"] = {
         "width": room.width,
         "height": room.height,
-        "tiles": room.tiles,  # 2D array of tile IDs
+        "tiles": [list(row) for row in room.tiles],  # 2D array of tile IDs
         "tile_legend": TILE_LEGEND,
         "coordinate_system": "Y=0 is TOP, Y=height-1 is BOTTOM"
     }
@@ -99,7 +104,7 @@ def build_room_json(
         }
     
     # Spawn zones (essential for enemy placement)
-    data["spawn_zones"] = room.spawn_zones
+    data["spawn_zones"] = room.spawn_zones_to_json()
     
     # Connections (entrance/exit positions)
     data["connections"] = room.connections
@@ -123,6 +128,31 @@ def import_room_from_json(filepath: str) -> Dict[str, Any]:
     return data
 
 
+def room_from_json(data: Dict[str, Any]) -> RoomTemplate:
+    """
+    Rebuild a RoomTemplate from exported room JSON
+    
+    Args:
+        data: Dict in the build_room_json format (must include metadata)
+    
+    Returns:
+        RoomTemplate with tiles, connections and spawn zones restored
+    """
+    metadata = data["metadata"]
+    return RoomTemplate.from_json({
+        "id": metadata["id"],
+        "shape_type": metadata["shape_type"],
+        "metadata": {
+            "difficulty": metadata.get("difficulty", 1),
+            "length": metadata.get("size_category", "medium"),
+            "tags": metadata.get("tags", metadata.get("features", []))
+        },
+        "tilemap": data["tilemap"],
+        "connections": data.get("connections", {}),
+        "spawn_zones": data.get("spawn_zones", {})
+    })
+
+
 def export_library_to_json_batch(
     library,
     output_dir: str,
@@ -240,18 +270,27 @@ def export_level_with_entities(
         "level_id": level_data['level_id'],
         "stats": level_data['stats']
     }
+    if 'position' in level_data:
+        data["level_info"]["position"] = level_data['position']
+    if 'links' in level_data:
+        data["level_info"]["branch"] = level_data.get('branch')
+        data["level_info"]["links"] = level_data['links']
     
     # Write to file
     with open(filepath, 'w') as f:
         json.dump(data, f, indent=2)
 
 
-def export_world(levels: List[Dict[str, Any]], output_dir: str, world_name: str = "World"):
+def export_world(levels: Iterable[Dict[str, Any]], output_dir: str, world_name: str = "World"):
     """
     Export all levels in a world to separate JSON files
     
+    Levels are written one at a time as they are consumed, and only their
+    summary entries are kept, so a generator (world_generator.iter_world)
+    can be exported without holding the whole world in memory.
+    
     Args:
-        levels: List of level data dicts
+        levels: Iterable of level data dicts
         output_dir: Output directory path
         world_name: World name for file naming
     
@@ -261,6 +300,7 @@ def export_world(levels: List[Dict[str, Any]], output_dir: str, world_name: str
     os.makedirs(output_dir, exist_ok=True)
     
     exported_files = []
+    summary_levels = []
     
     for i, level_data in enumerate(levels):
         filename = f"{world_name}_L{i+1:02d}.json"
@@ -268,29 +308,240 @@ def export_world(levels: List[Dict[str, Any]], output_dir: str, world_name: str
         
         export_level_with_entities(level_data, filepath)
         exported_files.append(filepath)
+        summary_levels.append(build_level_summary(level_data))
     
     # Also export world summary
+    exported_files.append(write_world_summary(summary_levels, output_dir, world_name))
+    
+    return exported_files
+
+
+def export_world_levels(levels: List[Dict[str, Any]], output_dir: str,
+                        world_name: str, indices: Iterable[int]) -> List[str]:
+    """
+    Rewrite selected level files of an exported world, plus its summary
+    
+    Args:
+        levels: Full list of level data dicts
+        output_dir: Directory the world was exported to
+        world_name: World name used for file naming
+        indices: 0-based indices of the levels to rewrite
+    
+    Returns:
+        List of rewritten file paths
+    """
+    exported_files = []
+    
+    for i in sorted(set(indices)):
+        filepath = os.path.join(output_dir, f"{world_name}_L{i+1:02d}.json")
+        export_level_with_entities(levels[i], filepath)
+        exported_files.append(filepath)
+    
+    summary_levels = [build_level_summary(level_data) for level_data in levels]
+    exported_files.append(write_world_summary(summary_levels, output_dir, world_name))
+    
+    return exported_files
+
+
+def load_world(output_dir: str, world_name: str) -> List[Dict[str, Any]]:
+    """
+    Load an exported world back into level data dicts
+    
+    Args:
+        output_dir: Directory the world was exported to
+        world_name: World name used for file naming
+    
+    Returns:
+        List of level dicts (level_id, room, validation, quality, entities,
+        stats) in level order
+    """
+    return list(ExportedLevels(output_dir, world_name))
+
+
+def load_level(output_dir: str, world_name: str, index: int) -> Dict[str, Any]:
+    """
+    Load one level of an exported world back into a level data dict
+    
+    Args:
+        output_dir: Directory the world was exported to
+        world_name: World name used for file naming
+        index: 0-based level index
+    
+    Returns:
+        Level dict (level_id, room, validation, quality, entities, stats)
+    """
+    data = import_room_from_json(os.path.join(output_dir, f"{world_name}_L{index+1:02d}.json"))
+    level = {
+        'level_id': data['level_info']['level_id'],
+        'room': room_from_json(data),
+        'validation': data.get('validation', {}),
+        'quality': data.get('quality', {}),
+        'entities': data.get('entities', {}),
+        'stats': data['level_info']['stats']
+    }
+    if 'position' in data['level_info']:
+        level['position'] = data['level_info']['position']
+    return level
+
+
+class ExportedLevels(Sequence):
+    """
+    Read-only sequence over the levels of an exported world
+    
+    Levels are loaded from their files when indexed and only the most
+    recently used ones are kept, so a world written by streaming
+    world_generator.iter_world into export_world can be rendered without
+    holding every room in memory again.
+    """
+    
+    def __init__(self, output_dir: str, world_name: str, cache_size: int = 8):
+        self.output_dir = output_dir
+        self.world_name = world_name
+        self.cache_size = cache_size
+        summary = import_room_from_json(os.path.join(output_dir, f"{world_name}_summary.json"))
+        self._count = summary['level_count']
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        level = load_level(self.output_dir, self.world_name, index)
+        self._cache[index] = level
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return level
+
+
+def write_world_summary(summary_levels: List[Dict[str, Any]], output_dir: str,
+                        world_name: str) -> str:
+    """
+    Write a world's summary file
+    
+    Args:
+        summary_levels: Entries from build_level_summary, in level order
+        output_dir: Output directory path
+        world_name: World name for file naming
+    
+    Returns:
+        Summary file path
+    """
     summary_path = os.path.join(output_dir, f"{world_name}_summary.json")
     
     summary = {
         "world_name": world_name,
-        "level_count": len(levels),
-        "levels": [
-            {
-                "level_id": lvl['level_id'],
-                "difficulty": lvl['stats']['difficulty'],
-                "shape": lvl['stats']['shape'],
-                "quality": lvl['stats']['quality_score'],
-                "enemy_count": lvl['stats']['enemy_count'],
-                "obstacle_count": lvl['stats']['obstacle_count']
-            }
-            for lvl in levels
-        ]
+        "level_count": len(summary_levels),
+        "levels": summary_levels
     }
     
     with open(summary_path, 'w') as f:
         json.dump(summary, f, indent=2)
     
-    exported_files.append(summary_path)
+    return summary_path
+
+
+def export_world_graph(levels: List[Dict[str, Any]], output_dir: str, world_name: str = "World"):
+    """
+    Export a branching world: one JSON file per level plus a graph file
+    
+    Level files are named after their level IDs. The graph file
+    ({world_name}_graph.json) lists the rooms and door links and carries
+    precomputed routing data so the game does not have to search the graph
+    at load time:
+    - distances: all-pairs room distances in doors passed through, indexed
+      in 'rooms' order (-1 if unreachable)
+    - critical_path: shortest route from the first to the final level
+    - per room: distance from the start, distance to the goal and whether
+      it lies on the critical path
+    
+    Args:
+        levels: Level dicts from world_generator.generate_world_graph (a
+                linear world from generate_world works too)
+        output_dir: Output directory path
+        world_name: World name for file naming
+    
+    Returns:
+        List of exported file paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    exported_files = []
+    for level_data in levels:
+        filepath = os.path.join(output_dir, f"{level_data['level_id']}.json")
+        export_level_with_entities(level_data, filepath)
+        exported_files.append(filepath)
+    
+    distances = room_distances(levels)
+    goal = goal_index(levels)
+    path = critical_path(levels, 0, goal)
+    on_path = set(path)
+    
+    rooms = []
+    for i, level_data in enumerate(levels):
+        entry = build_level_summary(level_data)
+        entry.update({
+            "file": f"{level_data['level_id']}.json",
+            "branch": level_data.get('branch'),
+            "doors": sorted(level_data['room'].connections),
+            "distance_from_start": distances[0][i],
+            "distance_to_goal": distances[goal][i],
+            "on_critical_path": i in on_path
+        })
+        rooms.append(entry)
+    
+    graph = {
+        "world_name": world_name,
+        "room_count": len(levels),
+        "start": levels[0]['level_id'],
+        "goal": levels[goal]['level_id'],
+        "rooms": rooms,
+        "links": [
+            {
+                "from": levels[source]['level_id'],
+                "from_door": door,
+                "to": levels[target]['level_id'],
+                "to_door": target_door
+            }
+            for source, door, target, target_door in level_links(levels)
+        ],
+        "critical_path": [levels[i]['level_id'] for i in path],
+        "distances": distances
+    }
+    
+    graph_path = os.path.join(output_dir, f"{world_name}_graph.json")
+    with open(graph_path, 'w') as f:
+        json.dump(graph, f, indent=2)
+    exported_files.append(graph_path)
     
     return exported_files
+
+
+def build_level_summary(level_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build one level's entry for the world summary file
+    
+    Args:
+        level_data: Level data dict from world generator
+    
+    Returns:
+        Summary entry dict
+    """
+    stats = level_data['stats']
+    return {
+        "level_id": level_data['level_id'],
+        "difficulty": stats['difficulty'],
+        "shape": stats['shape'],
+        "quality": stats['quality_score'],
+        "enemy_count": stats['enemy_count'],
+        "obstacle_count": stats['obstacle_count']
+    }
@@ -0,0 +1,485 @@
+"""
+Chunk library: horizontal rooms stitched from pre-validated segments
+
+Horizontal rooms are mostly a floor line with gaps, slopes and platforms
+over it, and everything the validator checks there is local: spacing is
+checked column by column, gaps are runs along the floor row. So a room
+can be cut into short segments (chunks, 8-16 columns) that start and end
+on a flat floor column, and a chunk that passes the checks on its own
+passes them anywhere in a room.
+
+A ChunkLibrary builds and validates chunks for every floor height once,
+indexed by the height of their first column. A room of any width is then
+a walk through the index (each chunk starts at the height the previous
+one ends at) and one slice copy per chunk and row, and its validation is
+summed from the stored per-chunk results (compose_validation) instead of
+rescanning the room - so very long rooms cost linear time.
+"""
+import random
+import sys
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.room_template import RoomTemplate
+from utils.bitboard import RoomBitboard, popcount
+from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE, \
+    SLOPE_UP_RIGHT, SLOPE_DOWN_RIGHT
+from generators.shape_generators import horizontal_right
+from validation.pathfinding import astar
+from validation.validator_simple import calculate_tier_simple, check_gaps_at_level, \
+    check_platform_spacing
+from variation import transforms
+import config
+
+# Chunk widths built for every floor height (any room interior of at
+# least the smallest width can be split into these)
+CHUNK_WIDTHS = tuple(range(8, 17))
+
+# Chunks kept per (floor height, width)
+CHUNK_VARIANTS = 3
+
+# Attempts at building each chunk before giving up on it
+CHUNK_ATTEMPTS = 10
+
+# Libraries kept in memory, keyed by (height, difficulty, features)
+LIBRARY_CACHE_SIZE = 16
+
+_libraries: Dict[tuple, 'ChunkLibrary'] = {}
+
+
+class Chunk(NamedTuple):
+    """
+    A validated room segment and the validator's results for it
+    
+    Columns 0 and width-1 are flat floor at entry_y and exit_y; gaps and
+    slopes stay inside.
+    """
+    rows: Tuple[bytes, ...]           # Tile rows (y=0 is the top wall)
+    floor_heights: Tuple[int, ...]    # Floor row per column (room height = gap)
+    entry_y: int
+    exit_y: int
+    spike_count: int
+    platform_count: int
+    floor_tiles: int                  # Ground/platform tiles on the floor row
+    max_gap_width: int
+    warnings: Tuple[str, ...]
+    
+    @property
+    def width(self) -> int:
+        return len(self.floor_heights)
+
+
+def _build_floor(width: int, height: int, entry_y: int, difficulty: int,
+                 features: Sequence[str]) -> Tuple[List[int], set, Optional[str]]:
+    """
+    Plan a chunk's floor: at most one slope, then gaps
+    
+    Returns:
+        (floor_heights, slope_columns, slope direction or None)
+    """
+    baseline_floor_y = height - 2
+    min_floor_y = config.PLAYER_TOTAL_HEIGHT + 1
+    floor_heights = [entry_y] * width
+    slope_columns = set()
+    direction = None
+    
+    if "slopes" in features and random.random() < 0.5:
+        length = random.randint(2, min(4, width - 4))
+        slope_x = random.randint(1, width - 1 - length)
+        # Same shape as horizontal_right's slopes: an up slope climbs a
+        # tile per column, a down slope starts level with the floor before
+        directions = []
+        if entry_y - length >= min_floor_y:
+            directions.append('up')
+        if entry_y + length - 1 <= baseline_floor_y:
+            directions.append('down')
+        if directions:
+            direction = random.choice(directions)
+            for i in range(length):
+                floor_heights[slope_x + i] = entry_y - i - 1 if direction == 'up' else entry_y + i
+                slope_columns.add(slope_x + i)
+            for x in range(slope_x + length, width):
+                floor_heights[x] = floor_heights[slope_x + length - 1]
+    
+    # Gaps are cut where horizontal_right would cut them, away from the
+    # chunk's edge columns
+    gap_probability = min(difficulty * config.GAP_FREQUENCY_PER_DIFFICULTY, 0.4)
+    x = 2
+    while x < width - 2:
+        gap_width = random.randint(2, min(4, 2 + difficulty // 3))
+        if (x + gap_width < width - 1 and random.random() < gap_probability
+                and horizontal_right._gap_is_jumpable(_Bounds(width, height), floor_heights,
+                                                      slope_columns, x, gap_width)):
+            for gx in range(x, x + gap_width):
+                floor_heights[gx] = height
+            x += gap_width
+        x += 1
+    
+    return floor_heights, slope_columns, direction
+
+
+class _Bounds(NamedTuple):
+    """Stand-in room for helpers that only read the dimensions"""
+    width: int
+    height: int
+
+
+def _build_chunk(width: int, height: int, entry_y: int, difficulty: int,
+                 features: Sequence[str]) -> Tuple[RoomTemplate, Tuple[int, ...]]:
+    """
+    Lay out one chunk as a room of its own (no side walls or doors)
+    
+    Returns:
+        (room, floor row per column)
+    """
+    room = RoomTemplate(width, height, "horizontal_right")
+    baseline_floor_y = height - 2
+    floor_heights, slope_columns, direction = _build_floor(width, height, entry_y,
+                                                           difficulty, features)
+    slope_tile = SLOPE_UP_RIGHT if direction == 'up' else SLOPE_DOWN_RIGHT
+    
+    for x, floor_y in enumerate(floor_heights):
+        if floor_y >= height:
+            # Gap: spikes at the bottom of the pit
+            if "spikes" in features and random.random() < difficulty * config.SPIKE_DENSITY_PER_DIFFICULTY:
+                room.set_tile(x, height - 1, SPIKE)
+            continue
+        room.set_tile(x, floor_y, slope_tile if x in slope_columns else GROUND)
+        for y in range(floor_y + 1, height):
+            room.set_tile(x, y, GROUND if y >= baseline_floor_y else WALL)
+    
+    if "platforms" in features:
+        # Same platform density per column as a medium horizontal room
+        medium_width = config.SIZE_DIMENSIONS["horizontal_right"]["medium"][0]
+        expected = difficulty * config.PLATFORM_COUNT_PER_DIFFICULTY * width / medium_width
+        count = int(expected) + (random.random() < expected - int(expected))
+        for _ in range(count):
+            platform_width = random.randint(3, min(6, width - 2))
+            platform_x = random.randint(1, width - platform_width - 1)
+            floors = [y for y in floor_heights[platform_x:platform_x + platform_width] if y < height]
+            if not floors:
+                continue
+            local_floor_y = min(floors)
+            min_platform_y = max(config.PLAYER_TOTAL_HEIGHT, local_floor_y - 10)
+            max_platform_y = local_floor_y - config.PLAYER_TOTAL_HEIGHT
+            if max_platform_y < min_platform_y:
+                continue
+            platform_y = random.randint(min_platform_y, max_platform_y)
+            # Leave it out rather than stack it on or under another one
+            span = range(platform_x, platform_x + platform_width)
+            rows = range(platform_y - config.PLAYER_TOTAL_HEIGHT,
+                         platform_y + config.PLAYER_TOTAL_HEIGHT + 1)
+            if any(room.get_tile(x, y) == PLATFORM_ONEWAY for x in span for y in rows):
+                continue
+            for x in span:
+                room.set_tile(x, platform_y, PLATFORM_ONEWAY)
+            if "spikes" in features and difficulty >= 5 and random.random() < 0.1:
+                room.set_tile(random.choice(span), platform_y - 1, SPIKE)
+    
+    # Top wall
+    for x in range(width):
+        room.set_tile(x, 0, WALL)
+    
+    return room, tuple(floor_heights)
+
+
+def _check_chunk(room: RoomTemplate, floor_heights: Tuple[int, ...]) -> Optional[Chunk]:
+    """
+    Validate a chunk and record the results stitched rooms are built from
+    
+    The chunk is checked between two wall columns, the same way its
+    columns are checked inside a room, and must be walkable from its first
+    column to its last.
+    
+    Returns:
+        Chunk, or None if the chunk fails validation
+    """
+    width, height = room.width, room.height
+    padded = RoomTemplate(width + 2, height, "horizontal_right")
+    for y, row in enumerate(room.tiles):
+        padded.tiles[y][1:width + 1] = row
+        padded.tiles[y][0] = padded.tiles[y][width + 1] = WALL
+    
+    board = RoomBitboard(padded)
+    spacing_valid, _ = check_platform_spacing(padded, board)
+    if not spacing_valid:
+        return None
+    
+    floor_y = height - 2
+    results = {"valid": True, "tier": "NORMAL", "errors": [], "warnings": []}
+    max_gap = check_gaps_at_level(padded, floor_y, results, board)
+    if not results["valid"]:
+        return None
+    
+    entry_y, exit_y = floor_heights[0], floor_heights[-1]
+    if astar(padded, (1, entry_y - 1), (width, exit_y - 1)) is None:
+        return None
+    
+    return Chunk(
+        rows=tuple(bytes(row) for row in room.tiles),
+        floor_heights=floor_heights,
+        entry_y=entry_y,
+        exit_y=exit_y,
+        spike_count=board.count('spike'),
+        platform_count=board.count('platform'),
+        floor_tiles=popcount(board.rows('ground', 'platform')[floor_y]),
+        max_gap_width=max_gap,
+        warnings=tuple(results["warnings"]),
+    )
+
+
+class ChunkLibrary:
+    """
+    Validated chunks for one room height, indexed by entry floor height
+    
+    Usage:
+        library = chunk_library(18, difficulty=5)
+        room, chunks = library.assemble(200)
+        results = compose_validation(room, chunks)
+    """
+    
+    def __init__(self, height: int, difficulty: int, features: Optional[Sequence[str]] = None,
+                 widths: Sequence[int] = CHUNK_WIDTHS, variants: int = CHUNK_VARIANTS):
+        """
+        Build and validate every chunk
+        
+        Args:
+            height: Room height in tiles
+            difficulty: Difficulty level (1-10)
+            features: Features to include (default: platforms, spikes, slopes)
+            widths: Chunk widths to build
+            variants: Chunks per (floor height, width)
+        """
+        if features is None:
+            features = ["platforms", "spikes", "slopes"]
+        self.height = height
+        self.difficulty = difficulty
+        self.features = tuple(features)
+        self.widths = tuple(sorted(widths))
+        
+        # Entry floor height -> width -> chunks
+        self._index: Dict[int, Dict[int, List[Chunk]]] = {}
+        for entry_y in range(config.PLAYER_TOTAL_HEIGHT + 1, height - 1):
+            by_width = self._index.setdefault(entry_y, {})
+            for width in self.widths:
+                chunks = by_width.setdefault(width, [])
+                for _ in range(variants * CHUNK_ATTEMPTS):
+                    if len(chunks) >= variants:
+                        break
+                    chunk = _check_chunk(*_build_chunk(width, height, entry_y,
+                                                       difficulty, self.features))
+                    if chunk is not None:
+                        chunks.append(chunk)
+                if not chunks:
+                    # A flat run is always valid
+                    chunks.append(_check_chunk(*_build_chunk(width, height, entry_y, 1, ())))
+    
+    def __len__(self) -> int:
+        return sum(len(chunks) for by_width in self._index.values() for chunks in by_width.values())
+    
+    @property
+    def heights(self) -> List[int]:
+        """Floor heights chunks can start at"""
+        return sorted(self._index)
+    
+    def chunks(self, entry_y: int, width: Optional[int] = None) -> List[Chunk]:
+        """Get the chunks starting at a floor height (optionally of one width)"""
+        by_width = self._index.get(entry_y, {})
+        if width is not None:
+            return list(by_width.get(width, ()))
+        return [chunk for chunks in by_width.values() for chunk in chunks]
+    
+    def plan(self, interior_width: int, entry_y: Optional[int] = None) -> List[Chunk]:
+        """
+        Pick chunks that fill a given number of columns, edge heights matching
+        
+        Args:
+            interior_width: Columns to fill
+            entry_y: Floor height of the first column (default: the baseline)
+        
+        Returns:
+            Chunks in left-to-right order
+        
+        Raises:
+            ValueError: If the width is narrower than the smallest chunk
+        """
+        smallest, largest = self.widths[0], self.widths[-1]
+        if interior_width < smallest:
+            raise ValueError(f"Width {interior_width} is narrower than the smallest chunk ({smallest})")
+        if entry_y is None:
+            entry_y = self.height - 2
+        
+        chunks = []
+        remaining = interior_width
+        while remaining:
+            # Leave enough columns for at least one more chunk
+            if remaining <= largest and remaining in self.widths:
+                width = remaining
+            else:
+                fits = [w for w in self.widths if remaining - w >= smallest]
+                width = random.choice(fits)
+            chunk = random.choice(self._index[entry_y][width])
+            chunks.append(chunk)
+            entry_y = chunk.exit_y
+            remaining -= width
+        return chunks
+    
+    def stitch(self, chunks: Sequence[Chunk], shape_type: str = "horizontal_right") -> RoomTemplate:
+        """
+        Concatenate chunks into a room with side walls, doors and spawn zones
+        
+        Args:
+            chunks: Chunks in left-to-right order (see plan)
+            shape_type: "horizontal_right" or "horizontal_left" (mirrored)
+        
+        Returns:
+            New RoomTemplate
+        """
+        width = sum(chunk.width for chunk in chunks) + 2
+        room = RoomTemplate(width, self.height, "horizontal_right")
+        room.metadata["difficulty"] = self.difficulty
+        room.metadata["length"] = "custom"
+        room.metadata["chunks"] = len(chunks)
+        room.set_tags(self.features)
+        
+        x = 1
+        floor_heights = [self.height]
+        for chunk in chunks:
+            for y, row in enumerate(chunk.rows):
+                room.tiles[y][x:x + chunk.width] = row
+            floor_heights.extend(chunk.floor_heights)
+            x += chunk.width
+        floor_heights.append(self.height)
+        
+        horizontal_right._add_boundary_walls(room)
+        entrance_floor, exit_floor = floor_heights[1], floor_heights[-2]
+        horizontal_right._add_doors(room, {
+            'floor_heights': floor_heights,
+            'entrance_y': max(1, min(self.height - 2, entrance_floor - 1)),
+            'exit_y': max(1, min(self.height - 2, exit_floor - 1)),
+        })
+        horizontal_right._add_spawn_zones(room, self.difficulty)
+        
+        if shape_type == "horizontal_left":
+            room = transforms.mirror_horizontal(room)
+        return room
+    
+    def assemble(self, width: int, shape_type: str = "horizontal_right") -> Tuple[RoomTemplate, List[Chunk]]:
+        """
+        Build a room of any width from the library
+        
+        Args:
+            width: Room width in tiles (side walls included)
+            shape_type: "horizontal_right" or "horizontal_left"
+        
+        Returns:
+            (room, chunks used in left-to-right order of the unmirrored room)
+        """
+        chunks = self.plan(width - 2)
+        return self.stitch(chunks, shape_type), chunks
+
+
+def compose_validation(room: RoomTemplate, chunks: Sequence[Chunk]) -> dict:
+    """
+    Validate a stitched room from its chunks' stored results
+    
+    Gives the same results as validator_simple.validate_room_simple
+    without pathfinding: chunks passed the spacing and gap checks on their
+    own and meet on flat floor, so only the two wall columns are read from
+    the room.
+    
+    Args:
+        room: Room built by ChunkLibrary.stitch
+        chunks: The chunks it was built from
+    
+    Returns:
+        dict: Validation results with tier
+    """
+    results = {
+        "valid": True,
+        "tier": "NORMAL",
+        "errors": [],
+        "warnings": [],
+        "max_gap_width": max((chunk.max_gap_width for chunk in chunks), default=0),
+        "spike_count": sum(chunk.spike_count for chunk in chunks),
+        "platform_count": sum(chunk.platform_count for chunk in chunks),
+        "floor_coverage": 0.0,
+        "path_found": None,
+        "path_length": 0
+    }
+    
+    # Chunk warnings in room order (a mirrored room reads them backwards)
+    if room.shape_type == "horizontal_left":
+        for chunk in reversed(chunks):
+            results["warnings"].extend(reversed(chunk.warnings))
+    else:
+        for chunk in chunks:
+            results["warnings"].extend(chunk.warnings)
+    
+    # Doors carved through the wall columns can leave a one-tile gap
+    floor_y = room.height - 2
+    floor_tiles = sum(chunk.floor_tiles for chunk in chunks)
+    for x in (0, room.width - 1):
+        tile = room.get_tile(x, floor_y)
+        if tile == EMPTY:
+            results["max_gap_width"] = max(results["max_gap_width"], 1)
+        elif tile in (GROUND, PLATFORM_ONEWAY):
+            floor_tiles += 1
+    
+    results["floor_coverage"] = floor_tiles / room.width if room.width > 0 else 0
+    if results["floor_coverage"] < 0.25:
+        results["valid"] = False
+        results["tier"] = "IMPOSSIBLE"
+        results["errors"].append(f"Insufficient floor: {results['floor_coverage']:.1%}")
+        return results
+    
+    results["tier"] = calculate_tier_simple(results)
+    return results
+
+
+def chunk_library(height: int, difficulty: int,
+                  features: Optional[Sequence[str]] = None) -> ChunkLibrary:
+    """
+    Get the chunk library for a room height, building it on first use
+    
+    Libraries are kept per (height, difficulty, features), so later rooms
+    with the same settings are only a lookup and a concatenation.
+    """
+    if features is None:
+        features = ["platforms", "spikes", "slopes"]
+    key = (height, difficulty, tuple(sorted(features)))
+    library = _libraries.get(key)
+    if library is None:
+        library = ChunkLibrary(height, difficulty, features)
+        if len(_libraries) >= LIBRARY_CACHE_SIZE:
+            # Drop the oldest entry
+            del _libraries[next(iter(_libraries))]
+        _libraries[key] = library
+    return library
+
+
+def generate(shape_type: str, difficulty: int, width: int,
+             features: Optional[Sequence[str]] = None, height: Optional[int] = None) -> RoomTemplate:
+    """
+    Generate a horizontal room of any width from the chunk library
+    
+    Args:
+        shape_type: "horizontal_right" or "horizontal_left"
+        difficulty: Difficulty level (1-10)
+        width: Room width in tiles
+        features: Features to include (default: platforms, spikes, slopes)
+        height: Room height in tiles (default: the shape's usual height)
+    
+    Returns:
+        Generated RoomTemplate (its composed validation is stored in
+        room.validation)
+    """
+    if height is None:
+        height = config.SIZE_DIMENSIONS[shape_type]["medium"][1]
+    library = chunk_library(height, difficulty, features)
+    room, chunks = library.assemble(width, shape_type)
+    room.validation = compose_validation(room, chunks)
+    return room
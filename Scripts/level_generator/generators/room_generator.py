@@ -10,12 +10,19 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.room_template import RoomTemplate
+from utils.door_signature import annotate_door_signatures
 from generators.shape_generators import horizontal_right, horizontal_left, vertical_up, vertical_down, box
+from generators import chunk_library
+import config
+
+# Shapes whose generators only emit rooms the validator accepts
+VALID_BY_CONSTRUCTION = ('horizontal_right', 'horizontal_left')
 
 
 def generate_room(shape_type: str, difficulty: int, size: str, 
                   features = None, entrance_dir = None, exit_dir = None,
-                  slope_count: int = 2, max_elevation_change: int = 8) -> RoomTemplate:
+                  slope_count: int = 2, max_elevation_change: int = 8,
+                  extra_doors: dict = None, width: int = None) -> RoomTemplate:
     """
     Generate a room template with the specified parameters
     
@@ -28,9 +35,14 @@ def generate_room(shape_type: str, difficulty: int, size: str,
         exit_dir: Optional exit direction (only used for box)
         slope_count: Number of slopes to generate in horizontal rooms (default: 2)
         max_elevation_change: Maximum elevation change in tiles (default: 8)
+        extra_doors: Optional dict of additional door name -> direction (only used for box)
+        width: Optional room width in tiles (only used for horizontal shapes): the
+               room is stitched from the chunk library (generators.chunk_library)
+               instead of being generated at the size's width
     
     Returns:
-        Generated RoomTemplate
+        Generated RoomTemplate (door connections carry their 'signature',
+        see utils.door_signature)
     
     Raises:
         ValueError: If shape_type is unknown or if box has invalid entrance/exit directions
@@ -43,17 +55,22 @@ def generate_room(shape_type: str, difficulty: int, size: str,
     difficulty = max(1, min(10, difficulty))
     
     # Dispatch to appropriate generator
-    if shape_type == "horizontal_right":
-        return horizontal_right.generate(difficulty, size, features, slope_count, max_elevation_change)
+    if width is not None and shape_type in ("horizontal_right", "horizontal_left"):
+        height = config.SIZE_DIMENSIONS[shape_type][size][1]
+        room = chunk_library.generate(shape_type, difficulty, width, features, height)
+        room.metadata["length"] = size
+    
+    elif shape_type == "horizontal_right":
+        room = horizontal_right.generate(difficulty, size, features, slope_count, max_elevation_change)
     
     elif shape_type == "horizontal_left":
-        return horizontal_left.generate(difficulty, size, features, slope_count, max_elevation_change)
+        room = horizontal_left.generate(difficulty, size, features, slope_count, max_elevation_change)
     
     elif shape_type == "vertical_up":
-        return vertical_up.generate(difficulty, size, features)
+        room = vertical_up.generate(difficulty, size, features)
     
     elif shape_type == "vertical_down":
-        return vertical_down.generate(difficulty, size, features)
+        room = vertical_down.generate(difficulty, size, features)
     
     elif shape_type == "box":
         # Box requires direction parameters
@@ -61,11 +78,15 @@ def generate_room(shape_type: str, difficulty: int, size: str,
             entrance_dir = 'left'  # default
         if exit_dir is None:
             exit_dir = 'right'  # default
-        return box.generate(difficulty, size, features, entrance_dir, exit_dir)
+        room = box.generate(difficulty, size, features, entrance_dir, exit_dir, extra_doors)
     
     else:
         raise ValueError(f"Unknown shape type: {shape_type}. "
                         f"Available shapes: horizontal_right, horizontal_left, vertical_up, vertical_down, box")
+    
+    # Record how each door meets the neighbouring room
+    annotate_door_signatures(room)
+    return room
 
 
 def get_available_shapes() -> list:
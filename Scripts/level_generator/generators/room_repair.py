@@ -0,0 +1,224 @@
+"""
+Local repairs for generated rooms
+
+Most rooms the validator rejects fail on a few tiles, not on their
+layout, so they're patched in place instead of thrown away:
+
+- spacing violations (validator_simple.platform_spacing_violations):
+  a platform with something 1-2 tiles above moves to the nearest row
+  with headroom (it may be a rung of a climb, so it isn't just trimmed),
+  ground buried under other solid tiles becomes wall (it's fill, not a
+  floor), and a one-tile sliver between a floor and a solid tile is
+  filled in
+- a door blocked by solid tiles is carved open again, and a side door
+  with nothing to land on inside gets a short ledge under it
+
+Spacing repairs recheck only the violations left after each pass, so a
+repair costs a few bitboard checks rather than a new room. A repair that
+cuts the entrance->exit path the room had is undone, and the room is
+rejected as it would have been without repairs.
+"""
+import sys
+import os
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.room_template import RoomTemplate
+from utils.door_signature import annotate_door_signatures, compute_door_signature
+from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, is_solid
+from validation.pathfinding import astar
+from validation.validator_simple import platform_spacing_violations
+import config
+
+
+def _blocks(tile: int) -> bool:
+    """Tiles the spacing rules treat as something above a platform"""
+    return tile in (GROUND, WALL, PLATFORM_ONEWAY)
+
+
+def _fits(room: RoomTemplate, y: int, span: range) -> bool:
+    """Check that a platform at row y over span keeps every spacing rule"""
+    for x in span:
+        if room.get_tile(x, y) != EMPTY:
+            return False
+        for dy in range(1, config.PLAYER_TOTAL_HEIGHT):
+            # Clearance above the platform, and none stood on just under it
+            if y - dy < 0 or _blocks(room.get_tile(x, y - dy)):
+                return False
+            if room.get_tile(x, y + dy) in (GROUND, PLATFORM_ONEWAY):
+                return False
+    return True
+
+
+def move_crowded_platforms(room: RoomTemplate) -> int:
+    """
+    Move platforms without headroom to the nearest row that has it
+    
+    Each platform run with something 1-2 tiles above moves as a whole,
+    nearest row first and below before above; a run with no row that
+    keeps every spacing rule is dropped.
+    
+    Args:
+        room: Room to repair in place
+    
+    Returns:
+        Number of platform tiles moved or dropped
+    """
+    floor_level = room.height - 2
+    runs = set()
+    for x, y, _ in platform_spacing_violations(room):
+        if room.get_tile(x, y) != PLATFORM_ONEWAY:
+            continue
+        start = x
+        while room.get_tile(start - 1, y) == PLATFORM_ONEWAY:
+            start -= 1
+        end = x
+        while room.get_tile(end + 1, y) == PLATFORM_ONEWAY:
+            end += 1
+        runs.add((start, end + 1, y))
+    
+    moved = 0
+    for start, end, y in sorted(runs, key=lambda run: run[2]):
+        span = range(start, end)
+        for x in span:
+            room.set_tile(x, y, EMPTY)
+        moved += len(span)
+        for distance in range(1, room.height):
+            row = next((r for r in (y + distance, y - distance)
+                        if 1 <= r < floor_level and _fits(room, r, span)), None)
+            if row is not None:
+                for x in span:
+                    room.set_tile(x, row, PLATFORM_ONEWAY)
+                break
+    return moved
+
+
+def trim_platform_spacing(room: RoomTemplate) -> int:
+    """
+    Fix the validator's platform spacing violations
+    
+    Crowded platforms are moved first (move_crowded_platforms); what's
+    left is patched tile by tile.
+    
+    Args:
+        room: Room to repair in place
+    
+    Returns:
+        Number of tiles changed
+    """
+    changed = move_crowded_platforms(room)
+    # Each pass settles at least the top tile of every column it touches
+    for _ in range(room.height):
+        violations = platform_spacing_violations(room)
+        if not violations:
+            break
+        for x, y, dy in violations:
+            tile = room.get_tile(x, y)
+            if tile == PLATFORM_ONEWAY:
+                # Too close under something: trim the platform
+                room.set_tile(x, y, EMPTY)
+            elif room.get_tile(x, y - dy) == PLATFORM_ONEWAY:
+                # Platform hanging just over the ground: trim it
+                room.set_tile(x, y - dy, EMPTY)
+            elif dy == 1:
+                # Ground under solid tiles is fill, not a floor
+                room.set_tile(x, y, WALL)
+            else:
+                # One-tile sliver under a solid tile: fill it
+                room.set_tile(x, y - 1, WALL)
+            changed += 1
+    return changed
+
+
+def recarve_doors(room: RoomTemplate) -> int:
+    """
+    Reopen blocked doors and give side doors something to land on
+    
+    Door signatures are left stale; repair_room recomputes them once every
+    repair has run.
+    
+    Args:
+        room: Room to repair in place
+    
+    Returns:
+        Number of doors changed
+    """
+    changed = 0
+    for name, conn in room.connections.items():
+        signature = compute_door_signature(room, name)
+        x, y = conn['position']['x'], conn['position']['y']
+        carved = False
+        
+        if signature.side in ('left', 'right'):
+            wall_x = 0 if signature.side == 'left' else room.width - 1
+            inward = 1 if signature.side == 'left' else -1
+            if not signature.opening:
+                # Clear a doorway the player fits through
+                for column in (wall_x, wall_x + inward):
+                    for row in range(max(0, y - config.PLAYER_HEIGHT), y + 1):
+                        if is_solid(room.get_tile(column, row)):
+                            room.set_tile(column, row, EMPTY)
+                carved = True
+                signature = compute_door_signature(room, name)
+            if signature.landing is None and y + 1 < room.height:
+                # Two-tile ledge just inside the door
+                for column in (wall_x + inward, wall_x + 2 * inward):
+                    room.set_tile(column, y + 1, GROUND)
+                carved = True
+        elif not signature.opening:
+            wall_y = 0 if signature.side == 'up' else room.height - 1
+            room.set_tile(x, wall_y, EMPTY)
+            carved = True
+        
+        changed += carved
+    
+    return changed
+
+
+def repair_room(room: RoomTemplate) -> List[str]:
+    """
+    Apply every local repair a room needs
+    
+    Rooms without problems are left untouched. Door signatures are
+    recomputed after the last repair, since moving a platform can remove
+    a door's landing. If the repairs cut an entrance->exit path the room
+    had (pathfinding.astar), they are undone.
+    
+    Args:
+        room: Room to repair in place
+    
+    Returns:
+        Description of each repair made (empty if none was needed or the
+        repairs were undone)
+    """
+    original = room.copy()
+    repairs = []
+    
+    doors = recarve_doors(room)
+    if doors:
+        repairs.append(f"Re-carved {doors} door(s)")
+    
+    trimmed = trim_platform_spacing(room)
+    if trimmed:
+        repairs.append(f"Fixed spacing at {trimmed} tile(s)")
+    
+    if not repairs:
+        return repairs
+    
+    if _door_path(original) and not _door_path(room):
+        room.tiles = original.tiles
+        room.connections = original.connections
+        return []
+    
+    annotate_door_signatures(room)
+    return repairs
+
+
+def _door_path(room: RoomTemplate) -> bool:
+    """Check that the room's exit can be reached from its entrance"""
+    if 'entrance' not in room.connections or 'exit' not in room.connections:
+        return False
+    start, goal = (room.connections[name]['position'] for name in ('entrance', 'exit'))
+    return astar(room, (start['x'], start['y']), (goal['x'], goal['y'])) is not None
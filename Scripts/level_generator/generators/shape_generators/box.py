@@ -16,7 +16,8 @@ import config
 
 
 def generate(difficulty: int, size: str, features: list, 
-             entrance_dir: str = 'left', exit_dir: str = 'right') -> RoomTemplate:
+             entrance_dir: str = 'left', exit_dir: str = 'right',
+             extra_doors: dict = None) -> RoomTemplate:
     """
     Generate a box arena room template
     
@@ -26,16 +27,22 @@ def generate(difficulty: int, size: str, features: list,
         features: List of features to include (e.g., ["spikes", "platforms"])
         entrance_dir: Direction of entrance door ('left', 'right', 'up', 'down')
         exit_dir: Direction of exit door ('left', 'right', 'up', 'down')
+        extra_doors: Optional dict of additional door name -> direction for
+                     arenas with more than two connections (e.g. {"exit_2": "up"})
     
     Returns:
         Generated RoomTemplate
     
     Raises:
-        ValueError: If entrance_dir == exit_dir (cannot have same-side entrance/exit)
+        ValueError: If two doors share a side (cannot have same-side entrance/exit)
     """
     # Validate: entrance and exit cannot be the same direction
     if entrance_dir == exit_dir:
         raise ValueError(f"Box entrance and exit cannot be same direction: {entrance_dir}")
+    extra_doors = extra_doors or {}
+    used_sides = [entrance_dir, exit_dir] + list(extra_doors.values())
+    if len(set(used_sides)) != len(used_sides):
+        raise ValueError(f"Box doors cannot share a side: {used_sides}")
     # Get dimensions from config
     width, height = config.SIZE_DIMENSIONS["box"][size]
     
@@ -43,7 +50,7 @@ def generate(difficulty: int, size: str, features: list,
     room = RoomTemplate(width, height, "box")
     room.metadata["difficulty"] = difficulty
     room.metadata["length"] = size
-    room.metadata["tags"] = features.copy()
+    room.set_tags(features)
     
     # Create enclosed arena (will clear door areas later)
     _create_boundary(room, entrance_dir, exit_dir)
@@ -58,6 +65,8 @@ def generate(difficulty: int, size: str, features: list,
     
     # Add entry and exit doors
     _add_doors(room, entrance_dir, exit_dir)
+    for name, direction in extra_doors.items():
+        add_door(room, name, direction)
     
     # Add spawn zones
     _add_spawn_zones(room, difficulty)
@@ -214,69 +223,28 @@ def _add_doors(room: RoomTemplate, entrance_dir: str, exit_dir: str) -> None:
         entrance_dir: Entrance direction ('left', 'right', 'up', 'down')
         exit_dir: Exit direction ('left', 'right', 'up', 'down')
     """
-    mid_width = room.width // 2
-    mid_height = room.height // 2
-    
-    # Add entrance door based on direction
-    if entrance_dir == 'left':
-        room.add_connection("entrance", 0, mid_height, "left")
-        # Clear space around door
-        for dy in range(-1, 2):
-            y = mid_height + dy
-            if 0 <= y < room.height:
-                room.set_tile(0, y, EMPTY)
-                room.set_tile(1, y, EMPTY)
-        # Add landing platform
-        if mid_height + 2 < room.height:
-            for x in range(2, 5):
-                room.set_tile(x, mid_height + 1, PLATFORM_ONEWAY)
-    
-    elif entrance_dir == 'right':
-        room.add_connection("entrance", room.width - 1, mid_height, "right")
-        # Clear space around door
-        for dy in range(-1, 2):
-            y = mid_height + dy
-            if 0 <= y < room.height:
-                room.set_tile(room.width - 1, y, EMPTY)
-                room.set_tile(room.width - 2, y, EMPTY)
-        # Add landing platform
-        if mid_height + 2 < room.height:
-            for x in range(room.width - 5, room.width - 2):
-                room.set_tile(x, mid_height + 1, PLATFORM_ONEWAY)
+    add_door(room, "entrance", entrance_dir)
+    add_door(room, "exit", exit_dir)
+
+
+def add_door(room: RoomTemplate, name: str, direction: str) -> None:
+    """
+    Add a door connection centered on one side of an arena
     
-    elif entrance_dir == 'up':
-        room.add_connection("entrance", mid_width, 0, "up")
-        # Clear space around door
-        for dx in range(-2, 3):
-            x = mid_width + dx
-            if 0 <= x < room.width:
-                room.set_tile(x, 0, EMPTY)
-                if 1 < room.height:
-                    room.set_tile(x, 1, EMPTY)
-        # Add landing platform
-        for dx in range(-2, 3):
-            x = mid_width + dx
-            if 0 <= x < room.width and 2 < room.height:
-                room.set_tile(x, 2, PLATFORM_ONEWAY)
+    Carves the opening through the boundary wall and adds a landing
+    platform inside it. Used for the entrance and exit, and for any extra
+    doors of branching arenas.
     
-    elif entrance_dir == 'down':
-        room.add_connection("entrance", mid_width, room.height - 1, "down")
-        # Clear space around door
-        for dx in range(-2, 3):
-            x = mid_width + dx
-            if 0 <= x < room.width:
-                room.set_tile(x, room.height - 1, EMPTY)
-                if room.height - 2 >= 0:
-                    room.set_tile(x, room.height - 2, EMPTY)
-        # Add landing platform
-        for dx in range(-2, 3):
-            x = mid_width + dx
-            if 0 <= x < room.width and room.height - 3 >= 0:
-                room.set_tile(x, room.height - 3, PLATFORM_ONEWAY)
+    Args:
+        room: Room template to modify
+        name: Connection name (e.g., "entrance", "exit", "exit_2")
+        direction: Side of the room ('left', 'right', 'up', 'down')
+    """
+    mid_width = room.width // 2
+    mid_height = room.height // 2
     
-    # Add exit door based on direction
-    if exit_dir == 'left':
-        room.add_connection("exit", 0, mid_height, "left")
+    if direction == 'left':
+        room.add_connection(name, 0, mid_height, "left")
         # Clear space around door
         for dy in range(-1, 2):
             y = mid_height + dy
@@ -288,8 +256,8 @@ def _add_doors(room: RoomTemplate, entrance_dir: str, exit_dir: str) -> None:
             for x in range(2, 5):
                 room.set_tile(x, mid_height + 1, PLATFORM_ONEWAY)
     
-    elif exit_dir == 'right':
-        room.add_connection("exit", room.width - 1, mid_height, "right")
+    elif direction == 'right':
+        room.add_connection(name, room.width - 1, mid_height, "right")
         # Clear space around door
         for dy in range(-1, 2):
             y = mid_height + dy
@@ -301,8 +269,8 @@ def _add_doors(room: RoomTemplate, entrance_dir: str, exit_dir: str) -> None:
             for x in range(room.width - 5, room.width - 2):
                 room.set_tile(x, mid_height + 1, PLATFORM_ONEWAY)
     
-    elif exit_dir == 'up':
-        room.add_connection("exit", mid_width, 0, "up")
+    elif direction == 'up':
+        room.add_connection(name, mid_width, 0, "up")
         # Clear space around door
         for dx in range(-2, 3):
             x = mid_width + dx
@@ -316,8 +284,8 @@ def _add_doors(room: RoomTemplate, entrance_dir: str, exit_dir: str) -> None:
             if 0 <= x < room.width and 2 < room.height:
                 room.set_tile(x, 2, PLATFORM_ONEWAY)
     
-    elif exit_dir == 'down':
-        room.add_connection("exit", mid_width, room.height - 1, "down")
+    elif direction == 'down':
+        room.add_connection(name, mid_width, room.height - 1, "down")
         # Clear space around door
         for dx in range(-2, 3):
             x = mid_width + dx
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from utils.room_template import RoomTemplate
 from utils.tile_constants import *
+from utils.movement import jump_vertical_range
 import config
 
 
@@ -37,7 +38,7 @@ def generate(difficulty: int, length: str, features: list,
     room = RoomTemplate(width, height, "horizontal_right")
     room.metadata["difficulty"] = difficulty
     room.metadata["length"] = length
-    room.metadata["tags"] = features.copy()
+    room.set_tags(features)
     
     # Generate base structure with terrain elevation
     # Use slope_count only if "slopes" feature is enabled
@@ -70,11 +71,18 @@ def _generate_base_floor(room: RoomTemplate, difficulty: int,
     """
     Generate base floor with elevation changes and strategic gaps
     
+    Built valid by construction: the floor never drops below the baseline
+    or rises into the ceiling clearance, slopes climb one tile per column,
+    and a gap is only cut where the player can jump from the last floor
+    column to the next one (see _gap_is_jumpable).
+    
     Returns:
         dict with 'floor_heights' array (Y position for each X), 
         'entrance_y', and 'exit_y' for door placement
     """
     baseline_floor_y = room.height - 2  # Second from bottom
+    # Highest floor that leaves the player standing room under the top wall
+    min_floor_y = config.PLAYER_TOTAL_HEIGHT + 1
     
     # Initialize floor heights at baseline
     floor_heights = [baseline_floor_y] * room.width
@@ -124,24 +132,27 @@ def _generate_base_floor(room: RoomTemplate, difficulty: int,
                 # Random direction
                 slope_direction = random.choice(['up', 'down'])
                 
-                # Calculate elevation change
+                # Calculate elevation change (a down slope starts level with
+                # the floor before it, so it drops one tile less than its length)
                 if slope_direction == 'up':
                     elevation_delta = -slope_length
                 else:
-                    elevation_delta = slope_length
+                    elevation_delta = slope_length - 1
                 
-                # Check elevation limit
-                if abs(cumulative_elevation + elevation_delta) > max_elevation_change:
-                    # Try opposite direction
-                    slope_direction = 'down' if slope_direction == 'up' else 'up'
-                    elevation_delta = -elevation_delta
-                    
-                    # If still exceeds, use shorter slope
-                    if abs(cumulative_elevation + elevation_delta) > max_elevation_change:
-                        slope_length = min(slope_length, max_elevation_change - abs(cumulative_elevation))
-                        if slope_length < 3:
-                            continue  # Skip if too short
-                        elevation_delta = -slope_length if slope_direction == 'up' else slope_length
+                # Check elevation limit: the floor stays between the baseline
+                # (nothing to fall to below it) and the ceiling clearance
+                room_up = cumulative_elevation - max(-max_elevation_change, min_floor_y - baseline_floor_y)
+                room_down = min(max_elevation_change, 0) - cumulative_elevation
+                if abs(elevation_delta) > (room_up if slope_direction == 'up' else room_down):
+                    # Try opposite direction, or a shorter slope
+                    slope_direction = 'up' if room_up >= room_down + 1 else 'down'
+                    if slope_direction == 'up':
+                        slope_length = min(slope_length, room_up)
+                    else:
+                        slope_length = min(slope_length, room_down + 1)
+                    if slope_length < 3:
+                        continue  # Skip if too short
+                    elevation_delta = -slope_length if slope_direction == 'up' else slope_length - 1
                 
                 # Record slope
                 slope_positions.append((slope_x, slope_direction, slope_length))
@@ -173,7 +184,7 @@ def _generate_base_floor(room: RoomTemplate, difficulty: int,
             for i in range(length):
                 x = slope_x + i
                 if x < room.width:
-                    new_y = start_height + i + 1
+                    new_y = start_height + i
                     # Clamp to valid range
                     floor_heights[x] = max(1, min(room.height - 1, new_y))
             
@@ -184,17 +195,17 @@ def _generate_base_floor(room: RoomTemplate, difficulty: int,
     
     # Place tiles based on floor_heights
     gap_probability = min(difficulty * config.GAP_FREQUENCY_PER_DIFFICULTY, 0.4)
+    slope_columns = {slope_x + i for (slope_x, _, length) in slope_positions for i in range(length)}
     
     x = 0
     while x < room.width:
         # Decide if we should create a gap here (not on slopes)
-        is_on_slope = any(slope_x <= x < slope_x + length 
-                         for (slope_x, _, length) in slope_positions)
+        is_on_slope = x in slope_columns
+        gap_width = random.randint(2, min(4, 2 + difficulty // 3))
         
-        if not is_on_slope and x > 5 and x < room.width - 5 and random.random() < gap_probability:
+        if (not is_on_slope and x > 5 and x < room.width - 5 and random.random() < gap_probability
+                and _gap_is_jumpable(room, floor_heights, slope_columns, x, gap_width)):
             # Create a gap
-            gap_width = random.randint(2, min(4, 2 + difficulty // 3))
-            
             # Mark gap by setting floor_heights to room.height (below view)
             for gx in range(x, min(x + gap_width, room.width)):
                 floor_heights[gx] = room.height  # Below visible area = gap
@@ -221,9 +232,10 @@ def _generate_base_floor(room: RoomTemplate, difficulty: int,
                 else:
                     room.set_tile(x, floor_y, GROUND)
                 
-                # Fill ground below (foundation)
+                # Fill ground below (foundation); above the floor rows the
+                # fill is wall, so buried tiles don't read as floors
                 for y in range(floor_y + 1, room.height):
-                    room.set_tile(x, y, GROUND)
+                    room.set_tile(x, y, GROUND if y >= baseline_floor_y else WALL)
             
             x += 1
     
@@ -238,6 +250,27 @@ def _generate_base_floor(room: RoomTemplate, difficulty: int,
     }
 
 
+def _gap_is_jumpable(room: RoomTemplate, floor_heights: list, slope_columns: set,
+                     x: int, gap_width: int) -> bool:
+    """
+    Check that a gap starting at x can be jumped across
+    
+    The player takes off from the floor column before the gap and lands
+    on the one after it, so that jump must be within the player's reach
+    (utils.movement.jump_vertical_range) and neither end may be a slope.
+    """
+    take_off, landing = x - 1, x + gap_width
+    if gap_width > config.MAX_JUMP_DISTANCE or landing >= room.width:
+        return False
+    if floor_heights[take_off] >= room.height:
+        return False  # Right after another gap
+    if any(column in slope_columns for column in range(take_off, landing + 1)):
+        return False
+    dy = floor_heights[landing] - floor_heights[take_off]
+    return landing - take_off <= config.MAX_JUMP_DISTANCE and \
+        dy in jump_vertical_range(landing - take_off, config.MAX_JUMP_HEIGHT)
+
+
 def _add_platforms(room: RoomTemplate, difficulty: int, floor_heights: list) -> None:
     """
     Add floating platforms based on difficulty
@@ -257,17 +290,19 @@ def _add_platforms(room: RoomTemplate, difficulty: int, floor_heights: list) ->
             platform_width = random.randint(3, 6)
             platform_x = random.randint(3, room.width - platform_width - 3)
             
-            # Get local floor height at platform X position
-            local_floor_y = floor_heights[platform_x]
+            # Get local floor height at platform X position (the highest
+            # floor under the whole platform)
+            local_floor_y = min(floor_heights[platform_x:platform_x + platform_width])
             
             # Skip if this is a gap
             if local_floor_y >= room.height:
                 continue
             
             # Position platform above local floor
-            # Ensure we have enough room above the floor
-            min_platform_y = max(1, local_floor_y - 10)
-            max_platform_y = local_floor_y - 3
+            # Ensure we have enough room above the floor (and below the
+            # top wall, which is only added later)
+            min_platform_y = max(config.PLAYER_TOTAL_HEIGHT, local_floor_y - 10)
+            max_platform_y = local_floor_y - config.PLAYER_TOTAL_HEIGHT
             
             if max_platform_y < min_platform_y:
                 continue  # Not enough vertical space for platform
@@ -348,16 +383,10 @@ def _add_boundary_walls(room: RoomTemplate) -> None:
     for x in range(room.width):
         room.set_tile(x, 0, WALL)
     
-    # Left wall (except door area)
-    door_y = room.height // 2
-    for y in range(room.height):
-        if abs(y - door_y) > 1:  # Leave space for door
-            room.set_tile(0, y, WALL)
-    
-    # Right wall (except door area)
+    # Left and right walls (doors are carved out by _add_doors)
     for y in range(room.height):
-        if abs(y - door_y) > 1:  # Leave space for door
-            room.set_tile(room.width - 1, y, WALL)
+        room.set_tile(0, y, WALL)
+        room.set_tile(room.width - 1, y, WALL)
 
 
 def _add_doors(room: RoomTemplate, floor_data: dict) -> None:
@@ -34,7 +34,7 @@ def generate(difficulty: int, length: str, features: list) -> RoomTemplate:
     room = RoomTemplate(width, height, "vertical_up")
     room.metadata["difficulty"] = difficulty
     room.metadata["length"] = length
-    room.metadata["tags"] = features.copy()
+    room.set_tags(features)
     
     # Generate climbing path
     _generate_climbing_walls(room, difficulty)
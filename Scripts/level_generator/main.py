@@ -23,6 +23,7 @@ Examples:
   python main.py --shape horizontal_right --difficulty 5 --length medium
   python main.py --shape vertical_up --difficulty 8 --length long
   python main.py --shape box --difficulty 5 --size medium --features spikes,platforms
+  python main.py --shape horizontal_right --difficulty 5 --length medium --width 200
         """
     )
     
@@ -55,6 +56,12 @@ Examples:
         help='Room size for box arenas (small, medium, large)'
     )
     
+    parser.add_argument(
+        '--width',
+        type=int,
+        help='Room width for horizontal shapes, stitched from the chunk library (optional)'
+    )
+    
     parser.add_argument(
         '--features',
         type=str,
@@ -110,7 +117,7 @@ Examples:
     print(f"  Features: {', '.join(features)}")
     
     try:
-        room = generate_room(args.shape, args.difficulty, size, features)
+        room = generate_room(args.shape, args.difficulty, size, features, width=args.width)
         print(f"✓ Generated room: {room.id}")
         
         # Validate room and display tier
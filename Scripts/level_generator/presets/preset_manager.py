@@ -3,17 +3,87 @@ Preset Manager for World Generation Configurations
 
 Allows saving and loading world configuration presets from JSON files.
 Presets define world parameters like level count, difficulty curves, themes, etc.
+
+The manager keeps a registry of the presets directory: files are parsed
+and validated once, re-read only when their modification time changes,
+and indexed by tag. Compiled WorldConfig objects are cached per file
+version as well.
 """
 
 import json
 import os
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 from pathlib import Path
 
+from entities.enemy_placer import ENEMY_THEMES
+from entities.obstacle_placer import OBSTACLE_THEMES
+
 if TYPE_CHECKING:
     from world_generator import WorldConfig
 
 
+DIFFICULTY_CURVES = ['linear', 'spike', 'plateau']
+PREDOMINANCE_OPTIONS = ['horizontal', 'vertical', 'mixed']
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+# Preset schema: field -> (check, description of valid values)
+PRESET_SCHEMA: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+    'name': (lambda v: isinstance(v, str) and v != '', 'a non-empty string'),
+    'description': (lambda v: isinstance(v, str), 'a string'),
+    'level_count': (lambda v: _is_int(v) and v >= 1, 'an integer >= 1'),
+    'difficulty_curve': (lambda v: v in DIFFICULTY_CURVES, f'one of {DIFFICULTY_CURVES}'),
+    'horizontal_vertical_ratio': (lambda v: _is_number(v) and 0.0 <= v <= 1.0, 'a number from 0 to 1'),
+    'predominance': (lambda v: v in PREDOMINANCE_OPTIONS, f'one of {PREDOMINANCE_OPTIONS}'),
+    'slope_count': (lambda v: _is_int(v) and v >= 0, 'an integer >= 0'),
+    'max_elevation_change': (lambda v: _is_int(v) and v >= 0, 'an integer >= 0'),
+    'enemy_theme': (lambda v: v in ENEMY_THEMES, f'one of {ENEMY_THEMES}'),
+    'obstacle_themes': (lambda v: _is_str_list(v) and v != [] and all(t in OBSTACLE_THEMES for t in v),
+                        f'a non-empty list of {sorted(OBSTACLE_THEMES)}'),
+    'save_point_frequency': (lambda v: _is_int(v) and v >= 0, 'an integer >= 0'),
+    'quality_attempts': (lambda v: _is_int(v) and v >= 1, 'an integer >= 1'),
+    'branches': (lambda v: _is_int(v) and v >= 0, 'an integer >= 0'),
+    'tags': (_is_str_list, 'a list of strings')
+}
+
+
+def validate_preset_data(data: Any) -> List[str]:
+    """
+    Check preset data against PRESET_SCHEMA
+    
+    Args:
+        data: Parsed preset JSON
+    
+    Returns:
+        List of error messages (empty if valid)
+    """
+    if not isinstance(data, dict):
+        return ["preset must be a JSON object"]
+    
+    errors = []
+    if 'name' not in data:
+        errors.append("missing required field 'name'")
+    for field, value in data.items():
+        if field not in PRESET_SCHEMA:
+            errors.append(f"unknown field '{field}'")
+            continue
+        check, expected = PRESET_SCHEMA[field]
+        if not check(value):
+            errors.append(f"'{field}' must be {expected}, got {value!r}")
+    return errors
+
+
 class WorldPreset:
     """Represents a world generation preset configuration."""
     
@@ -40,8 +110,10 @@ class WorldPreset:
         self.obstacle_themes = data.get('obstacle_themes', ['mixed'])
         self.save_point_frequency = data.get('save_point_frequency', 3)
         self.quality_attempts = data.get('quality_attempts', 5)
+        # Side paths off the main chain (world_generator.generate_world_graph)
+        self.branches = data.get('branches', 0)
         self.tags = data.get('tags', [])
-        
+    
     def to_dict(self) -> Dict:
         """Convert preset to dictionary format."""
         return {
@@ -56,6 +128,7 @@ class WorldPreset:
             'obstacle_themes': self.obstacle_themes,
             'save_point_frequency': self.save_point_frequency,
             'quality_attempts': self.quality_attempts,
+            'branches': self.branches,
             'tags': self.tags
         }
     
@@ -68,7 +141,11 @@ class WorldPreset:
             difficulty_curve=self.difficulty_curve,
             horizontal_vertical_ratio=self.horizontal_vertical_ratio,
             slope_count=self.slope_count,
-            max_elevation_change=self.max_elevation_change
+            max_elevation_change=self.max_elevation_change,
+            obstacle_themes=self.obstacle_themes,
+            enemy_theme=self.enemy_theme,
+            save_point_frequency=self.save_point_frequency,
+            quality_attempts=self.quality_attempts
         )
     
     def __repr__(self):
@@ -85,6 +162,88 @@ class PresetManager:
             presets_dir = os.path.join(os.path.dirname(__file__), '')
         self.presets_dir = Path(presets_dir)
         self.presets_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Registry, filled by the first scan
+        self._scanned = False
+        self._presets: Dict[str, Tuple[int, WorldPreset]] = {}  # filename -> (mtime, preset)
+        self._names: Dict[str, str] = {}  # lowercase preset name -> filename
+        self._tags: Dict[str, Set[str]] = {}  # tag -> filenames
+        self._world_configs: Dict[str, Tuple[int, 'WorldConfig']] = {}  # filename -> (mtime, config)
+    
+    def _parse(self, filepath: Path) -> WorldPreset:
+        """Read and validate a preset file"""
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        
+        errors = validate_preset_data(data)
+        if errors:
+            raise ValueError(f"Invalid preset {filepath.name}: " + "; ".join(errors))
+        return WorldPreset(data)
+    
+    def _register(self, filename: str, mtime: int, preset: WorldPreset):
+        """Add or replace a preset in the registry and its indexes"""
+        self._unregister(filename)
+        self._presets[filename] = (mtime, preset)
+        self._names[preset.name.lower()] = filename
+        for tag in preset.tags:
+            self._tags.setdefault(tag, set()).add(filename)
+    
+    def _unregister(self, filename: str):
+        """Remove a preset from the registry and its indexes"""
+        entry = self._presets.pop(filename, None)
+        self._world_configs.pop(filename, None)
+        if entry is None:
+            return
+        preset = entry[1]
+        if self._names.get(preset.name.lower()) == filename:
+            del self._names[preset.name.lower()]
+        for tag in preset.tags:
+            filenames = self._tags.get(tag)
+            if filenames is not None:
+                filenames.discard(filename)
+                if not filenames:
+                    del self._tags[tag]
+    
+    def refresh(self):
+        """
+        Rescan the presets directory
+        
+        Only new files and files whose modification time changed are
+        parsed; removed files are dropped. Invalid files are reported and
+        left out of the registry.
+        """
+        seen = set()
+        for filepath in sorted(self.presets_dir.glob('*.json')):
+            filename = filepath.name
+            seen.add(filename)
+            mtime = filepath.stat().st_mtime_ns
+            entry = self._presets.get(filename)
+            if entry is not None and entry[0] == mtime:
+                continue
+            try:
+                self._register(filename, mtime, self._parse(filepath))
+            except Exception as e:
+                self._unregister(filename)
+                print(f"Warning: Failed to load {filename}: {e}")
+        
+        for filename in list(self._presets):
+            if filename not in seen:
+                self._unregister(filename)
+        self._scanned = True
+    
+    def _ensure_scanned(self):
+        if not self._scanned:
+            self.refresh()
+    
+    def _resolve_filename(self, filename: str) -> str:
+        """Map a preset file name or preset name to its file name"""
+        if not filename.endswith('.json'):
+            filename += '.json'
+        if (self.presets_dir / filename).exists():
+            return filename
+        # Fall back to the registry's (case-insensitive) preset names
+        self._ensure_scanned()
+        return self._names.get(filename[:-len('.json')].lower(), filename)
     
     def save_preset(self, preset: WorldPreset, filename: Optional[str] = None) -> str:
         """
@@ -96,7 +255,14 @@ class PresetManager:
         
         Returns:
             Path to saved file
+        
+        Raises:
+            ValueError: If the preset does not match the preset schema
         """
+        errors = validate_preset_data(preset.to_dict())
+        if errors:
+            raise ValueError(f"Invalid preset {preset.name}: " + "; ".join(errors))
+        
         if filename is None:
             # Use preset name as filename
             filename = preset.name.replace(' ', '_').lower()
@@ -109,33 +275,70 @@ class PresetManager:
         with open(filepath, 'w') as f:
             json.dump(preset.to_dict(), f, indent=2)
         
+        if self._scanned:
+            self._register(filename, filepath.stat().st_mtime_ns, preset)
+        
         return str(filepath)
     
     def load_preset(self, filename: str) -> WorldPreset:
         """
         Load a preset from JSON file.
         
+        Presets are served from the registry; the file is only re-read if
+        it changed since it was last parsed.
+        
         Args:
             filename: Name of preset file (with or without .json extension)
+                      or preset name
         
         Returns:
             WorldPreset object
         
         Raises:
             FileNotFoundError: If preset file doesn't exist
+            ValueError: If the preset does not match the preset schema
         """
-        if not filename.endswith('.json'):
-            filename += '.json'
-        
+        filename = self._resolve_filename(filename)
         filepath = self.presets_dir / filename
         
         if not filepath.exists():
+            self._unregister(filename)
             raise FileNotFoundError(f"Preset not found: {filepath}")
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        mtime = filepath.stat().st_mtime_ns
+        entry = self._presets.get(filename)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
         
-        return WorldPreset(data)
+        preset = self._parse(filepath)
+        self._register(filename, mtime, preset)
+        return preset
+    
+    def load_world_config(self, filename: str) -> 'WorldConfig':
+        """
+        Get the compiled WorldConfig of a preset
+        
+        Configs are cached per file version, so the returned object is
+        shared between callers and should not be modified.
+        
+        Args:
+            filename: Name of preset file (with or without .json extension)
+                      or preset name
+        
+        Returns:
+            WorldConfig object
+        """
+        preset = self.load_preset(filename)
+        filename = self._resolve_filename(filename)
+        mtime = self._presets[filename][0]
+        
+        cached = self._world_configs.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        config = preset.to_world_config()
+        self._world_configs[filename] = (mtime, config)
+        return config
     
     def list_presets(self) -> List[Dict]:
         """
@@ -144,21 +347,18 @@ class PresetManager:
         Returns:
             List of dictionaries with preset info (name, description, tags)
         """
+        self._ensure_scanned()
         presets = []
         
-        for filepath in self.presets_dir.glob('*.json'):
-            try:
-                preset = self.load_preset(filepath.name)
-                presets.append({
-                    'filename': filepath.name,
-                    'name': preset.name,
-                    'description': preset.description,
-                    'tags': preset.tags,
-                    'levels': preset.level_count,
-                    'curve': preset.difficulty_curve
-                })
-            except Exception as e:
-                print(f"Warning: Failed to load {filepath.name}: {e}")
+        for filename, (_, preset) in sorted(self._presets.items()):
+            presets.append({
+                'filename': filename,
+                'name': preset.name,
+                'description': preset.description,
+                'tags': preset.tags,
+                'levels': preset.level_count,
+                'curve': preset.difficulty_curve
+            })
         
         return presets
     
@@ -172,17 +372,24 @@ class PresetManager:
         Returns:
             List of matching WorldPreset objects
         """
-        matching = []
+        self._ensure_scanned()
+        return [self._presets[filename][1] for filename in sorted(self._tags.get(tag, ()))]
+    
+    def get_presets_by_tags(self, tags: List[str]) -> List[str]:
+        """
+        Find the files of all presets having any of the given tags
         
-        for filepath in self.presets_dir.glob('*.json'):
-            try:
-                preset = self.load_preset(filepath.name)
-                if tag in preset.tags:
-                    matching.append(preset)
-            except Exception:
-                pass
+        Args:
+            tags: Tags to search for
         
-        return matching
+        Returns:
+            Sorted list of preset file names
+        """
+        self._ensure_scanned()
+        filenames = set()
+        for tag in tags:
+            filenames |= self._tags.get(tag, set())
+        return sorted(filenames)
     
     def create_default_presets(self):
         """Create a set of default example presets."""
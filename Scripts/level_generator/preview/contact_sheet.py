@@ -0,0 +1,174 @@
+"""
+Contact sheets for reviewing many rooms at once
+
+Packs room thumbnails into a grid of large images, each thumbnail with a
+tier-colored border and an id / tier / quality label, so a whole curated
+library can be reviewed from a handful of files:
+
+    <output_dir>/<prefix>_001.png, <prefix>_002.png, ...
+
+Sheets are composed as palette images straight from the tile palette
+(no per-room RGB conversion) and each one is saved once, when complete.
+Separate sheets are rendered in parallel worker processes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from preview.visualizer import TILE_PALETTE, render_tilemap_indexed
+from utils.room_template import RoomTemplate
+
+# Palette indices reserved for sheet decoration (above every tile ID,
+# below the grid line index)
+BACKGROUND_INDEX = 240
+TEXT_INDEX = 241
+TIER_INDICES = {
+    'EASY': 242,
+    'NORMAL': 243,
+    'HARD': 244,
+    'EXPERT': 245,
+    'IMPOSSIBLE': 246
+}
+UNKNOWN_TIER_INDEX = 247
+
+SHEET_COLORS = {
+    BACKGROUND_INDEX: (40, 40, 40),
+    TEXT_INDEX: (235, 235, 235),
+    242: (50, 200, 50),     # EASY - green
+    243: (60, 140, 255),    # NORMAL - blue
+    244: (255, 150, 30),    # HARD - orange
+    245: (230, 40, 40),     # EXPERT - red
+    246: (110, 110, 110),   # IMPOSSIBLE - gray
+    UNKNOWN_TIER_INDEX: (200, 200, 200)
+}
+
+PADDING = 6
+BORDER_WIDTH = 2
+LABEL_HEIGHT = 26  # Two lines of the default font
+
+
+def _sheet_palette() -> List[int]:
+    """Tile palette with the sheet decoration colors filled in"""
+    palette = list(TILE_PALETTE)
+    for index, color in SHEET_COLORS.items():
+        palette[index * 3:index * 3 + 3] = color
+    return palette
+
+
+def _cell_entry(entry: Any) -> Tuple[RoomTemplate, str, str, Optional[str]]:
+    """Get (room, id label, detail label, tier) for a template dict or room"""
+    if isinstance(entry, dict):
+        room = entry['room']
+        tier = entry.get('tier')
+        if tier is None and entry.get('validation'):
+            tier = entry['validation'].get('tier')
+        quality = entry.get('quality_score')
+        room_id = entry.get('id') or room.id
+    else:
+        room, tier, quality, room_id = entry, None, None, entry.id
+    
+    details = [tier or room.shape_type]
+    if quality is not None:
+        details.append(f"Q {quality:.1f}")
+    details.append(f"{room.width}x{room.height}")
+    return room, str(room_id), "  ".join(details), tier
+
+
+def _render_sheet(job: Tuple[str, List[Tuple[RoomTemplate, str, str, Optional[str]]],
+                             int, int, int, int]) -> str:
+    """Compose one contact sheet and save it (runs in a worker process)"""
+    output_path, cells, columns, cell_width, cell_height, thumb_tile_size = job
+    
+    rows = (len(cells) + columns - 1) // columns
+    sheet = Image.new('P', (columns * cell_width, rows * cell_height), BACKGROUND_INDEX)
+    sheet.putpalette(_sheet_palette())
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default()
+    
+    for index, (room, room_id, details, tier) in enumerate(cells):
+        x = (index % columns) * cell_width + PADDING
+        y = (index // columns) * cell_height + PADDING
+        
+        draw.text((x, y), room_id, fill=TEXT_INDEX, font=font)
+        draw.text((x, y + LABEL_HEIGHT // 2), details, fill=TEXT_INDEX, font=font)
+        
+        thumb_x = x + BORDER_WIDTH
+        thumb_y = y + LABEL_HEIGHT + BORDER_WIDTH
+        draw.rectangle(
+            [x, y + LABEL_HEIGHT,
+             thumb_x + room.width * thumb_tile_size + BORDER_WIDTH - 1,
+             thumb_y + room.height * thumb_tile_size + BORDER_WIDTH - 1],
+            fill=TIER_INDICES.get(tier, UNKNOWN_TIER_INDEX)
+        )
+        sheet.paste(render_tilemap_indexed(room, thumb_tile_size), (thumb_x, thumb_y))
+    
+    sheet.save(output_path, optimize=False)
+    return output_path
+
+
+def render_contact_sheets(entries: Sequence[Any], output_dir: str,
+                          prefix: str = "contact_sheet", columns: int = 8,
+                          rows: int = 8, thumb_tile_size: int = 3,
+                          workers: Optional[int] = None) -> List[str]:
+    """
+    Render rooms as labeled thumbnails packed into contact sheets
+    
+    Args:
+        entries: Template dicts (as stored by TemplateLibrary, or any dict
+                 with 'room' and optional 'id', 'tier', 'quality_score')
+                 or plain RoomTemplates
+        output_dir: Directory to write the sheets into
+        prefix: Sheet filename prefix
+        columns: Thumbnails per sheet row
+        rows: Thumbnail rows per sheet
+        thumb_tile_size: Pixels per tile in the thumbnails
+        workers: Worker processes (default: one per CPU, 1 renders inline)
+    
+    Returns:
+        List of written sheet paths, in entry order
+    """
+    if not entries:
+        return []
+    
+    os.makedirs(output_dir, exist_ok=True)
+    cells = [_cell_entry(entry) for entry in entries]
+    
+    # One cell size for every sheet, fitting the largest room
+    max_width = max(room.width for room, _, _, _ in cells)
+    max_height = max(room.height for room, _, _, _ in cells)
+    cell_width = max(max_width * thumb_tile_size + BORDER_WIDTH * 2, 120) + PADDING * 2
+    cell_height = LABEL_HEIGHT + max_height * thumb_tile_size + BORDER_WIDTH * 2 + PADDING * 2
+    
+    per_sheet = columns * rows
+    jobs = []
+    for sheet_index, start in enumerate(range(0, len(cells), per_sheet), 1):
+        output_path = os.path.join(output_dir, f"{prefix}_{sheet_index:03d}.png")
+        jobs.append((output_path, cells[start:start + per_sheet],
+                     columns, cell_width, cell_height, thumb_tile_size))
+    
+    if workers == 1 or len(jobs) == 1:
+        paths = [_render_sheet(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = list(executor.map(_render_sheet, jobs))
+    
+    print(f"✓ Rendered {len(cells)} rooms to {len(paths)} contact sheets in: {output_dir}")
+    return paths
+
+
+def render_library_contact_sheets(library, output_dir: str, **kwargs: Any) -> List[str]:
+    """
+    Render every template of a TemplateLibrary, best quality first
+    
+    Args:
+        library: TemplateLibrary
+        output_dir: Directory to write the sheets into
+        **kwargs: Passed to render_contact_sheets
+    
+    Returns:
+        List of written sheet paths
+    """
+    templates = sorted(library.templates, key=lambda t: t['quality_score'], reverse=True)
+    return render_contact_sheets(templates, output_dir, **kwargs)
@@ -2,6 +2,7 @@
 2D Visualizer for room templates using Pillow
 """
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 import sys
 import os
 
@@ -10,9 +11,99 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.room_template import RoomTemplate
 from utils.tile_constants import TILE_COLORS
+from utils.world_graph import level_links
+from utils.world_layout import level_positions
 import config
 
 
+# Palette index used for grid lines (not a valid tile ID)
+GRID_PALETTE_INDEX = 255
+
+
+def _build_palette() -> list:
+    """Flat 256-entry RGB palette mapping tile IDs to TILE_COLORS"""
+    palette = []
+    for tile_id in range(256):
+        palette.extend(TILE_COLORS.get(tile_id, (255, 0, 255)))  # Magenta for unknown tiles
+    palette[GRID_PALETTE_INDEX * 3:GRID_PALETTE_INDEX * 3 + 3] = config.GRID_COLOR
+    return palette
+
+
+TILE_PALETTE = _build_palette()
+
+
+def render_tilemap(room_template: RoomTemplate, tile_size: int,
+                   show_grid: bool = False) -> Image.Image:
+    """
+    Render just the tiles of a room as an RGB image
+    
+    The tile grid is loaded as a palette image (one pixel per tile) and
+    scaled up with nearest-neighbor resampling, instead of drawing each
+    tile separately. Grid lines come from a cached mask stamped in palette
+    space before the single conversion to RGB.
+    
+    Args:
+        room_template: RoomTemplate to render
+        tile_size: Pixels per tile
+        show_grid: Whether to draw grid lines
+    
+    Returns:
+        Image of size (width * tile_size, height * tile_size)
+    """
+    scaled = render_tilemap_indexed(room_template, tile_size)
+    
+    if show_grid:
+        grid_mask = _grid_mask(room_template.width, room_template.height,
+                               tile_size, config.GRID_LINE_WIDTH)
+        scaled.paste(GRID_PALETTE_INDEX, (0, 0), grid_mask)
+    
+    return scaled.convert('RGB')
+
+
+def render_tilemap_indexed(room_template: RoomTemplate, tile_size: int) -> Image.Image:
+    """
+    Render just the tiles of a room as a palette ('P') image
+    
+    Pixel values are tile IDs and the palette is TILE_PALETTE, so the
+    result can be pasted into other palette images without converting.
+    
+    Args:
+        room_template: RoomTemplate to render
+        tile_size: Pixels per tile
+    
+    Returns:
+        Image of size (width * tile_size, height * tile_size)
+    """
+    width, height = room_template.width, room_template.height
+    tiles = Image.frombytes('P', (width, height), room_template.tile_bytes())
+    tiles.putpalette(TILE_PALETTE)
+    return tiles.resize((width * tile_size, height * tile_size), Image.NEAREST)
+
+
+@lru_cache(maxsize=32)
+def _grid_mask(width: int, height: int, tile_size: int, line_width: int) -> Image.Image:
+    """
+    Grid line mask for a tilemap of the given size (cached per room size)
+    
+    Returns:
+        'L' image, 255 where grid lines are drawn
+    """
+    img_width = width * tile_size
+    img_height = height * tile_size
+    mask = Image.new('L', (img_width, img_height), 0)
+    draw = ImageDraw.Draw(mask)
+    
+    for x in range(width + 1):
+        px = x * tile_size
+        draw.line([(px, 0), (px, img_height)], fill=255, width=line_width)
+    
+    for y in range(height + 1):
+        py = y * tile_size
+        draw.line([(0, py), (img_width, py)], fill=255, width=line_width)
+    
+    return mask
+
+
 def render_room(room_template: RoomTemplate, output_path: str, 
                 show_grid: bool = True, show_metadata: bool = True) -> None:
     """
@@ -41,45 +132,8 @@ def render_room(room_template: RoomTemplate, output_path: str,
     # Calculate Y offset for tilemap (0 if no metadata, banner height if metadata)
     y_offset = config.METADATA_BANNER_HEIGHT if show_metadata else 0
     
-    # Draw tiles
-    for y in range(room_template.height):
-        for x in range(room_template.width):
-            tile_id = room_template.get_tile(x, y)
-            if tile_id is None:
-                tile_id = 0  # Treat None as empty
-            color = TILE_COLORS.get(tile_id, (255, 0, 255))  # Magenta for unknown tiles
-            
-            # Calculate pixel coordinates
-            px = x * tile_size
-            py = y * tile_size + y_offset
-            
-            # Draw tile rectangle
-            draw.rectangle(
-                [px, py, px + tile_size - 1, py + tile_size - 1],
-                fill=color
-            )
-    
-    # Draw grid lines
-    if show_grid:
-        grid_color = config.GRID_COLOR
-        
-        # Vertical lines
-        for x in range(room_template.width + 1):
-            px = x * tile_size
-            draw.line(
-                [(px, y_offset), (px, img_height)],
-                fill=grid_color,
-                width=config.GRID_LINE_WIDTH
-            )
-        
-        # Horizontal lines
-        for y in range(room_template.height + 1):
-            py = y * tile_size + y_offset
-            draw.line(
-                [(0, py), (img_width, py)],
-                fill=grid_color,
-                width=config.GRID_LINE_WIDTH
-            )
+    # Draw tiles and grid lines (palette image scaled up, cached grid layer)
+    image.paste(render_tilemap(room_template, tile_size, show_grid), (0, y_offset))
     
     # Draw door highlights
     for name, connection in room_template.connections.items():
@@ -165,38 +219,15 @@ def calculate_spatial_layout(levels):
     """
     positions = {}
     
-    # Start at origin
-    current_x = 0
-    current_y = 0
-    
-    for i, level in enumerate(levels):
-        level_id = level['level_id']
+    for level, (x, y) in zip(levels, level_positions(levels)):
         room = level['room']
-        
-        # Store position
-        positions[level_id] = {
-            'x': current_x,
-            'y': current_y,
+        positions[level['level_id']] = {
+            'x': x,
+            'y': y,
             'width': room.width,
             'height': room.height,
             'level': level
         }
-        
-        # Calculate next position based on exit direction
-        if i < len(levels) - 1:
-            exit_conn = room.connections.get('exit')
-            if exit_conn:
-                exit_dir = exit_conn['direction']
-                
-                # Move to next position based on exit direction
-                if exit_dir == 'right':
-                    current_x += room.width
-                elif exit_dir == 'left':
-                    current_x -= room.width
-                elif exit_dir == 'up':
-                    current_y -= room.height
-                elif exit_dir == 'down':
-                    current_y += room.height
     
     return positions
 
@@ -228,6 +259,92 @@ def get_difficulty_color(difficulty):
     return (r, g, b)
 
 
+def _draw_entity_markers(draw: ImageDraw.ImageDraw, entities: dict,
+                         pixel_x: int, pixel_y: int, tile_size: int) -> None:
+    """
+    Draw enemy, obstacle and save point markers for one level
+    
+    Args:
+        draw: ImageDraw to draw on
+        entities: Level entities dict from the world generator
+        pixel_x: Pixel X of the level's top-left corner
+        pixel_y: Pixel Y of the level's top-left corner
+        tile_size: Pixels per tile
+    """
+    # Enemies (red dots)
+    for enemy in entities.get('enemies', []):
+        ex = pixel_x + enemy['position']['x'] * tile_size + tile_size // 2
+        ey = pixel_y + enemy['position']['y'] * tile_size + tile_size // 2
+        dot_size = 2
+        draw.ellipse([ex - dot_size, ey - dot_size, ex + dot_size, ey + dot_size],
+                    fill=(255, 0, 0))
+    
+    # Obstacles (yellow markers)
+    for obstacle in entities.get('obstacles', []):
+        ox = pixel_x + obstacle['position']['x'] * tile_size + tile_size // 2
+        oy = pixel_y + obstacle['position']['y'] * tile_size + tile_size // 2
+        
+        if obstacle['type'] == 'spike':
+            # Triangle
+            size = 3
+            points = [(ox, oy - size), (ox - size, oy + size), (ox + size, oy + size)]
+            draw.polygon(points, fill=(255, 200, 0))
+        else:
+            # Square for platforms
+            size = 2
+            draw.rectangle([ox - size, oy - size, ox + size, oy + size],
+                         fill=(0, 200, 255))
+    
+    # Save point (green star)
+    if entities.get('save_point'):
+        sp = entities['save_point']
+        sx = pixel_x + sp['position']['x'] * tile_size + tile_size // 2
+        sy = pixel_y + sp['position']['y'] * tile_size + tile_size // 2
+        star_size = 4
+        draw.ellipse([sx - star_size, sy - star_size, sx + star_size, sy + star_size],
+                    fill=(0, 255, 0))
+
+
+def _draw_arrow(draw: ImageDraw.ImageDraw, start: tuple, end: tuple) -> None:
+    """
+    Draw a connection arrow from an exit door to the next entrance
+    
+    Args:
+        draw: ImageDraw to draw on
+        start: (x, y) pixel position of the exit
+        end: (x, y) pixel position of the entrance (arrow tip)
+    """
+    exit_x, exit_y = start
+    entrance_x, entrance_y = end
+    
+    draw.line([(exit_x, exit_y), (entrance_x, entrance_y)],
+             fill=(0, 150, 255), width=2)
+    
+    # Draw arrowhead
+    arrow_size = 6
+    dx = entrance_x - exit_x
+    dy = entrance_y - exit_y
+    length = (dx*dx + dy*dy) ** 0.5
+    if length > 0:
+        dx /= length
+        dy /= length
+        
+        # Perpendicular vector
+        px = -dy
+        py = dx
+        
+        # Arrowhead points
+        tip_x = entrance_x
+        tip_y = entrance_y
+        left_x = tip_x - dx * arrow_size + px * arrow_size / 2
+        left_y = tip_y - dy * arrow_size + py * arrow_size / 2
+        right_x = tip_x - dx * arrow_size - px * arrow_size / 2
+        right_y = tip_y - dy * arrow_size - py * arrow_size / 2
+        
+        draw.polygon([(tip_x, tip_y), (left_x, left_y), (right_x, right_y)],
+                   fill=(0, 150, 255))
+
+
 def render_world_spatial(levels, output_path, tile_size=16, show_grid=True):
     """
     Render entire world as a spatial 2D map
@@ -324,56 +441,10 @@ def render_world_spatial(levels, output_path, tile_size=16, show_grid=True):
         )
         
         # Draw tiles
-        for y in range(room.height):
-            for x in range(room.width):
-                tile_id = room.get_tile(x, y)
-                if tile_id is None:
-                    tile_id = 0
-                color = TILE_COLORS.get(tile_id, (255, 0, 255))
-                
-                px = pixel_x + x * tile_size
-                py = pixel_y + y * tile_size
-                
-                draw.rectangle(
-                    [px, py, px + tile_size - 1, py + tile_size - 1],
-                    fill=color
-                )
+        image.paste(render_tilemap(room, tile_size), (pixel_x, pixel_y))
         
         # Draw entity markers
-        entities = level['entities']
-        
-        # Enemies (red dots)
-        for enemy in entities.get('enemies', []):
-            ex = pixel_x + enemy['position']['x'] * tile_size + tile_size // 2
-            ey = pixel_y + enemy['position']['y'] * tile_size + tile_size // 2
-            dot_size = 2
-            draw.ellipse([ex - dot_size, ey - dot_size, ex + dot_size, ey + dot_size],
-                        fill=(255, 0, 0))
-        
-        # Obstacles (yellow markers)
-        for obstacle in entities.get('obstacles', []):
-            ox = pixel_x + obstacle['position']['x'] * tile_size + tile_size // 2
-            oy = pixel_y + obstacle['position']['y'] * tile_size + tile_size // 2
-            
-            if obstacle['type'] == 'spike':
-                # Triangle
-                size = 3
-                points = [(ox, oy - size), (ox - size, oy + size), (ox + size, oy + size)]
-                draw.polygon(points, fill=(255, 200, 0))
-            else:
-                # Square for platforms
-                size = 2
-                draw.rectangle([ox - size, oy - size, ox + size, oy + size],
-                             fill=(0, 200, 255))
-        
-        # Save point (green star)
-        if entities.get('save_point'):
-            sp = entities['save_point']
-            sx = pixel_x + sp['position']['x'] * tile_size + tile_size // 2
-            sy = pixel_y + sp['position']['y'] * tile_size + tile_size // 2
-            star_size = 4
-            draw.ellipse([sx - star_size, sy - star_size, sx + star_size, sy + star_size],
-                        fill=(0, 255, 0))
+        _draw_entity_markers(draw, level['entities'], pixel_x, pixel_y, tile_size)
         
         # Draw level label
         level_num = level_id.split('_L')[-1]
@@ -396,54 +467,28 @@ def render_world_spatial(levels, output_path, tile_size=16, show_grid=True):
         draw.text((label_x, label_y + 24), f"{room.width}x{room.height}", fill=(100, 100, 100), font=small_font)
     
     # Draw connection arrows
-    for i in range(len(levels) - 1):
-        current_id = levels[i]['level_id']
-        next_id = levels[i + 1]['level_id']
+    for source, door, target, target_door in level_links(levels):
+        current_id = levels[source]['level_id']
+        next_id = levels[target]['level_id']
         
         current_pos = positions[current_id]
         next_pos = positions[next_id]
         current_room = current_pos['level']['room']
         
         # Get exit position
-        exit_conn = current_room.connections.get('exit')
+        exit_conn = current_room.connections.get(door)
         if exit_conn:
             exit_x = x_offset + (current_pos['x'] - min_x) * tile_size + exit_conn['position']['x'] * tile_size
             exit_y = y_offset + (current_pos['y'] - min_y) * tile_size + exit_conn['position']['y'] * tile_size
             
             # Get entrance position of next level
             next_room = next_pos['level']['room']
-            entrance_conn = next_room.connections.get('entrance')
+            entrance_conn = next_room.connections.get(target_door)
             if entrance_conn:
                 entrance_x = x_offset + (next_pos['x'] - min_x) * tile_size + entrance_conn['position']['x'] * tile_size
                 entrance_y = y_offset + (next_pos['y'] - min_y) * tile_size + entrance_conn['position']['y'] * tile_size
                 
-                # Draw arrow
-                draw.line([(exit_x, exit_y), (entrance_x, entrance_y)],
-                         fill=(0, 150, 255), width=2)
-                
-                # Draw arrowhead
-                arrow_size = 6
-                dx = entrance_x - exit_x
-                dy = entrance_y - exit_y
-                length = (dx*dx + dy*dy) ** 0.5
-                if length > 0:
-                    dx /= length
-                    dy /= length
-                    
-                    # Perpendicular vector
-                    px = -dy
-                    py = dx
-                    
-                    # Arrowhead points
-                    tip_x = entrance_x
-                    tip_y = entrance_y
-                    left_x = tip_x - dx * arrow_size + px * arrow_size / 2
-                    left_y = tip_y - dy * arrow_size + py * arrow_size / 2
-                    right_x = tip_x - dx * arrow_size - px * arrow_size / 2
-                    right_y = tip_y - dy * arrow_size - py * arrow_size / 2
-                    
-                    draw.polygon([(tip_x, tip_y), (left_x, left_y), (right_x, right_y)],
-                               fill=(0, 150, 255))
+                _draw_arrow(draw, (exit_x, exit_y), (entrance_x, entrance_y))
     
     # Draw footer with legend
     footer_y = canvas_height - footer_height + 10
@@ -0,0 +1,330 @@
+"""
+Tiled world-map renderer
+
+Writes a world map as fixed-size PNG tiles plus a zoom pyramid, like a
+slippy map:
+    
+    <output_dir>/<zoom>/<tx>_<ty>.png    map tiles (zoom 0 = whole world)
+    <output_dir>/tiles.json              tile size, zoom levels, level bounds
+
+Only tiles that overlap a level or a connection arrow are rendered, and
+each tile is written as soon as it is finished, so memory use depends on
+the tile size rather than on how far the world extends. After levels are
+regenerated, update_world_tiles rewrites only the tiles they touch.
+"""
+import json
+import math
+import os
+import shutil
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from preview.visualizer import (
+    get_difficulty_color, render_tilemap, _draw_entity_markers, _draw_arrow
+)
+from utils.world_graph import level_links
+from utils.world_layout import level_positions
+
+BACKGROUND_COLOR = (250, 250, 250)
+BORDER_WIDTH = 3
+
+
+def _tile_range(x0: int, y0: int, x1: int, y1: int, tile_px: int) -> List[Tuple[int, int]]:
+    """Get the map tiles overlapped by a pixel rectangle (inclusive corners)"""
+    return [
+        (tx, ty)
+        for ty in range(max(0, y0) // tile_px, max(0, y1) // tile_px + 1)
+        for tx in range(max(0, x0) // tile_px, max(0, x1) // tile_px + 1)
+    ]
+
+
+class _TileLayout:
+    """Pixel layout of a world and the map tiles each level and arrow touches"""
+    
+    def __init__(self, levels: List[Dict[str, Any]], tile_size: int, map_tile_px: int):
+        self.levels = levels
+        self.tile_size = tile_size
+        self.map_tile_px = map_tile_px
+        
+        # Positions and sizes only: levels may be loaded lazily
+        # (export.json_exporter.ExportedLevels), so none are held on to
+        sizes = [(level['room'].width, level['room'].height) for level in levels]
+        positions = level_positions(levels)
+        min_x = min(x for x, _ in positions)
+        min_y = min(y for _, y in positions)
+        max_x = max(x + width for (x, _), (width, _) in zip(positions, sizes))
+        max_y = max(y + height for (_, y), (_, height) in zip(positions, sizes))
+        
+        # Leave room for the difficulty borders around edge levels
+        margin = BORDER_WIDTH * 2
+        self.world_width = (max_x - min_x) * tile_size + margin * 2
+        self.world_height = (max_y - min_y) * tile_size + margin * 2
+        self.max_zoom = max(0, math.ceil(math.log2(
+            max(self.world_width, self.world_height) / map_tile_px)))
+        
+        # Pixel origin of each level, in level order
+        self.origins = [
+            (margin + (x - min_x) * tile_size, margin + (y - min_y) * tile_size)
+            for x, y in positions
+        ]
+        self.level_bounds = {
+            level['level_id']: [px, py, width * tile_size, height * tile_size]
+            for level, (px, py), (width, height) in zip(levels, self.origins, sizes)
+        }
+        
+        # Connection arrows as (from level, to level, start, end)
+        self.arrows: List[Tuple[int, int, Tuple[int, int], Tuple[int, int]]] = []
+        for source, door, target, target_door in level_links(levels):
+            exit_conn = levels[source]['room'].connections.get(door)
+            entrance_conn = levels[target]['room'].connections.get(target_door)
+            if not exit_conn or not entrance_conn:
+                continue
+            cx, cy = self.origins[source]
+            nx, ny = self.origins[target]
+            self.arrows.append((
+                source, target,
+                (cx + exit_conn['position']['x'] * tile_size, cy + exit_conn['position']['y'] * tile_size),
+                (nx + entrance_conn['position']['x'] * tile_size, ny + entrance_conn['position']['y'] * tile_size)
+            ))
+        
+        # Bucket levels and arrows by the map tiles they touch
+        self.tile_levels: Dict[Tuple[int, int], List[int]] = {}
+        self.tile_arrows: Dict[Tuple[int, int], List[Tuple[Tuple[int, int], Tuple[int, int]]]] = {}
+        for index in range(len(levels)):
+            for key in self.level_tiles(index):
+                self.tile_levels.setdefault(key, []).append(index)
+        for _, _, start, end in self.arrows:
+            for key in _arrow_tiles((start, end), map_tile_px):
+                self.tile_arrows.setdefault(key, []).append((start, end))
+        self.occupied = set(self.tile_levels) | set(self.tile_arrows)
+    
+    def level_tiles(self, index: int) -> List[Tuple[int, int]]:
+        """Get the map tiles touched by a level and its border"""
+        px, py, width, height = self.level_bounds[self.levels[index]['level_id']]
+        return _bounds_tiles([px, py, width, height], self.map_tile_px)
+    
+    def manifest(self) -> Dict[str, Any]:
+        """Build the tiles.json manifest"""
+        return {
+            'tile_px': self.map_tile_px,
+            'zoom_levels': self.max_zoom + 1,
+            'max_zoom': self.max_zoom,
+            'world_size': {'width': self.world_width, 'height': self.world_height},
+            'tile_size': self.tile_size,
+            'tile_count': len(self.occupied),
+            'levels': self.level_bounds,
+            'arrows': [[source, target, list(start), list(end)] for source, target, start, end in self.arrows]
+        }
+
+
+def _bounds_tiles(bounds: List[int], tile_px: int) -> List[Tuple[int, int]]:
+    """Get the map tiles touched by level bounds [x, y, width, height] plus border"""
+    px, py, width, height = bounds
+    return _tile_range(px - BORDER_WIDTH, py - BORDER_WIDTH,
+                       px + width + BORDER_WIDTH, py + height + BORDER_WIDTH, tile_px)
+
+
+def _arrow_tiles(arrow, tile_px: int) -> List[Tuple[int, int]]:
+    """Get the map tiles touched by a connection arrow"""
+    (sx, sy), (ex, ey) = arrow
+    pad = 6  # Arrowhead size
+    return _tile_range(min(sx, ex) - pad, min(sy, ey) - pad,
+                       max(sx, ex) + pad, max(sy, ey) + pad, tile_px)
+
+
+def _tile_path(output_dir: str, zoom: int, key: Tuple[int, int]) -> str:
+    return os.path.join(output_dir, str(zoom), f"{key[0]}_{key[1]}.png")
+
+
+def _render_tiles(layout: _TileLayout, output_dir: str, keys, room_cache_size: int) -> None:
+    """
+    Render map tiles at the most detailed zoom level
+    
+    Keys that no longer touch any level or arrow have their tile removed.
+    """
+    tile_size = layout.tile_size
+    map_tile_px = layout.map_tile_px
+    levels = layout.levels
+    os.makedirs(os.path.join(output_dir, str(layout.max_zoom)), exist_ok=True)
+    
+    try:
+        label_font = ImageFont.truetype("arial.ttf", 12)
+    except:
+        label_font = ImageFont.load_default()
+    
+    # Small LRU of rendered room tilemaps (a room usually spans several tiles)
+    rendered: "OrderedDict[int, Image.Image]" = OrderedDict()
+    
+    def room_image(index: int) -> Image.Image:
+        if index in rendered:
+            rendered.move_to_end(index)
+            return rendered[index]
+        image = render_tilemap(levels[index]['room'], tile_size)
+        rendered[index] = image
+        if len(rendered) > room_cache_size:
+            rendered.popitem(last=False)
+        return image
+    
+    for tx, ty in sorted(keys, key=lambda k: (k[1], k[0])):
+        path = _tile_path(output_dir, layout.max_zoom, (tx, ty))
+        if (tx, ty) not in layout.occupied:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        
+        ox, oy = tx * map_tile_px, ty * map_tile_px
+        tile = Image.new('RGB', (map_tile_px, map_tile_px), color=BACKGROUND_COLOR)
+        draw = ImageDraw.Draw(tile)
+        
+        for index in layout.tile_levels.get((tx, ty), ()):
+            level = levels[index]
+            room = level['room']
+            px, py = layout.origins[index]
+            px -= ox
+            py -= oy
+            
+            draw.rectangle(
+                [px - BORDER_WIDTH, py - BORDER_WIDTH,
+                 px + room.width * tile_size + BORDER_WIDTH,
+                 py + room.height * tile_size + BORDER_WIDTH],
+                outline=get_difficulty_color(level['stats']['difficulty']),
+                width=BORDER_WIDTH
+            )
+            tile.paste(room_image(index), (px, py))
+            _draw_entity_markers(draw, level['entities'], px, py, tile_size)
+            
+            level_num = level['level_id'].split('_L')[-1]
+            draw.text((px + 5, py + 5), f"L{level_num}", fill=(0, 0, 0), font=label_font)
+        
+        for start, end in layout.tile_arrows.get((tx, ty), ()):
+            _draw_arrow(draw, (start[0] - ox, start[1] - oy), (end[0] - ox, end[1] - oy))
+        
+        tile.save(path)
+
+
+def _build_pyramid(output_dir: str, max_zoom: int, map_tile_px: int, children) -> None:
+    """
+    Rebuild the zoom pyramid above a set of changed most-detailed tiles
+    
+    Each parent tile is its four children scaled down by half; parents
+    without any child tile on disk are removed.
+    """
+    children = set(children)
+    for zoom in range(max_zoom - 1, -1, -1):
+        os.makedirs(os.path.join(output_dir, str(zoom)), exist_ok=True)
+        
+        parents = sorted({(tx // 2, ty // 2) for tx, ty in children}, key=lambda k: (k[1], k[0]))
+        for px, py in parents:
+            path = _tile_path(output_dir, zoom, (px, py))
+            canvas = Image.new('RGB', (map_tile_px * 2, map_tile_px * 2), color=BACKGROUND_COLOR)
+            found = False
+            for dy in (0, 1):
+                for dx in (0, 1):
+                    child_path = _tile_path(output_dir, zoom + 1, (px * 2 + dx, py * 2 + dy))
+                    if os.path.exists(child_path):
+                        with Image.open(child_path) as child_image:
+                            canvas.paste(child_image, (dx * map_tile_px, dy * map_tile_px))
+                        found = True
+            if found:
+                canvas.resize((map_tile_px, map_tile_px), Image.BOX).save(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        
+        children = set(parents)
+
+
+def _write_manifest(layout: _TileLayout, output_dir: str) -> Dict[str, Any]:
+    manifest = layout.manifest()
+    with open(os.path.join(output_dir, 'tiles.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def render_world_tiles(levels: List[Dict[str, Any]], output_dir: str,
+                       tile_size: int = 16, map_tile_px: int = 256,
+                       room_cache_size: int = 8) -> Dict[str, Any]:
+    """
+    Render a world as map tiles with a zoom pyramid
+    
+    Args:
+        levels: Level dicts from world generator (a list, or an
+                export.json_exporter.ExportedLevels read back from disk)
+        output_dir: Directory to write zoom levels and tiles.json into
+        tile_size: Pixels per room tile at the most detailed zoom level
+        map_tile_px: Width and height of each map tile in pixels
+        room_cache_size: Rendered room tilemaps kept in memory while tiling
+    
+    Returns:
+        Tile manifest dict (also written to tiles.json)
+    """
+    layout = _TileLayout(levels, tile_size, map_tile_px)
+    
+    # Most detailed zoom level: render occupied tiles one at a time, then
+    # build each coarser level from the one below it
+    _render_tiles(layout, output_dir, layout.occupied, room_cache_size)
+    _build_pyramid(output_dir, layout.max_zoom, map_tile_px, layout.occupied)
+    manifest = _write_manifest(layout, output_dir)
+    
+    print(f"✓ Rendered {len(layout.occupied)} world map tiles ({layout.max_zoom + 1} zoom levels) to: {output_dir}")
+    return manifest
+
+
+def update_world_tiles(levels: List[Dict[str, Any]], output_dir: str,
+                       changed: Iterable[int], room_cache_size: int = 8) -> Dict[str, Any]:
+    """
+    Re-render only the map tiles affected by changed levels
+    
+    A tile is re-rendered (or removed) if it was or is touched by a changed
+    level, by a level whose position moved, or by an arrow to or from one.
+    Falls back to a full render if there is no manifest or the zoom levels
+    no longer match.
+    
+    Args:
+        levels: Full, current list of level dicts
+        output_dir: Directory previously written by render_world_tiles
+        changed: Indices of levels whose rooms or entities changed
+        room_cache_size: Rendered room tilemaps kept in memory while tiling
+    
+    Returns:
+        Tile manifest dict (also written to tiles.json)
+    """
+    manifest_path = os.path.join(output_dir, 'tiles.json')
+    if not os.path.exists(manifest_path):
+        return render_world_tiles(levels, output_dir, room_cache_size=room_cache_size)
+    
+    with open(manifest_path, 'r') as f:
+        old = json.load(f)
+    
+    layout = _TileLayout(levels, old['tile_size'], old['tile_px'])
+    if layout.max_zoom != old['max_zoom'] or 'arrows' not in old:
+        # Zoom numbering shifted: every tile is stale
+        for zoom in range(old['zoom_levels']):
+            shutil.rmtree(os.path.join(output_dir, str(zoom)), ignore_errors=True)
+        return render_world_tiles(levels, output_dir, old['tile_size'], old['tile_px'], room_cache_size)
+    
+    # Levels to redraw: changed ones plus any that moved
+    dirty_levels = set(changed)
+    for index, level in enumerate(levels):
+        if old['levels'].get(level['level_id']) != layout.level_bounds[level['level_id']]:
+            dirty_levels.add(index)
+    
+    tile_px = layout.map_tile_px
+    dirty_tiles = set()
+    for index in dirty_levels:
+        old_bounds = old['levels'].get(levels[index]['level_id'])
+        if old_bounds:
+            dirty_tiles.update(_bounds_tiles(old_bounds, tile_px))
+        dirty_tiles.update(layout.level_tiles(index))
+    for arrows in (old['arrows'], layout.arrows):
+        for source, target, start, end in arrows:
+            if source in dirty_levels or target in dirty_levels:
+                dirty_tiles.update(_arrow_tiles((start, end), tile_px))
+    
+    _render_tiles(layout, output_dir, dirty_tiles, room_cache_size)
+    _build_pyramid(output_dir, layout.max_zoom, tile_px, dirty_tiles)
+    manifest = _write_manifest(layout, output_dir)
+    
+    print(f"✓ Updated {len(dirty_tiles)} world map tiles in: {output_dir}")
+    return manifest
@@ -0,0 +1,174 @@
+"""
+Tests for the template library, its binary file format, query index
+and near-duplicate detection
+"""
+import sys
+import os
+import json
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from curation import similarity
+from curation.query_index import _bit_positions
+from curation.similarity import tile_similarity
+from curation.template_library import TemplateLibrary
+from export.json_exporter import build_room_json, room_from_json
+from generators.room_generator import generate_room
+from utils.room_template import RoomTemplate
+from utils.tile_constants import GROUND, SPIKE
+from validation.validator_simple import validate_room_simple
+from validation.quality import score_room_quality
+
+SHAPES = ['horizontal_right', 'horizontal_left', 'vertical_up', 'vertical_down', 'box']
+
+
+@pytest.fixture(scope='module')
+def library():
+    """A library of mixed, seeded rooms (more than one 64-bit word of bits)"""
+    random.seed(1234)
+    library = TemplateLibrary()
+    for i in range(150):
+        shape = SHAPES[i % len(SHAPES)]
+        room = generate_room(shape, random.randint(1, 10),
+                             random.choice(list(config.SIZE_DIMENSIONS[shape])))
+        room.id = f"test_{i:03d}"
+        validation = validate_room_simple(room)
+        library.add_template(room, validation, score_room_quality(room, validation))
+    return library
+
+
+def test_library_file_round_trip(library, tmp_path):
+    """A library written to a library file reads back unchanged"""
+    filename = str(tmp_path / 'library.bin')
+    library.export_library_file(filename)
+    loaded = TemplateLibrary.load_library_file(filename)
+    
+    assert len(loaded.templates) == len(library.templates)
+    for original, copy in zip(library.templates, loaded.templates):
+        for field in ('id', 'shape', 'tier', 'quality_score', 'width', 'height',
+                      'spike_count', 'platform_count', 'floor_coverage'):
+            assert copy[field] == original[field], field
+        # Tags are stored as a bitmask, so only the set survives
+        assert sorted(copy['tags']) == sorted(original['tags'])
+        # JSON turns tuples into lists, so compare the JSON forms
+        assert json.dumps(copy['validation'], sort_keys=True) == json.dumps(original['validation'], sort_keys=True)
+        assert json.dumps(copy['quality'], sort_keys=True) == json.dumps(original['quality'], sort_keys=True)
+        
+        room, original_room = copy['room'], original['room']
+        assert [bytes(row) for row in room.tiles] == [bytes(row) for row in original_room.tiles]
+        assert room.connections == original_room.connections
+
+
+@pytest.mark.parametrize('length', ['short', 'long'])
+def test_room_json_keeps_length_and_tags(length):
+    """Exported rooms read back with the length and tags they were generated with"""
+    random.seed(5)
+    room = generate_room('horizontal_right', 5, length)
+    validation = validate_room_simple(room)
+    data = build_room_json(room, validation, score_room_quality(room, validation))
+    loaded = room_from_json(data)
+    
+    assert loaded.metadata['length'] == length
+    assert room.metadata['tags']
+    assert loaded.metadata['tags'] == room.metadata['tags']
+
+
+def _near_copy(room, similarity):
+    """Copy a room, retiling enough filled interior cells to drop to `similarity`"""
+    copy = room.copy()
+    copy.id = room.id + "_near"
+    filled = [(x, y) for y in range(1, room.height - 1) for x in range(1, room.width - 1)
+              if room.get_tile(x, y)]
+    for x, y in random.sample(filled, int(len(filled) * (1 - similarity))):
+        copy.set_tile(x, y, SPIKE if room.get_tile(x, y) != SPIKE else GROUND)
+    return copy
+
+
+def test_remove_duplicates_low_threshold():
+    """At 0.8 the LSH dedup removes what an all-pairs comparison removes"""
+    random.seed(99)
+    library = TemplateLibrary()
+    for i in range(40):
+        shape = SHAPES[i % len(SHAPES)]
+        room = generate_room(shape, random.randint(1, 10),
+                             random.choice(list(config.SIZE_DIMENSIONS[shape])))
+        room.id = f"dup_{i:03d}"
+        for copy in (room, _near_copy(room, 0.83)):
+            library.add_template(copy, {'tier': 'GOOD'}, {'overall': random.random()})
+    
+    kept = []
+    for t in sorted(library.templates, key=lambda t: t['quality_score'], reverse=True):
+        if all(tile_similarity(t['room'], k['room']) < 0.8 for k in kept):
+            kept.append(t)
+    
+    assert library.remove_duplicates(0.8) == 80 - len(kept)
+    assert sorted(t['id'] for t in library.templates) == sorted(t['id'] for t in kept)
+
+
+def test_large_room_signature_leaves_hash_cache_bounded(monkeypatch):
+    """Rooms past the cached size hash per call, with the same signature"""
+    random.seed(3)
+    room = RoomTemplate(1000, 20)
+    for x in range(1, room.width - 1):
+        room.set_tile(x, random.randint(1, room.height - 2), random.choice([GROUND, SPIKE]))
+    
+    signature = similarity.tile_signature(room)
+    assert all(len(table) <= similarity._MAX_CACHED_CELLS
+               for table in similarity._cell_hashes.values())
+    
+    monkeypatch.setattr(similarity, '_MAX_CACHED_CELLS', room.width * room.height)
+    monkeypatch.setattr(similarity, '_cell_hashes', {})
+    assert similarity.tile_signature(room) == signature
+
+
+def _linear_filter(templates, min_quality=None, max_quality=None, tier=None, tags=None, shape=None):
+    """Reference filter: check every template in list order"""
+    return [
+        t for t in templates
+        if (min_quality is None or t['quality_score'] >= min_quality)
+        and (max_quality is None or t['quality_score'] <= max_quality)
+        and (tier is None or t['tier'] == tier)
+        and (shape is None or t['shape'] == shape)
+        and all(tag in t['tags'] for tag in tags or ())
+    ]
+
+
+def test_filter_matches_linear_scan(library):
+    """The bitset query index returns exactly what a linear scan finds"""
+    qualities = sorted(t['quality_score'] for t in library.templates)
+    all_tags = sorted({tag for t in library.templates for tag in t['tags']})
+    random.seed(99)
+    
+    queries = [{}, {'tier': 'NO_SUCH_TIER'}, {'tags': ['no_such_tag']},
+               {'min_quality': qualities[0], 'max_quality': qualities[-1]},
+               {'min_quality': qualities[-1] + 1}]
+    for _ in range(200):
+        query = {}
+        if random.random() < 0.5:
+            query['min_quality'] = random.choice(qualities)
+        if random.random() < 0.5:
+            query['max_quality'] = random.choice(qualities)
+        if random.random() < 0.4:
+            query['tier'] = random.choice(['EASY', 'NORMAL', 'HARD', 'EXPERT'])
+        if random.random() < 0.4:
+            query['shape'] = random.choice(SHAPES)
+        if random.random() < 0.5:
+            query['tags'] = random.sample(all_tags, random.randint(1, 2))
+        queries.append(query)
+    
+    for query in queries:
+        expected = [t['id'] for t in _linear_filter(library.templates, **query)]
+        assert [t['id'] for t in library.filter(**query)] == expected, query
+
+
+def test_bit_positions():
+    """Set bits are decoded lowest first, across 64-bit word boundaries"""
+    random.seed(5)
+    for size in (1, 63, 64, 65, 200, 1000):
+        positions = sorted(random.sample(range(size), random.randint(0, size)))
+        bits = sum(1 << position for position in positions)
+        assert _bit_positions(bits) == positions
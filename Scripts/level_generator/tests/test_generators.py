@@ -0,0 +1,73 @@
+"""
+Tests for room generators and the shape transforms they build on
+"""
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from generators.room_generator import VALID_BY_CONSTRUCTION, generate_room
+from generators.room_repair import repair_room
+from validation.pathfinding import astar
+from validation.validator_simple import validate_room_simple
+from variation import transforms
+
+
+@pytest.mark.parametrize('seed', range(60))
+def test_vertical_down_rooms_validate(seed):
+    """Flipped vertical_up rooms keep platform spacing and stay traversable"""
+    random.seed(seed)
+    room = generate_room('vertical_down', random.randint(1, 10),
+                         random.choice(['short', 'medium', 'long']))
+    
+    result = validate_room_simple(room)
+    assert result['valid'], result['errors']
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_horizontal_rooms_valid_without_repair(seed):
+    """Rooms of the valid-by-construction shapes pass validation as generated"""
+    random.seed(seed)
+    shape = VALID_BY_CONSTRUCTION[seed % len(VALID_BY_CONSTRUCTION)]
+    room = generate_room(shape, random.randint(1, 10),
+                         random.choice(list(config.SIZE_DIMENSIONS[shape])),
+                         random.sample(['platforms', 'spikes', 'slopes'], random.randint(1, 3)))
+    
+    result = validate_room_simple(room)
+    assert result['valid'], result['errors']
+
+
+def _door_path(room):
+    start, goal = (room.connections[name]['position'] for name in ('entrance', 'exit'))
+    return astar(room, (start['x'], start['y']), (goal['x'], goal['y']))
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_repair_keeps_door_path(seed):
+    """Repairing a box room never cuts an entrance->exit path it had"""
+    random.seed(seed)
+    room = generate_room('box', random.randint(1, 10),
+                         random.choice(list(config.SIZE_DIMENSIONS['box'])))
+    had_path = _door_path(room) is not None
+    
+    repair_room(room)
+    if had_path:
+        assert _door_path(room) is not None
+
+
+@pytest.mark.parametrize('mirror', [transforms.mirror_horizontal, transforms.mirror_vertical])
+def test_mirror_twice_is_identity(mirror):
+    """Mirroring a room twice gives back the original tiles and doors"""
+    random.seed(7)
+    room = generate_room('horizontal_right', 5, 'medium')
+    
+    twice = mirror(mirror(room))
+    assert [bytes(row) for row in twice.tiles] == [bytes(row) for row in room.tiles]
+    # Transforms drop door signatures; callers re-annotate the result
+    for name, conn in room.connections.items():
+        assert twice.connections[name]["position"] == conn["position"]
+        assert twice.connections[name]["direction"] == conn["direction"]
@@ -0,0 +1,100 @@
+"""
+Tests for room validation and pathfinding
+"""
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from generators.chunk_library import chunk_library, compose_validation
+from generators.room_generator import generate_room
+from utils.room_template import RoomTemplate
+from utils.tile_constants import GROUND
+from validation.hierarchical import room_abstraction
+from validation.jump_arcs import arc_stencil
+from validation.pathfinding import astar, check_jump_arc_clearance
+from validation.validator_simple import validate_room_simple
+
+SHAPES = ['horizontal_right', 'horizontal_left', 'vertical_up', 'vertical_down', 'box']
+
+
+def _seeded_room(seed):
+    random.seed(seed)
+    shape = SHAPES[seed % len(SHAPES)]
+    return generate_room(shape, random.randint(1, 10),
+                         random.choice(list(config.SIZE_DIMENSIONS[shape])))
+
+
+def _door(room, name):
+    position = room.connections[name]['position']
+    return position['x'], position['y']
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_astar_precheck_does_not_change_result(seed):
+    """The reachability precheck only prunes cells no path can use"""
+    room = _seeded_room(seed)
+    start, goal = _door(room, 'entrance'), _door(room, 'exit')
+    
+    assert astar(room, start, goal, precheck=True) == astar(room, start, goal, precheck=False)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_compose_validation_matches_validator(seed):
+    """Validation composed from chunk results equals validating the stitched room"""
+    random.seed(seed)
+    library = chunk_library(random.choice([14, 18, 22]), random.randint(1, 10))
+    room, chunks = library.assemble(random.randint(24, 300),
+                                    random.choice(['horizontal_right', 'horizontal_left']))
+    
+    assert compose_validation(room, chunks) == validate_room_simple(room)
+
+
+def _hop_room(ceiling_row, ledge_top=None):
+    """Flat floor under feet row 6, a solid ceiling row, optionally a ledge from x=6"""
+    room = RoomTemplate(12, 8)
+    for x in range(room.width):
+        room.set_tile(x, 7, GROUND)
+        room.set_tile(x, ceiling_row, GROUND)
+        if ledge_top is not None and x >= 6:
+            for y in range(ledge_top, 7):
+                room.set_tile(x, y, GROUND)
+    return room
+
+
+@pytest.mark.parametrize('clearance, accepted', [(config.PLAYER_TOTAL_HEIGHT, True),
+                                                 (config.PLAYER_TOTAL_HEIGHT - 1, False)])
+def test_jump_arc_needs_standing_clearance(clearance, accepted):
+    """
+    Jumps sweep the PLAYER_HEIGHT body along an arc rising one tile above
+    the higher end, so they need exactly PLAYER_TOTAL_HEIGHT clear rows:
+    no more than standing, no less
+    """
+    level = _hop_room(6 - clearance)
+    assert check_jump_arc_clearance(level, 2, 6, 5, 6) == accepted
+    
+    # Up two tiles onto a ledge, counted above the landing feet
+    step_up = _hop_room(4 - clearance, ledge_top=5)
+    assert check_jump_arc_clearance(step_up, 2, 6, 7, 4) == accepted
+
+
+def test_arc_stencil_follows_config(monkeypatch):
+    """Stencils built with default limits aren't reused after config changes"""
+    before = arc_stencil(3, 0)
+    monkeypatch.setattr(config, 'PLAYER_HEIGHT', config.PLAYER_HEIGHT + 1)
+    
+    assert arc_stencil(3, 0) != before
+
+
+def test_room_abstraction_follows_config(monkeypatch):
+    """Abstractions built with default limits aren't reused after config changes"""
+    room = _seeded_room(0)
+    before = room_abstraction(room)
+    assert room_abstraction(room) is before
+    
+    monkeypatch.setattr(config, 'MAX_JUMP_HEIGHT', config.MAX_JUMP_HEIGHT + 1)
+    assert room_abstraction(room) is not before
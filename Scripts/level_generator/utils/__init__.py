@@ -1,9 +1,9 @@
 """
 Utility modules for Level Generator
 """
-from .room_template import RoomTemplate
+from .room_template import RoomTemplate, RoomVariant, EnemyZone, ObstacleSlot
 from .tile_constants import *
 
-__all__ = ['RoomTemplate', 'EMPTY', 'GROUND', 'WALL', 'PLATFORM_ONEWAY', 'SPIKE', 
+__all__ = ['RoomTemplate', 'RoomVariant', 'EnemyZone', 'ObstacleSlot', 'EMPTY', 'GROUND', 'WALL', 'PLATFORM_ONEWAY', 'SPIKE', 
            'SLOPE_UP_RIGHT', 'SLOPE_UP_LEFT', 'SLOPE_DOWN_RIGHT', 'SLOPE_DOWN_LEFT',
            'TILE_LEGEND', 'TILE_COLORS']
@@ -0,0 +1,138 @@
+"""
+Bitboard view of a room
+
+Each tile class is stored as one Python int per row (bit x = column x)
+and, on demand, one int per column (bit y = row y). Row and column
+questions - "is anything solid in this row", "how long is this run of
+empty tiles", "is there a platform within 2 tiles above" - then become a
+few shifts and ANDs per row instead of a loop over cells.
+
+Boards are built from the packed tile bytes: each class is one
+bytes.translate to '0'/'1' characters and one int(..., 2) per row or
+column, so building a board costs no per-cell Python work either.
+"""
+from typing import Dict, List, Tuple
+
+from utils.room_template import RoomTemplate
+from utils.tile_constants import (
+    EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE,
+    SLOPE_UP_RIGHT, SLOPE_UP_LEFT, SLOPE_DOWN_RIGHT, SLOPE_DOWN_LEFT
+)
+
+# Tile classes: name -> tile IDs
+TILE_CLASSES: Dict[str, Tuple[int, ...]] = {
+    'empty': (EMPTY,),
+    'ground': (GROUND,),
+    'wall': (WALL,),
+    'platform': (PLATFORM_ONEWAY,),
+    'spike': (SPIKE,),
+    'slope': (SLOPE_UP_RIGHT, SLOPE_UP_LEFT, SLOPE_DOWN_RIGHT, SLOPE_DOWN_LEFT)
+}
+
+# Tiles the player stands on and can't occupy (GROUND, WALL, PLATFORM_ONEWAY)
+BLOCKING = ('ground', 'wall', 'platform')
+
+
+def _make_table(names: Tuple[str, ...]) -> bytes:
+    """Build a bytes.translate table mapping tiles of the given classes to '1', others to '0'"""
+    table = bytearray(b'0' * 256)
+    for name in names:
+        for tile_id in TILE_CLASSES[name]:
+            table[tile_id] = ord('1')
+    return bytes(table)
+
+
+_tables: Dict[Tuple[str, ...], bytes] = {}
+
+
+def _table(names: Tuple[str, ...]) -> bytes:
+    table = _tables.get(names)
+    if table is None:
+        table = _tables[names] = _make_table(names)
+    return table
+
+
+def popcount(bits: int) -> int:
+    """Count the set bits of a non-negative int"""
+    return bin(bits).count('1')
+
+
+def bit_runs(bits: int) -> List[Tuple[int, int]]:
+    """
+    Split an int into runs of consecutive set bits
+    
+    Takes one step per run, not per bit.
+    
+    Returns:
+        (start, length) per run, lowest bit first
+    """
+    runs = []
+    while bits:
+        low = bits & -bits
+        # Adding the lowest bit carries through the whole run
+        run = bits & ~(bits + low)
+        start = low.bit_length() - 1
+        runs.append((start, run.bit_length() - start))
+        bits ^= run
+    return runs
+
+
+class RoomBitboard:
+    """
+    Per-class row and column bitboards of a room
+    
+    The board is a snapshot: rebuild it after changing the room's tiles.
+    
+    Usage:
+        board = RoomBitboard(room)
+        solid_rows = board.rows('ground', 'wall')
+        if solid_rows[y] & (1 << x): ...
+    """
+    
+    __slots__ = ('width', 'height', 'full', '_flat', '_rows', '_columns')
+    
+    def __init__(self, room: RoomTemplate):
+        self.width = room.width
+        self.height = room.height
+        self.full = (1 << room.width) - 1  # Mask of one whole row
+        self._flat = room.tile_bytes()
+        self._rows: Dict[Tuple[str, ...], List[int]] = {}
+        self._columns: Dict[Tuple[str, ...], List[int]] = {}
+    
+    def rows(self, *names: str) -> List[int]:
+        """
+        Get the row bitboards of one or more tile classes (ORed together)
+        
+        Returns:
+            One int per row (bit x set if the tile at column x is in a class)
+        """
+        rows = self._rows.get(names)
+        if rows is None:
+            width = self.width
+            digits = self._flat.translate(_table(names))
+            # Reverse each row so column 0 ends up in bit 0
+            rows = [int(digits[start:start + width][::-1], 2)
+                    for start in range(0, width * self.height, width)]
+            self._rows[names] = rows
+        return rows
+    
+    def columns(self, *names: str) -> List[int]:
+        """
+        Get the column bitboards of one or more tile classes (ORed together)
+        
+        Returns:
+            One int per column (bit y set if the tile at row y is in a class)
+        """
+        columns = self._columns.get(names)
+        if columns is None:
+            width = self.width
+            digits = self._flat.translate(_table(names))
+            # Reverse each column so row 0 ends up in bit 0
+            columns = [int(digits[x::width][::-1], 2) for x in range(width)]
+            self._columns[names] = columns
+        return columns
+    
+    def count(self, *names: str) -> int:
+        """Count the tiles in one or more classes"""
+        flat = self._flat
+        return sum(flat.count(tile_id) for name in names for tile_id in TILE_CLASSES[name])
@@ -0,0 +1,152 @@
+"""
+Door signatures for stitching rooms together
+
+A door signature describes how a door meets the neighbouring room:
+
+    side     - wall the door is in ('left', 'right', 'up', 'down')
+    offset   - first open tile of the opening along that wall (y for
+               left/right doors, x for up/down doors)
+    opening  - number of open tiles in the opening
+    landing  - y of the first tile to stand on just inside the door
+               (None if there is nothing to stand on)
+
+Rooms in a world are laid out with their top/left edges aligned (see
+utils.world_layout), so an exit and the next room's entrance line up when
+their openings overlap in room coordinates.
+
+Signatures are read from the tiles and stored on the connection dicts
+under 'signature', so a generated room carries them with it.
+"""
+from typing import Dict, NamedTuple, Optional
+
+import config
+from utils.room_template import RoomTemplate
+from utils.tile_constants import EMPTY, PLATFORM_ONEWAY, is_platform, is_slope, is_solid
+
+OPPOSITE_SIDE = {'left': 'right', 'right': 'left', 'up': 'down', 'down': 'up'}
+
+
+class DoorSignature(NamedTuple):
+    """How a door meets the room next to it"""
+    side: str
+    offset: int
+    opening: int
+    landing: Optional[int]
+    
+    def rows(self) -> range:
+        """Tiles along the wall covered by the opening"""
+        return range(self.offset, self.offset + self.opening)
+
+
+def _is_open(tile: int) -> bool:
+    return tile == EMPTY or tile == PLATFORM_ONEWAY
+
+
+def _is_standable(tile: int) -> bool:
+    return is_solid(tile) or is_platform(tile) or is_slope(tile)
+
+
+def compute_door_signature(room: RoomTemplate, name: str) -> DoorSignature:
+    """
+    Read a door's signature from the room tiles
+    
+    Args:
+        room: Room with the door
+        name: Connection name (e.g., "entrance", "exit")
+    
+    Returns:
+        DoorSignature
+    """
+    conn = room.connections[name]
+    side = conn['direction']
+    x, y = conn['position']['x'], conn['position']['y']
+    get_tile = room.get_tile
+    
+    if side in ('left', 'right'):
+        wall_x = 0 if side == 'left' else room.width - 1
+        inner_x = 1 if side == 'left' else room.width - 2
+        along, length = y, room.height
+        tile_at = lambda i: get_tile(wall_x, i)
+        # Walk down from the door until there is ground to stand on
+        landing = next((ly for ly in range(y, room.height) if _is_standable(get_tile(inner_x, ly))), None)
+    else:
+        wall_y = 0 if side == 'up' else room.height - 1
+        along, length = x, room.width
+        tile_at = lambda i: get_tile(i, wall_y)
+        if side == 'up':
+            rows = range(1, room.height)
+        else:
+            rows = range(room.height - 2, -1, -1)
+        landing = next((ly for ly in rows if _is_standable(get_tile(x, ly))), None)
+    
+    # Grow the opening both ways from the door position
+    start = end = along
+    if _is_open(tile_at(along)):
+        while start > 0 and _is_open(tile_at(start - 1)):
+            start -= 1
+        while end < length - 1 and _is_open(tile_at(end + 1)):
+            end += 1
+        opening = end - start + 1
+    else:
+        opening = 0
+    
+    return DoorSignature(side, start, opening, landing)
+
+
+def annotate_door_signatures(room: RoomTemplate) -> None:
+    """Compute every door's signature and store it on its connection"""
+    for name, conn in room.connections.items():
+        conn['signature'] = compute_door_signature(room, name)._asdict()
+
+
+def door_signature(room: RoomTemplate, name: str) -> DoorSignature:
+    """
+    Get a door's signature, using the stored one when present
+    
+    Args:
+        room: Room with the door
+        name: Connection name
+    
+    Returns:
+        DoorSignature
+    """
+    stored = room.connections[name].get('signature')
+    if stored is not None:
+        return DoorSignature(**stored)
+    return compute_door_signature(room, name)
+
+
+def door_signatures(room: RoomTemplate) -> Dict[str, DoorSignature]:
+    """Get the signatures of all doors of a room"""
+    return {name: door_signature(room, name) for name in room.connections}
+
+
+def doors_compatible(exit_sig: DoorSignature, entrance_sig: DoorSignature,
+                     max_step: int = config.MAX_JUMP_HEIGHT) -> bool:
+    """
+    Check whether an exit lines up with the next room's entrance
+    
+    The doors must be on facing walls with overlapping openings. For
+    side doors the two landings must also be within a jump of each other,
+    so the doorway can be crossed both ways.
+    
+    Args:
+        exit_sig: Signature of the exit being left
+        entrance_sig: Signature of the entrance being entered
+        max_step: Largest landing height difference (tiles)
+    
+    Returns:
+        True if the doors are compatible
+    """
+    if entrance_sig.side != OPPOSITE_SIDE.get(exit_sig.side):
+        return False
+    if not exit_sig.opening or not entrance_sig.opening:
+        return False
+    if (exit_sig.offset >= entrance_sig.offset + entrance_sig.opening or
+            entrance_sig.offset >= exit_sig.offset + exit_sig.opening):
+        return False
+    if exit_sig.side in ('left', 'right'):
+        if exit_sig.landing is None or entrance_sig.landing is None:
+            return False
+        return abs(exit_sig.landing - entrance_sig.landing) <= max_step
+    return True
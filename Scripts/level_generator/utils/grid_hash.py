@@ -0,0 +1,214 @@
+"""
+Grid content hashing and memoization of per-room results
+
+Variations, regenerated levels and library rebuilds keep producing rooms
+with the same tiles; validating or scoring them again gives the same
+answer. grid_hash() digests everything those checks read (size, shape,
+packed tiles and doors) with BLAKE2, and memoize_by_grid caches a
+function's result under that digest plus the call's other arguments, so
+a repeated grid costs one hash and one unpickle.
+
+Results are kept pickled in an in-memory LRU; open_memo_file() adds a
+disk store (shelve) behind it so they survive between runs. Every hit
+returns a fresh copy, so callers can keep mutating their results.
+
+Keys also cover MEMO_VERSION and the config values the checks read at
+call time (memo_stamp), and a disk store written under another stamp is
+emptied when opened, so changing config or a check never returns an old
+verdict.
+"""
+import functools
+import hashlib
+import inspect
+import pickle
+import shelve
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import config
+
+# Results kept in memory
+MEMO_CACHE_SIZE = 4096
+
+# Bump when a memoized check changes, so stored results are dropped
+MEMO_VERSION = 1
+
+# Config values the memoized checks read at call time
+_CONFIG_KEYS = ('MAX_JUMP_DISTANCE', 'MAX_JUMP_HEIGHT', 'PLAYER_HEIGHT',
+                'PLAYER_TOTAL_HEIGHT', 'MIN_PLATFORM_VERTICAL_SPACING')
+
+_DIGEST_SIZE = 16
+
+# Disk store entry holding the stamp its results were written under
+_STAMP_KEY = '__stamp__'
+
+
+def grid_hash(room) -> bytes:
+    """
+    Hash a room's contents
+    
+    Two rooms with the same dimensions, shape, tiles and doors hash the
+    same whatever their id, name or metadata.
+    
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    digest.update(f'{room.width}x{room.height}:{room.shape_type}:'.encode())
+    digest.update(room.tile_bytes())
+    for name in sorted(room.connections):
+        conn = room.connections[name]
+        digest.update(f"|{name}:{conn['position']['x']},{conn['position']['y']}:"
+                      f"{conn['direction']}".encode())
+    return digest.digest()
+
+
+def memo_stamp() -> bytes:
+    """Get the memo version and current config values results depend on"""
+    values = (MEMO_VERSION,) + tuple(getattr(config, name) for name in _CONFIG_KEYS)
+    return repr(values).encode()
+
+
+class GridMemo:
+    """
+    LRU memo of pickled results, optionally backed by a shelve file
+    
+    Usage:
+        memo = GridMemo(maxsize=1024)
+        memo.put(key, value)
+        value = memo.get(key)  # None if missing
+    """
+    
+    def __init__(self, maxsize: int = MEMO_CACHE_SIZE, path: Optional[str] = None):
+        """
+        Args:
+            maxsize: Results kept in memory
+            path: Optional shelve file to read and write results through
+                  (emptied if it was written under a different memo_stamp)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._disk = None
+        if path:
+            stamp = memo_stamp()
+            self._disk = shelve.open(path)
+            if self._disk.get(_STAMP_KEY) != stamp:
+                self._disk.close()
+                self._disk = shelve.open(path, flag='n')
+                self._disk[_STAMP_KEY] = stamp
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the pickled result stored under a key (None if there is none)"""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        elif self._disk is not None and key in self._disk:
+            data = self._disk[key]
+            self._remember(key, data)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+    
+    def put(self, key: str, data: bytes) -> None:
+        """Store a pickled result"""
+        self._remember(key, data)
+        if self._disk is not None:
+            self._disk[key] = data
+    
+    def _remember(self, key: str, data: bytes) -> None:
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Forget the in-memory results (the disk store is kept)"""
+        self._entries.clear()
+        self.hits = self.misses = 0
+    
+    def close(self) -> None:
+        """Close the disk store, if any"""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+# Memo shared by every memoize_by_grid function (None disables memoization)
+_memo: Optional[GridMemo] = GridMemo()
+
+
+def get_memo() -> Optional[GridMemo]:
+    """Get the shared memo"""
+    return _memo
+
+
+def open_memo_file(path: str, maxsize: int = MEMO_CACHE_SIZE) -> GridMemo:
+    """
+    Back the shared memo with a disk store
+    
+    Args:
+        path: Shelve file to keep results in (created if missing)
+        maxsize: Results kept in memory
+    
+    Returns:
+        The new shared memo
+    """
+    global _memo
+    if _memo is not None:
+        _memo.close()
+    _memo = GridMemo(maxsize, path)
+    return _memo
+
+
+def set_memo(memo: Optional[GridMemo]) -> None:
+    """Replace the shared memo (None turns memoization off)"""
+    global _memo
+    _memo = memo
+
+
+def memoize_by_grid(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorator: cache a function of a room by the room's grid_hash
+    
+    The decorated function must take the room first and have a result
+    that depends only on the room's contents, the other arguments (which
+    must be picklable) and the config values in memo_stamp. Arguments are
+    bound to the function's parameters with defaults filled in, so
+    positional and keyword calls share results. The undecorated function
+    stays available as `.uncached`.
+    """
+    name = f'{func.__module__}.{func.__qualname__}'.encode()
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    def wrapper(room, *args, **kwargs):
+        memo = _memo
+        if memo is None:
+            return func(room, *args, **kwargs)
+        
+        bound = signature.bind(room, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+        
+        digest = hashlib.blake2b(name, digest_size=_DIGEST_SIZE)
+        digest.update(memo_stamp())
+        digest.update(grid_hash(room))
+        digest.update(pickle.dumps(arguments, pickle.HIGHEST_PROTOCOL))
+        key = digest.hexdigest()
+        
+        data = memo.get(key)
+        if data is not None:
+            return pickle.loads(data)
+        result = func(room, *args, **kwargs)
+        memo.put(key, pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        return result
+    
+    wrapper.uncached = func
+    return wrapper
@@ -0,0 +1,135 @@
+"""
+Player movement rules shared by pathfinding and its pre-checks
+
+Where the player can stand and how far up or down a jump can land, as
+used by validation.pathfinding (A*), validation.reachability (the
+bit-parallel pre-check) and the generators that build rooms to be
+traversable.
+"""
+import config
+from utils.tile_constants import GROUND, WALL, PLATFORM_ONEWAY
+
+
+def is_standing_on_solid(room, x, y):
+    """Check if position (x, y) has solid ground below"""
+    if y + 1 >= room.height:
+        return False
+    
+    tile_below = room.get_tile(x, y + 1)
+    return tile_below in [GROUND, WALL, PLATFORM_ONEWAY]
+
+
+def can_stand_at(room, x, y):
+    """
+    Check if player can stand at position (x, y)
+    
+    Player collision model (Week 4):
+    Coordinate system: Y=0 is TOP of room, Y=height-1 is BOTTOM
+    - y: feet position
+    - y-1, y-2: body (extends UPWARD from feet)
+    - y+1: ground below feet (extends DOWNWARD)
+    
+    Total: 3 tiles of vertical clearance needed (y-2, y-1, y)
+    
+    Args:
+        room: RoomTemplate
+        x: X position (feet)
+        y: Y position (feet)
+    
+    Returns:
+        bool: True if player can stand at this position
+    """
+    # Check bounds for full player height (extends upward from y)
+    if not (0 <= x < room.width):
+        return False
+    if y - config.PLAYER_HEIGHT < 0 or y >= room.height:  # Need headroom above
+        return False
+    
+    # Check that 3 tiles of body space are passable (y, y-1, y-2)
+    # This is feet + 2 body tiles extending UPWARD
+    for dy in range(config.PLAYER_TOTAL_HEIGHT):
+        check_y = y - dy  # Go UPWARD (toward y=0)
+        if check_y < 0:
+            return False
+        
+        tile = room.get_tile(x, check_y)
+        
+        # Solid tiles (GROUND, WALL) block player body
+        if tile in [GROUND, WALL]:
+            return False
+        
+        # PLATFORM_ONEWAY: Can pass through when jumping up from below
+        # For now, treat as passable in body space
+        # (player can jump through platforms from below)
+    
+    # Must have solid ground below feet (at y+1, going DOWNWARD)
+    if y + 1 >= room.height:
+        return False
+    tile_below = room.get_tile(x, y + 1)
+    return tile_below in [GROUND, WALL, PLATFORM_ONEWAY]
+
+
+def jump_vertical_range(abs_dx, max_jump_vertical=4):
+    """
+    Get the vertical offsets a jump of a given horizontal distance can land at
+    
+    Shorter horizontal jumps can go higher, longer ones tend to be flatter.
+    
+    Args:
+        abs_dx: Horizontal jump distance (tiles, > 0)
+        max_jump_vertical: Max vertical jump height
+    
+    Returns:
+        range of dy values (negative is up)
+    """
+    # Can jump up when moving shorter distances
+    if abs_dx <= 2:
+        return range(-max_jump_vertical, 2)  # Can jump high on short hops
+    elif abs_dx <= 4:
+        return range(-2, 2)  # Medium jumps are flatter
+    else:
+        return range(-1, 3)  # Long jumps can only go slightly up or fall
+
+
+def find_nearest_standing_position(room, px, py, max_search=10):
+    """
+    Find nearest valid standing position from a point
+    
+    Platformer-aware search prioritizes vertical then horizontal
+    
+    Args:
+        room: RoomTemplate
+        px, py: Point to search from (e.g., a door position)
+        max_search: Max horizontal search distance
+    
+    Returns:
+        (x, y) tuple, or None if the room has nowhere to stand
+    """
+    # First check if current position is valid
+    if can_stand_at(room, px, py):
+        return (px, py)
+    
+    # Strategy 1: Search vertically - player might be IN ground, try above/below
+    for dy in range(-5, 6):
+        test_y = py + dy
+        if 0 <= test_y < room.height and can_stand_at(room, px, test_y):
+            return (px, test_y)
+    
+    # Strategy 2: Search horizontally at similar Y levels
+    for dx in range(1, max_search):
+        for direction in [1, -1]:
+            test_x = px + (dx * direction)
+            if 0 <= test_x < room.width:
+                # Try this X at various Y levels
+                for dy in range(-4, 5):
+                    test_y = py + dy
+                    if 0 <= test_y < room.height and can_stand_at(room, test_x, test_y):
+                        return (test_x, test_y)
+    
+    # Last resort: find ANY valid position in the room
+    for y in range(room.height):
+        for x in range(room.width):
+            if can_stand_at(room, x, y):
+                return (x, y)
+    
+    return None
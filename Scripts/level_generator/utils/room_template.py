@@ -1,9 +1,73 @@
 """
 RoomTemplate class - Core data structure for room generation
+
+Rooms are kept compact so large libraries fit in memory and cross process
+boundaries cheaply:
+- tiles are stored as one bytearray per row (tile IDs are all < 256)
+- shape and tag strings are interned and tags are kept as a tuple
+- spawn zones are immutable named tuples, so copies can share them
 """
-import copy
-import uuid
-from typing import List, Dict, Any, Tuple, Optional
+import os
+import sys
+from typing import List, Dict, Any, Tuple, Optional, NamedTuple, Iterable
+
+
+class EnemyZone(NamedTuple):
+    """Enemy spawn zone (immutable, shared freely between room copies)"""
+    id: str
+    x: int
+    y: int
+    type: str = "ground"
+    allowed_enemies: Tuple[str, ...] = ("light_flyer", "medium_walker")
+    size: Optional[Tuple[int, int]] = None  # (width, height) for detected zones
+    
+    @property
+    def position(self) -> Dict[str, int]:
+        return {"x": self.x, "y": self.y}
+    
+    def to_json(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "position": self.position,
+            "type": self.type,
+            "allowed_enemies": list(self.allowed_enemies)
+        }
+        if self.size is not None:
+            data["size"] = {"width": self.size[0], "height": self.size[1]}
+        return data
+
+
+class ObstacleSlot(NamedTuple):
+    """Obstacle placement slot (immutable, shared freely between room copies)"""
+    id: str
+    x: int
+    y: int
+    allowed_types: Tuple[str, ...] = ("spike", "moving_platform", "drill")
+    
+    @property
+    def position(self) -> Dict[str, int]:
+        return {"x": self.x, "y": self.y}
+    
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "position": self.position,
+            "allowed_types": list(self.allowed_types)
+        }
+
+
+def _copy_connection(conn: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a connection dict (nested position and door signature included)"""
+    copied = dict(conn)
+    copied["position"] = dict(conn["position"])
+    if "signature" in conn:
+        copied["signature"] = dict(conn["signature"])
+    return copied
+
+
+def _intern_all(strings: Iterable[str]) -> Tuple[str, ...]:
+    """Intern a sequence of strings so repeated tags share one object"""
+    return tuple(sys.intern(s) for s in strings)
 
 
 class RoomTemplate:
@@ -11,6 +75,10 @@ class RoomTemplate:
     Represents a single room template with tilemap and metadata
     """
     
+    __slots__ = ('id', 'width', 'height', 'shape_type', 'tiles',
+                 'metadata', 'connections', 'spawn_zones', 'validation',
+                 '__weakref__')
+    
     def __init__(self, width: int, height: int, shape_type: str = "horizontal_right"):
         """
         Initialize a new RoomTemplate
@@ -23,16 +91,16 @@ class RoomTemplate:
         self.id = self._generate_id()
         self.width = width
         self.height = height
-        self.shape_type = shape_type
+        self.shape_type = sys.intern(shape_type)
         
-        # Initialize empty tilemap (2D array)
-        self.tiles = [[0] * width for _ in range(height)]
+        # Initialize empty tilemap (one bytearray per row, indexed tiles[y][x])
+        self.tiles = [bytearray(width) for _ in range(height)]
         
         # Metadata
         self.metadata = {
             "difficulty": 1,
             "length": "medium",
-            "tags": [],
+            "tags": (),
             "author": "procedural_gen",
             "version": "1.0"
         }
@@ -40,22 +108,19 @@ class RoomTemplate:
         # Entry/exit connections
         self.connections = {}
         
-        # Spawn zones for entities
+        # Spawn zones for entities (lists of EnemyZone / ObstacleSlot tuples)
         self.spawn_zones = {
             "enemies": [],
             "obstacles": []
         }
         
-        # Validation results (populated later in Week 2)
-        self.validation = {
-            "valid": False,
-            "errors": [],
-            "warnings": []
-        }
+        # Validation results (None until a validator stores them)
+        self.validation = None
     
-    def _generate_id(self) -> str:
+    @staticmethod
+    def _generate_id() -> str:
         """Generate unique ID for this template"""
-        return str(uuid.uuid4())[:8]
+        return os.urandom(4).hex()
     
     def set_tile(self, x: int, y: int, tile_id: int) -> None:
         """
@@ -89,6 +154,33 @@ class RoomTemplate:
             return self.tiles[y][x]
         return None
     
+    def tile_bytes(self) -> bytes:
+        """
+        Get the tilemap packed row-major into a single bytes object
+        
+        Returns:
+            width * height bytes, one tile ID per byte
+        """
+        return b''.join(self.tiles)
+    
+    def set_tags(self, tags: Iterable[str]) -> None:
+        """
+        Replace the metadata tags (stored as a tuple of interned strings)
+        
+        Args:
+            tags: Tag strings
+        """
+        self.metadata["tags"] = _intern_all(tags)
+    
+    def add_tag(self, tag: str) -> None:
+        """
+        Append a single tag to the metadata tags
+        
+        Args:
+            tag: Tag string
+        """
+        self.metadata["tags"] = tuple(self.metadata.get("tags", ())) + (sys.intern(tag),)
+    
     def add_connection(self, name: str, x: int, y: int, direction: str) -> None:
         """
         Add entry/exit door connection
@@ -105,8 +197,10 @@ class RoomTemplate:
             "type": "door"
         }
     
-    def add_enemy_zone(self, x: int, y: int, zone_type: str = "ground", 
-                       allowed_enemies: Optional[List[str]] = None) -> None:
+    def add_enemy_zone(self, x: int, y: int, zone_type: str = "ground",
+                       allowed_enemies: Optional[List[str]] = None,
+                       zone_id: Optional[str] = None,
+                       size: Optional[Tuple[int, int]] = None) -> None:
         """
         Add enemy spawn zone
         
@@ -115,16 +209,17 @@ class RoomTemplate:
             y: Y coordinate
             zone_type: Type of spawn zone ("ground", "aerial", "wall")
             allowed_enemies: List of enemy types allowed in this zone
+            zone_id: Zone identifier (default: zone_<index>)
+            size: Optional (width, height) of a detected zone
         """
         if allowed_enemies is None:
             allowed_enemies = ["light_flyer", "medium_walker"]
+        if zone_id is None:
+            zone_id = f"zone_{len(self.spawn_zones['enemies'])}"
         
-        self.spawn_zones["enemies"].append({
-            "id": f"zone_{len(self.spawn_zones['enemies'])}",
-            "position": {"x": x, "y": y},
-            "type": zone_type,
-            "allowed_enemies": allowed_enemies
-        })
+        self.spawn_zones["enemies"].append(EnemyZone(
+            zone_id, x, y, sys.intern(zone_type), _intern_all(allowed_enemies), size
+        ))
     
     def add_obstacle_slot(self, x: int, y: int, allowed_types: Optional[List[str]] = None) -> None:
         """
@@ -138,11 +233,21 @@ class RoomTemplate:
         if allowed_types is None:
             allowed_types = ["spike", "moving_platform", "drill"]
         
-        self.spawn_zones["obstacles"].append({
-            "id": f"slot_{len(self.spawn_zones['obstacles'])}",
-            "position": {"x": x, "y": y},
-            "allowed_types": allowed_types
-        })
+        self.spawn_zones["obstacles"].append(ObstacleSlot(
+            f"slot_{len(self.spawn_zones['obstacles'])}", x, y, _intern_all(allowed_types)
+        ))
+    
+    def spawn_zones_to_json(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Convert spawn zones to their JSON (dict) form
+        
+        Returns:
+            Dict with "enemies" and "obstacles" lists of zone dicts
+        """
+        return {
+            kind: [zone.to_json() for zone in zones]
+            for kind, zones in self.spawn_zones.items()
+        }
     
     def to_json(self) -> Dict[str, Any]:
         """
@@ -153,25 +258,110 @@ class RoomTemplate:
         """
         return {
             "id": self.id,
+            "shape_type": self.shape_type,
             "metadata": self.metadata,
             "tilemap": {
                 "width": self.width,
                 "height": self.height,
-                "tiles": self.tiles
+                "tiles": [list(row) for row in self.tiles]
             },
             "connections": self.connections,
-            "spawn_zones": self.spawn_zones,
-            "validation": self.validation
+            "spawn_zones": self.spawn_zones_to_json(),
+            "validation": self.validation or {"valid": False, "errors": [], "warnings": []}
         }
     
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'RoomTemplate':
+        """
+        Rebuild a room template from its to_json() form
+        
+        Args:
+            data: Dictionary as produced by to_json() (tile rows may be
+                  lists or bytes)
+        
+        Returns:
+            New RoomTemplate instance
+        """
+        tilemap = data["tilemap"]
+        metadata = dict(data.get("metadata", {}))
+        
+        room = cls.__new__(cls)
+        room.id = data["id"]
+        room.width = tilemap["width"]
+        room.height = tilemap["height"]
+        room.shape_type = sys.intern(data.get("shape_type", "horizontal_right"))
+        room.tiles = [bytearray(row) for row in tilemap["tiles"]]
+        room.metadata = metadata
+        room.set_tags(metadata.get("tags", ()))
+        room.connections = data.get("connections", {})
+        
+        spawn_zones = data.get("spawn_zones", {})
+        room.spawn_zones = {"enemies": [], "obstacles": []}
+        for zone in spawn_zones.get("enemies", []):
+            size = zone.get("size")
+            room.add_enemy_zone(
+                zone["position"]["x"], zone["position"]["y"], zone.get("type", "ground"),
+                zone.get("allowed_enemies"), zone_id=zone.get("id"),
+                size=(size["width"], size["height"]) if size else None
+            )
+        for slot in spawn_zones.get("obstacles", []):
+            room.spawn_zones["obstacles"].append(ObstacleSlot(
+                slot["id"], slot["position"]["x"], slot["position"]["y"],
+                _intern_all(slot.get("allowed_types", ()))
+            ))
+        
+        room.validation = data.get("validation")
+        return room
+    
     def copy(self) -> 'RoomTemplate':
         """
-        Create a deep copy of this template
+        Create an independent copy of this template
+        
+        Tile rows and containers are copied; immutable values (tags tuple,
+        spawn zone tuples, strings) are shared.
         
         Returns:
             New RoomTemplate instance with copied data
         """
-        return copy.deepcopy(self)
+        clone = RoomTemplate.__new__(RoomTemplate)
+        clone.id = self.id
+        clone.width = self.width
+        clone.height = self.height
+        clone.shape_type = self.shape_type
+        clone.tiles = [bytearray(row) for row in self.tiles]
+        clone.metadata = {
+            key: (list(value) if isinstance(value, list) else value)
+            for key, value in self.metadata.items()
+        }
+        clone.connections = {name: _copy_connection(conn) for name, conn in self.connections.items()}
+        clone.spawn_zones = {kind: list(zones) for kind, zones in self.spawn_zones.items()}
+        clone.validation = dict(self.validation) if self.validation is not None else None
+        return clone
+    
+    def derive(self) -> 'RoomVariant':
+        """
+        Create a copy-on-write variant of this template
+        
+        The variant shares this room's tile rows and records modified cells
+        in a sparse overlay, so deriving allocates almost nothing. This room
+        must not be modified while variants derived from it are in use.
+        
+        Returns:
+            New RoomVariant based on this template
+        """
+        return RoomVariant(self)
+    
+    def __getstate__(self) -> tuple:
+        # Pack the grid into one bytes blob so pickling is a single copy
+        return (self.id, self.width, self.height, self.shape_type, self.tile_bytes(),
+                self.metadata, self.connections, self.spawn_zones, self.validation)
+    
+    def __setstate__(self, state: tuple) -> None:
+        (self.id, self.width, self.height, shape_type, blob,
+         self.metadata, self.connections, self.spawn_zones, self.validation) = state
+        self.shape_type = sys.intern(shape_type)
+        width = self.width
+        self.tiles = [bytearray(blob[i:i + width]) for i in range(0, width * self.height, width)]
     
     def get_summary(self) -> str:
         """
@@ -187,3 +377,139 @@ class RoomTemplate:
     
     def __repr__(self) -> str:
         return self.get_summary()
+
+
+class RoomVariant(RoomTemplate):
+    """
+    Copy-on-write variant of a RoomTemplate
+    
+    Reads fall through to the base room's tiles unless the cell was changed;
+    writes go to a sparse overlay keyed by y * width + x. Accessing
+    ``tiles`` (e.g. on JSON export) materializes the full grid once, after
+    which the variant behaves like a plain RoomTemplate.
+    """
+    
+    __slots__ = ('base', 'overlay', '_rows')
+    
+    def __init__(self, base: RoomTemplate):
+        """
+        Initialize a variant on top of a base room
+        
+        Args:
+            base: Room to share tiles with. Deriving from an unmaterialized
+                  variant reuses its base and copies its overlay.
+        """
+        if isinstance(base, RoomVariant) and base._rows is None:
+            self.base = base.base
+            self.overlay = dict(base.overlay)
+        else:
+            self.base = base
+            self.overlay = {}
+        self._rows = None
+        
+        self.id = base.id
+        self.width = base.width
+        self.height = base.height
+        self.shape_type = base.shape_type
+        self.metadata = {
+            key: (list(value) if isinstance(value, list) else value)
+            for key, value in base.metadata.items()
+        }
+        # Own connection dicts: door signatures are re-annotated per variant
+        self.connections = {name: _copy_connection(conn) for name, conn in base.connections.items()}
+        self.spawn_zones = {kind: list(zones) for kind, zones in base.spawn_zones.items()}
+        self.validation = dict(base.validation) if base.validation is not None else None
+    
+    @property
+    def tiles(self) -> List[bytearray]:
+        """Full tile rows (materialized on first access)"""
+        if self._rows is None:
+            self._rows = self._build_rows()
+            self.overlay = {}
+        return self._rows
+    
+    @tiles.setter
+    def tiles(self, rows: List[bytearray]) -> None:
+        self._rows = rows
+        self.overlay = {}
+    
+    def _build_rows(self) -> List[bytearray]:
+        """Build fresh rows from the base tiles plus the overlay"""
+        rows = [bytearray(row) for row in self.base.tiles]
+        width = self.width
+        for index, tile_id in self.overlay.items():
+            rows[index // width][index % width] = tile_id
+        return rows
+    
+    @property
+    def modified_cells(self) -> int:
+        """Number of cells that differ from the base (0 once materialized)"""
+        return len(self.overlay)
+    
+    def set_tile(self, x: int, y: int, tile_id: int) -> None:
+        """Set tile at (x, y), recording it in the overlay until materialized"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Position ({x}, {y}) out of bounds for room size {self.width}x{self.height}")
+        if self._rows is not None:
+            self._rows[y][x] = tile_id
+        elif self.base.tiles[y][x] == tile_id:
+            self.overlay.pop(y * self.width + x, None)
+        else:
+            self.overlay[y * self.width + x] = tile_id
+    
+    def get_tile(self, x: int, y: int) -> Optional[int]:
+        """Get tile at (x, y) from the overlay, falling back to the base"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if self._rows is not None:
+                return self._rows[y][x]
+            tile_id = self.overlay.get(y * self.width + x)
+            return self.base.tiles[y][x] if tile_id is None else tile_id
+        return None
+    
+    def tile_bytes(self) -> bytes:
+        """Packed tiles, built from base + overlay without materializing"""
+        if self._rows is not None:
+            return b''.join(self._rows)
+        if not self.overlay:
+            return self.base.tile_bytes()
+        packed = bytearray(self.base.tile_bytes())
+        for index, tile_id in self.overlay.items():
+            packed[index] = tile_id
+        return bytes(packed)
+    
+    def materialize(self) -> RoomTemplate:
+        """
+        Build an independent RoomTemplate with this variant's content
+        
+        Returns:
+            Plain RoomTemplate (the variant itself is left unchanged)
+        """
+        room = RoomTemplate.__new__(RoomTemplate)
+        room.id = self.id
+        room.width = self.width
+        room.height = self.height
+        room.shape_type = self.shape_type
+        room.tiles = [bytearray(row) for row in self._rows] if self._rows is not None else self._build_rows()
+        room.metadata = {
+            key: (list(value) if isinstance(value, list) else value)
+            for key, value in self.metadata.items()
+        }
+        room.connections = {name: _copy_connection(conn) for name, conn in self.connections.items()}
+        room.spawn_zones = {kind: list(zones) for kind, zones in self.spawn_zones.items()}
+        room.validation = dict(self.validation) if self.validation is not None else None
+        return room
+    
+    def copy(self) -> RoomTemplate:
+        """Independent copy (a materialized plain RoomTemplate)"""
+        return self.materialize()
+    
+    def __reduce__(self):
+        # Variants travel between processes as plain rooms
+        return (_restore_room, (self.__getstate__(),))
+
+
+def _restore_room(state: tuple) -> RoomTemplate:
+    """Unpickle helper that rebuilds a plain RoomTemplate from packed state"""
+    room = RoomTemplate.__new__(RoomTemplate)
+    room.__setstate__(state)
+    return room
@@ -0,0 +1,116 @@
+"""
+World graph analysis
+
+A world is a list of level dicts. In a linear world each level's exit
+leads to the next level's entrance. In a branching world (see
+world_generator.generate_world_graph) every level lists its outgoing doors
+under 'links':
+
+    {'door': 'exit_2', 'to': 'World_L04_B1_1', 'to_door': 'entrance'}
+
+Doors can be walked both ways, so distances are computed on the
+undirected room graph, counted in doors passed through.
+"""
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# (from level index, from door, to level index, to door)
+Link = Tuple[int, str, int, str]
+
+
+def level_links(levels: Sequence[Dict[str, Any]]) -> List[Link]:
+    """
+    Get the door links between levels
+    
+    Args:
+        levels: Level dicts from world generator
+    
+    Returns:
+        Links in level order; a linear world links each exit to the next
+        level's entrance
+    """
+    if any('links' in level for level in levels):
+        index_of = {level['level_id']: i for i, level in enumerate(levels)}
+        return [
+            (i, link['door'], index_of[link['to']], link['to_door'])
+            for i, level in enumerate(levels)
+            for link in level.get('links', ())
+        ]
+    return [(i, 'exit', i + 1, 'entrance') for i in range(len(levels) - 1)]
+
+
+def room_adjacency(levels: Sequence[Dict[str, Any]]) -> List[List[int]]:
+    """Get the undirected neighbor lists of the room graph"""
+    adjacency: List[List[int]] = [[] for _ in levels]
+    for source, _, target, _ in level_links(levels):
+        adjacency[source].append(target)
+        adjacency[target].append(source)
+    return adjacency
+
+
+def _bfs(adjacency: List[List[int]], start: int) -> Tuple[List[int], List[int]]:
+    """Breadth-first search: (distance, parent) per room, -1 if unreachable"""
+    distance = [-1] * len(adjacency)
+    parent = [-1] * len(adjacency)
+    distance[start] = 0
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for neighbor in adjacency[current]:
+            if distance[neighbor] < 0:
+                distance[neighbor] = distance[current] + 1
+                parent[neighbor] = current
+                queue.append(neighbor)
+    return distance, parent
+
+
+def room_distances(levels: Sequence[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Compute all-pairs room distances
+    
+    One breadth-first search per room: O(rooms * links) overall.
+    
+    Args:
+        levels: Level dicts from world generator
+    
+    Returns:
+        Matrix where [i][j] is the number of doors between levels i and j
+        (-1 if unreachable)
+    """
+    adjacency = room_adjacency(levels)
+    return [_bfs(adjacency, start)[0] for start in range(len(levels))]
+
+
+def goal_index(levels: Sequence[Dict[str, Any]]) -> int:
+    """Get the index of the world's final level (the last main-path level)"""
+    for index in range(len(levels) - 1, -1, -1):
+        if levels[index].get('branch') is None:
+            return index
+    return len(levels) - 1
+
+
+def critical_path(levels: Sequence[Dict[str, Any]], start: int = 0,
+                  goal: Optional[int] = None) -> List[int]:
+    """
+    Find the shortest route from the first level to the final level
+    
+    Args:
+        levels: Level dicts from world generator
+        start: Index of the starting level
+        goal: Index of the final level (default: goal_index(levels))
+    
+    Returns:
+        Level indices along the route, start and goal included (empty if
+        the goal is unreachable)
+    """
+    if goal is None:
+        goal = goal_index(levels)
+    distance, parent = _bfs(room_adjacency(levels), start)
+    if distance[goal] < 0:
+        return []
+    
+    path = [goal]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
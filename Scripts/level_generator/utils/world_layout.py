@@ -0,0 +1,156 @@
+"""
+World layout geometry: room placement and overlap detection
+
+Levels are laid out on one tile grid. Each room is placed against the
+side of the previous room that its exit faces, top/left edges aligned.
+Placed room rectangles are kept in an occupancy hash (coarse grid cell ->
+rooms touching it), so an overlap check only looks at the rooms in the
+few cells a new rectangle covers - constant time per placement no matter
+how many rooms the world already has.
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+# (x, y, width, height) in tiles
+Rect = Tuple[int, int, int, int]
+
+
+def next_room_position(rect: Rect, exit_dir: str, width: int, height: int) -> Tuple[int, int]:
+    """
+    Get the position of a room entered through the exit of another
+    
+    Args:
+        rect: Rectangle of the room being exited
+        exit_dir: Side the exit is on ('left', 'right', 'up', 'down')
+        width: Width of the next room
+        height: Height of the next room
+    
+    Returns:
+        (x, y) of the next room's top-left corner
+    """
+    x, y, prev_width, prev_height = rect
+    if exit_dir == 'right':
+        return x + prev_width, y
+    if exit_dir == 'left':
+        return x - width, y
+    if exit_dir == 'up':
+        return x, y - height
+    if exit_dir == 'down':
+        return x, y + prev_height
+    return x, y
+
+
+def chain_positions(rooms: Sequence[Tuple[int, int, Optional[str]]],
+                    origin: Tuple[int, int] = (0, 0)) -> List[Tuple[int, int]]:
+    """
+    Lay out a chain of rooms, each entered through the previous one's exit
+    
+    Args:
+        rooms: (width, height, exit direction) per room, in chain order
+        origin: Position of the first room
+    
+    Returns:
+        (x, y) per room
+    """
+    positions = []
+    x, y = origin
+    for index, (width, height, exit_dir) in enumerate(rooms):
+        if index > 0:
+            prev_x, prev_y = positions[-1]
+            prev_width, prev_height, prev_exit = rooms[index - 1]
+            x, y = next_room_position((prev_x, prev_y, prev_width, prev_height), prev_exit, width, height)
+        positions.append((x, y))
+    return positions
+
+
+def level_positions(levels: Sequence[Dict]) -> List[Tuple[int, int]]:
+    """
+    Get the positions of generated levels
+    
+    Uses the positions stored by the world generator ('position' key) when
+    every level has one, otherwise lays the levels out from their exit
+    directions.
+    
+    Args:
+        levels: Level dicts from world generator
+    
+    Returns:
+        (x, y) per level
+    """
+    if levels and all('position' in level for level in levels):
+        return [(level['position']['x'], level['position']['y']) for level in levels]
+    
+    rooms = []
+    for level in levels:
+        room = level['room']
+        exit_conn = room.connections.get('exit')
+        rooms.append((room.width, room.height, exit_conn['direction'] if exit_conn else None))
+    return chain_positions(rooms)
+
+
+def rects_overlap(a: Rect, b: Rect) -> bool:
+    """Check whether two rectangles share any tile (touching edges is fine)"""
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+class OccupancyIndex:
+    """
+    Occupancy hash of placed room rectangles
+    
+    Usage:
+        index = OccupancyIndex()
+        if index.find_overlap(rect) is None:
+            index.add(level_index, rect)
+    """
+    
+    def __init__(self, cell_size: int = 32):
+        """
+        Args:
+            cell_size: Hash cell size in tiles (about the size of a room)
+        """
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self.rects: Dict[Hashable, Rect] = {}
+    
+    def __len__(self) -> int:
+        return len(self.rects)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.rects
+    
+    def _cells(self, rect: Rect) -> Iterable[Tuple[int, int]]:
+        x, y, width, height = rect
+        size = self.cell_size
+        for cy in range(y // size, (y + height - 1) // size + 1):
+            for cx in range(x // size, (x + width - 1) // size + 1):
+                yield cx, cy
+    
+    def find_overlap(self, rect: Rect) -> Optional[Hashable]:
+        """
+        Find a placed room overlapping a rectangle
+        
+        Returns:
+            Key of an overlapping room, or None
+        """
+        for cell in self._cells(rect):
+            for key in self.cells.get(cell, ()):
+                if rects_overlap(rect, self.rects[key]):
+                    return key
+        return None
+    
+    def add(self, key: Hashable, rect: Rect) -> None:
+        """Place a room (replacing any room with the same key)"""
+        if key in self.rects:
+            self.remove(key)
+        self.rects[key] = rect
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell, set()).add(key)
+    
+    def remove(self, key: Hashable) -> None:
+        """Remove a placed room"""
+        rect = self.rects.pop(key)
+        for cell in self._cells(rect):
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
@@ -1,8 +1,10 @@
 """
 Validation modules
 """
+from .hierarchical import room_abstraction, world_reachable, world_route
 from .pathfinding import astar, has_path
 from .validator import validate_room
 from .validator_simple import validate_room_simple  # type: ignore
 
-__all__ = ['astar', 'has_path', 'validate_room', 'validate_room_simple']
+__all__ = ['astar', 'has_path', 'room_abstraction', 'validate_room', 'validate_room_simple',
+           'world_reachable', 'world_route']
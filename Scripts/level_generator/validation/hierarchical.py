@@ -0,0 +1,318 @@
+"""
+Hierarchical pathfinding for large rooms and whole worlds (HPA*-style)
+
+A room is cut into square clusters of tiles. Every standing cell with a
+move (walk, jump, fall, slope step - see pathfinding.get_neighbors) into
+or out of another cluster is a portal; portals of the same cluster are
+joined by the cost of the best path that stays inside the cluster. That
+abstract graph is built once per room and cached by the room's tiles, so
+a query only searches its own start and goal clusters tile by tile and
+the (much smaller) portal graph for the rest. Distances are exact: every
+path splits into in-cluster runs between cluster crossings.
+
+A world is a graph of doors: doors of one room are joined by the room's
+door-to-door distance, linked doors of neighbouring rooms by a free step.
+Checking that the final exit can be reached from the first entrance is a
+search over that graph, and only rooms the search actually enters get
+their door distances computed.
+"""
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.bitboard import RoomBitboard, bit_runs
+from utils.grid_hash import grid_hash, memo_stamp
+from utils.movement import find_nearest_standing_position
+from utils.world_graph import critical_path, goal_index, level_links
+from validation.jump_arcs import arc_masks
+from validation.pathfinding import Node, get_neighbors
+from validation.reachability import standing_rows
+import config
+
+Cell = Tuple[int, int]
+
+# Cluster side length (tiles)
+CLUSTER_SIZE = 8
+
+# Room abstractions kept in memory, keyed by room contents
+ABSTRACTION_CACHE_SIZE = 256
+
+_abstractions: Dict[tuple, 'RoomAbstraction'] = {}
+
+
+def _local_search(edges: Dict[Cell, List[Tuple[Cell, int]]], start: Cell,
+                  cluster: Tuple[int, int], cluster_size: int) -> Dict[Cell, int]:
+    """Dijkstra from a cell over the moves that stay inside one cluster"""
+    distance = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        d, cell = heapq.heappop(heap)
+        if d > distance[cell]:
+            continue
+        for target, cost in edges.get(cell, ()):
+            if (target[0] // cluster_size, target[1] // cluster_size) != cluster:
+                continue
+            nd = d + cost
+            if nd < distance.get(target, nd + 1):
+                distance[target] = nd
+                heapq.heappush(heap, (nd, target))
+    return distance
+
+
+class RoomAbstraction:
+    """
+    Cluster/portal graph of one room
+    
+    Usage:
+        abstraction = room_abstraction(room)
+        cost = abstraction.door_distance('entrance', 'exit')
+    """
+    
+    def __init__(self, room, cluster_size: int = CLUSTER_SIZE,
+                 max_jump_horizontal: Optional[int] = None,
+                 max_jump_vertical: Optional[int] = None):
+        """
+        Build the abstraction
+        
+        Args:
+            room: RoomTemplate (the abstraction is a snapshot of its tiles)
+            cluster_size: Cluster side length (tiles)
+            max_jump_horizontal: Max horizontal jump distance (default from config)
+            max_jump_vertical: Max vertical jump height (default from config)
+        """
+        if max_jump_horizontal is None:
+            max_jump_horizontal = config.MAX_JUMP_DISTANCE
+        if max_jump_vertical is None:
+            max_jump_vertical = config.MAX_JUMP_HEIGHT
+        self.cluster_size = cluster_size
+        
+        # Door name -> standing cell near the door (None if there is none)
+        self.doors: Dict[str, Optional[Cell]] = {
+            name: find_nearest_standing_position(room, conn['position']['x'], conn['position']['y'])
+            for name, conn in room.connections.items()
+        }
+        
+        # Tile-level move graph over the standing cells, both directions
+        board = RoomBitboard(room)
+        masks = arc_masks(room, board)
+        self.edges: Dict[Cell, List[Tuple[Cell, int]]] = {}
+        self.reverse_edges: Dict[Cell, List[Tuple[Cell, int]]] = {}
+        for y, row in enumerate(standing_rows(room, board)):
+            for start, length in bit_runs(row):
+                for x in range(start, start + length):
+                    moves = get_neighbors(room, Node(x, y, 0, 0), max_jump_horizontal,
+                                          max_jump_vertical, masks)
+                    self.edges[(x, y)] = [((nx, ny), cost) for nx, ny, cost in moves]
+                    for nx, ny, cost in moves:
+                        self.reverse_edges.setdefault((nx, ny), []).append(((x, y), cost))
+        
+        # Portals: ends of moves between clusters
+        portals_by_cluster: Dict[Tuple[int, int], set] = {}
+        self.portal_edges: Dict[Cell, List[Tuple[Cell, int]]] = {}
+        for cell, moves in self.edges.items():
+            for target, cost in moves:
+                if self.cluster_of(target) != self.cluster_of(cell):
+                    portals_by_cluster.setdefault(self.cluster_of(cell), set()).add(cell)
+                    portals_by_cluster.setdefault(self.cluster_of(target), set()).add(target)
+                    self.portal_edges.setdefault(cell, []).append((target, cost))
+        
+        # Join the portals of each cluster by their in-cluster distances
+        for cluster, portals in portals_by_cluster.items():
+            for portal in portals:
+                reached = _local_search(self.edges, portal, cluster, cluster_size)
+                edges = self.portal_edges.setdefault(portal, [])
+                edges.extend((other, reached[other]) for other in portals
+                             if other != portal and other in reached)
+        self.portals = portals_by_cluster
+        
+        self._door_distances: Dict[Tuple[str, str], Optional[int]] = {}
+    
+    def cluster_of(self, cell: Cell) -> Tuple[int, int]:
+        """Get the (column, row) of the cluster a cell is in"""
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+    
+    def distance(self, start: Cell, goal: Cell) -> Optional[int]:
+        """
+        Get the cost of the best path between two standing cells
+        
+        Returns:
+            Path cost (same move costs as pathfinding.astar), or None if the
+            goal can't be reached
+        """
+        if start == goal:
+            return 0
+        if start not in self.edges or goal not in self.edges:
+            return None
+        
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        leaving = _local_search(self.edges, start, start_cluster, self.cluster_size)
+        arriving = _local_search(self.reverse_edges, goal, goal_cluster, self.cluster_size)
+        
+        best = leaving.get(goal) if start_cluster == goal_cluster else None
+        distance = {}
+        heap = []
+        for portal in self.portals.get(start_cluster, ()):
+            if portal in leaving:
+                distance[portal] = leaving[portal]
+                heapq.heappush(heap, (leaving[portal], portal))
+        
+        while heap:
+            d, portal = heapq.heappop(heap)
+            if best is not None and d >= best:
+                break
+            if d > distance[portal]:
+                continue
+            if portal in arriving and (best is None or d + arriving[portal] < best):
+                best = d + arriving[portal]
+            for target, cost in self.portal_edges.get(portal, ()):
+                nd = d + cost
+                if nd < distance.get(target, nd + 1):
+                    distance[target] = nd
+                    heapq.heappush(heap, (nd, target))
+        return best
+    
+    def door_distance(self, from_door: str, to_door: str) -> Optional[int]:
+        """
+        Get the cost of walking from one door of the room to another
+        
+        Returns:
+            Path cost, or None if the door can't be reached
+        """
+        key = (from_door, to_door)
+        if key not in self._door_distances:
+            start, goal = self.doors.get(from_door), self.doors.get(to_door)
+            if start is None or goal is None:
+                self._door_distances[key] = None
+            else:
+                self._door_distances[key] = self.distance(start, goal)
+        return self._door_distances[key]
+
+
+def room_abstraction(room, cluster_size: int = CLUSTER_SIZE,
+                     max_jump_horizontal: Optional[int] = None,
+                     max_jump_vertical: Optional[int] = None) -> RoomAbstraction:
+    """
+    Get the abstraction of a room, reusing a cached one for identical rooms
+    
+    Rooms are matched by utils.grid_hash, movement limits and the config
+    values movement reads (utils.grid_hash.memo_stamp), so a room edited
+    after a lookup, or a config change, gets a fresh abstraction.
+    """
+    key = (grid_hash(room), memo_stamp(), cluster_size, max_jump_horizontal, max_jump_vertical)
+    abstraction = _abstractions.get(key)
+    if abstraction is None:
+        abstraction = RoomAbstraction(room, cluster_size, max_jump_horizontal, max_jump_vertical)
+        if len(_abstractions) >= ABSTRACTION_CACHE_SIZE:
+            # Drop the oldest entry
+            del _abstractions[next(iter(_abstractions))]
+        _abstractions[key] = abstraction
+    return abstraction
+
+
+DoorNode = Tuple[int, str]  # (level index, door name)
+
+
+def _search_world(levels: Sequence[Dict[str, Any]], origin: DoorNode,
+                  destination: Optional[DoorNode]) -> Tuple[Dict[DoorNode, int], Dict[DoorNode, DoorNode]]:
+    """
+    Dijkstra over the world's door graph
+    
+    Returns:
+        (distance, parent) per door reached; the search stops early once
+        the destination is reached
+    """
+    linked: Dict[DoorNode, List[DoorNode]] = {}
+    for source, door, target, to_door in level_links(levels):
+        linked.setdefault((source, door), []).append((target, to_door))
+        linked.setdefault((target, to_door), []).append((source, door))
+    
+    distance = {origin: 0}
+    parent: Dict[DoorNode, DoorNode] = {}
+    done = set()
+    heap = [(0, origin)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        done.add(node)
+        if node == destination:
+            break
+        
+        level, door = node
+        steps = [(other, 0) for other in linked.get(node, ())]
+        room = levels[level]['room']
+        abstraction = room_abstraction(room)
+        for other_door in room.connections:
+            if other_door != door:
+                cost = abstraction.door_distance(door, other_door)
+                if cost is not None:
+                    steps.append(((level, other_door), cost))
+        
+        for other, cost in steps:
+            nd = d + cost
+            if nd < distance.get(other, nd + 1):
+                distance[other] = nd
+                parent[other] = node
+                heapq.heappush(heap, (nd, other))
+    return distance, parent
+
+
+def world_route(levels: Sequence[Dict[str, Any]], start: int = 0,
+                goal: Optional[int] = None) -> List[DoorNode]:
+    """
+    Find the cheapest walk from the first entrance to the final exit
+    
+    Args:
+        levels: Level dicts from world generator
+        start: Index of the level whose entrance the player starts at
+        goal: Index of the level whose exit ends the world
+              (default: utils.world_graph.goal_index(levels))
+    
+    Returns:
+        (level index, door name) of every door passed, in order (empty if
+        the final exit can't be reached)
+    """
+    if not levels:
+        return []
+    if goal is None:
+        goal = goal_index(levels)
+    
+    origin, destination = (start, 'entrance'), (goal, 'exit')
+    distance, parent = _search_world(levels, origin, destination)
+    if destination not in distance:
+        return []
+    
+    route = [destination]
+    while route[-1] != origin:
+        route.append(parent[route[-1]])
+    route.reverse()
+    return route
+
+
+def blocked_level(levels: Sequence[Dict[str, Any]]) -> Optional[int]:
+    """
+    Find where the world's critical path can't be walked
+    
+    Returns:
+        Index of the first level on utils.world_graph.critical_path that
+        the player can enter but can't cross towards the final exit, or
+        None if the final exit is reachable
+    """
+    if not levels:
+        return None
+    distance, _ = _search_world(levels, (0, 'entrance'), None)
+    if (goal_index(levels), 'exit') in distance:
+        return None
+    
+    path = critical_path(levels)
+    doors = {(source, target): door for source, door, target, _ in level_links(levels)}
+    doors.update({(target, source): to_door for source, _, target, to_door in level_links(levels)})
+    for i, level in enumerate(path):
+        leaving = doors.get((level, path[i + 1])) if i + 1 < len(path) else 'exit'
+        if (level, leaving) not in distance:
+            return level
+    return path[-1] if path else 0
+
+
+def world_reachable(levels: Sequence[Dict[str, Any]]) -> bool:
+    """Check that the world's final exit can be reached from its first entrance"""
+    return bool(world_route(levels))
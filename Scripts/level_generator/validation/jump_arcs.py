@@ -0,0 +1,159 @@
+"""
+Precomputed jump-arc stencils
+
+A jump from feet cell (x, y) to (x + dx, y + dy) follows a parabola that
+rises a tile above the higher of the two ends (capped at MAX_JUMP_HEIGHT
+above the start). The stencil of a (dx, dy) jump is the set of cells the
+player's body (PLAYER_HEIGHT tiles) sweeps along that parabola, stored as
+one bitmask per row relative to the start cell:
+
+- solid stencil: every body cell; any GROUND/WALL tile there blocks
+- landing stencil: the cells the feet drop into while coming down from
+  the apex (the final landing cell excluded); a one-way platform there
+  would catch the player early, so it blocks too
+
+The body is PLAYER_HEIGHT rather than PLAYER_TOTAL_HEIGHT tiles: the
+tile the arc rises is the PLAYER_HEADROOM, so a jump needs exactly the
+standing clearance. Sweeping the full 3 tiles on top of the rise would
+demand 4 clear rows, which no generator leaves.
+
+Stencils depend only on (dx, dy), so each is computed once and shared by
+every room. Checking a jump is one shift and AND per stencil row against
+the room's row bitboards.
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from utils.bitboard import RoomBitboard
+import config
+
+# Samples per tile of arc length when sweeping the body
+_SAMPLES_PER_TILE = 16
+
+
+class ArcStencil(NamedTuple):
+    """Cells swept by one jump, as (row offset, column bits) pairs"""
+    left: int  # Column offset of bit 0 (min(0, dx))
+    solid: Tuple[Tuple[int, int], ...]
+    landing: Tuple[Tuple[int, int], ...]
+
+
+def _arc_bulge(dy: int, rise: float) -> float:
+    """
+    Find b so that y(t) = dy*t - 4*b*t*(1-t) peaks `rise` tiles above the start
+    
+    Returns:
+        b >= 0 (bisection; the peak only gets higher as b grows)
+    """
+    def peak(b: float) -> float:
+        if b <= 0:
+            return max(0.0, -dy)
+        t = min(1.0, max(0.0, (4 * b - dy) / (8 * b)))
+        return -(dy * t - 4 * b * t * (1 - t))
+    
+    low, high = 0.0, 4.0 * (rise + abs(dy) + 1)
+    for _ in range(60):
+        middle = (low + high) / 2
+        if peak(middle) < rise:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def arc_stencil(dx: int, dy: int, max_jump_vertical: Optional[int] = None) -> ArcStencil:
+    """
+    Get the stencil of a jump (computed once per (dx, dy))
+    
+    Stencils are cached under the resolved jump height and PLAYER_HEIGHT,
+    so changing config never returns a stale stencil.
+    
+    Args:
+        dx: Horizontal jump distance (negative is left)
+        dy: Vertical jump distance (negative is up)
+        max_jump_vertical: Max rise above the start (default from config)
+    
+    Returns:
+        ArcStencil
+    """
+    if max_jump_vertical is None:
+        max_jump_vertical = config.MAX_JUMP_HEIGHT
+    return _arc_stencil(dx, dy, max_jump_vertical, config.PLAYER_HEIGHT)
+
+
+@lru_cache(maxsize=None)
+def _arc_stencil(dx: int, dy: int, max_jump_vertical: int, body_height: int) -> ArcStencil:
+    """Compute the stencil of a jump for a given jump height and body height"""
+    rise = min(max(-dy, 0) + 1, max(max_jump_vertical, -dy))
+    bulge = _arc_bulge(dy, rise)
+    apex_t = min(1.0, max(0.0, (4 * bulge - dy) / (8 * bulge))) if bulge > 0 else 0.0
+    apex_y = dy * apex_t - 4 * bulge * apex_t * (1 - apex_t)
+    apex_row = int(apex_y + 0.5) if apex_y >= 0 else -int(-apex_y + 0.5)
+    
+    left = min(0, dx)
+    solid = {}
+    landing = {}
+    samples = _SAMPLES_PER_TILE * (abs(dx) + abs(dy) + 2 * int(rise) + 1)
+    for i in range(samples + 1):
+        t = i / samples
+        column = int(dx * t + 0.5 if dx >= 0 else dx * t - 0.5)
+        y = dy * t - 4 * bulge * t * (1 - t)
+        feet = int(y + 0.5) if y >= 0 else -int(-y + 0.5)
+        bit = 1 << (column - left)
+        for body in range(body_height):
+            solid[feet - body] = solid.get(feet - body, 0) | bit
+        # Platforms only catch feet dropping onto them from a row above
+        if t > apex_t and feet > apex_row and (column, feet) != (dx, dy):
+            landing[feet] = landing.get(feet, 0) | bit
+    
+    return ArcStencil(left, tuple(sorted(solid.items())), tuple(sorted(landing.items())))
+
+
+def arc_masks(room, board: Optional[RoomBitboard] = None) -> Tuple[List[int], List[int]]:
+    """
+    Get the row bitboards jump stencils are checked against
+    
+    Returns:
+        (solid rows, solid-or-platform rows)
+    """
+    if board is None:
+        board = RoomBitboard(room)
+    return board.rows('ground', 'wall'), board.rows('ground', 'wall', 'platform')
+
+
+def _hits(rows: List[int], stencil_rows: Tuple[Tuple[int, int], ...], x: int, y: int) -> bool:
+    """Check whether any stencil cell lands on a set bit (cells outside the room are clear)"""
+    height = len(rows)
+    for offset, bits in stencil_rows:
+        row = y + offset
+        if not 0 <= row < height:
+            continue
+        mask = rows[row]
+        if x >= 0:
+            mask >>= x
+        else:
+            mask <<= -x
+        if mask & bits:
+            return True
+    return False
+
+
+def arc_is_clear(masks: Tuple[List[int], List[int]], start_x: int, start_y: int,
+                 end_x: int, end_y: int, max_jump_vertical: Optional[int] = None) -> bool:
+    """
+    Check a jump against a room
+    
+    Args:
+        masks: arc_masks of the room
+        start_x, start_y: Jump start position (feet)
+        end_x, end_y: Jump end position (feet)
+        max_jump_vertical: Max rise above the start (default from config)
+    
+    Returns:
+        True if nothing is in the way
+    """
+    stencil = arc_stencil(end_x - start_x, end_y - start_y, max_jump_vertical)
+    solid_rows, landing_rows = masks
+    x = start_x + stencil.left
+    return not (_hits(solid_rows, stencil.solid, x, start_y) or
+                _hits(landing_rows, stencil.landing, x, start_y))
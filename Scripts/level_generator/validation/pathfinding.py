@@ -10,7 +10,14 @@ import os
 # Add parent directories to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.bitboard import RoomBitboard
+from utils.grid_hash import memoize_by_grid
+from utils.movement import (
+    can_stand_at, find_nearest_standing_position, is_standing_on_solid, jump_vertical_range
+)
 from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE, is_solid, is_platform
+from validation.jump_arcs import arc_is_clear, arc_masks
+from validation.reachability import reachability_mask
 import config
 
 
@@ -40,113 +47,32 @@ def manhattan_distance(x1, y1, x2, y2):
     return abs(x1 - x2) + abs(y1 - y2)
 
 
-def is_standing_on_solid(room, x, y):
-    """Check if position (x, y) has solid ground below"""
-    if y + 1 >= room.height:
-        return False
-    
-    tile_below = room.get_tile(x, y + 1)
-    return tile_below in [GROUND, WALL, PLATFORM_ONEWAY]
-
-
-def can_stand_at(room, x, y):
-    """
-    Check if player can stand at position (x, y)
-    
-    Player collision model (Week 4):
-    Coordinate system: Y=0 is TOP of room, Y=height-1 is BOTTOM
-    - y: feet position
-    - y-1, y-2: body (extends UPWARD from feet)
-    - y+1: ground below feet (extends DOWNWARD)
-    
-    Total: 3 tiles of vertical clearance needed (y-2, y-1, y)
-    
-    Args:
-        room: RoomTemplate
-        x: X position (feet)
-        y: Y position (feet)
-    
-    Returns:
-        bool: True if player can stand at this position
-    """
-    # Check bounds for full player height (extends upward from y)
-    if not (0 <= x < room.width):
-        return False
-    if y - config.PLAYER_HEIGHT < 0 or y >= room.height:  # Need headroom above
-        return False
-    
-    # Check that 3 tiles of body space are passable (y, y-1, y-2)
-    # This is feet + 2 body tiles extending UPWARD
-    for dy in range(config.PLAYER_TOTAL_HEIGHT):
-        check_y = y - dy  # Go UPWARD (toward y=0)
-        if check_y < 0:
-            return False
-        
-        tile = room.get_tile(x, check_y)
-        
-        # Solid tiles (GROUND, WALL) block player body
-        if tile in [GROUND, WALL]:
-            return False
-        
-        # PLATFORM_ONEWAY: Can pass through when jumping up from below
-        # For now, treat as passable in body space
-        # (player can jump through platforms from below)
-    
-    # Must have solid ground below feet (at y+1, going DOWNWARD)
-    if y + 1 >= room.height:
-        return False
-    tile_below = room.get_tile(x, y + 1)
-    return tile_below in [GROUND, WALL, PLATFORM_ONEWAY]
-
-
-def check_jump_arc_clearance(room, start_x, start_y, end_x, end_y):
+def check_jump_arc_clearance(room, start_x, start_y, end_x, end_y, masks=None, max_jump_vertical=None):
     """
     Check if jump arc has sufficient headroom (Week 4)
     
     Validates that player won't hit their head during jump.
-    Samples points along parabolic arc and checks 3-tile clearance.
+    Checks every cell the PLAYER_HEIGHT body sweeps along the parabolic
+    arc against the room (precomputed stencils, see validation.jump_arcs).
+    The arc rises a tile above the higher end, so a jump needs the same
+    PLAYER_TOTAL_HEIGHT clearance as standing.
     
     Args:
         room: RoomTemplate
         start_x, start_y: Jump start position (feet)
         end_x, end_y: Jump end position (feet)
+        masks: Optional jump_arcs.arc_masks of the room (built if omitted)
+        max_jump_vertical: Max jump height (default from config)
     
     Returns:
         bool: True if jump has clearance
     """
-    # For platformer jumps, apex is roughly at horizontal midpoint
-    mid_x = (start_x + end_x) // 2
-    
-    # Vertical jump height - apex is highest point
-    if end_y < start_y:  # Jumping up
-        apex_y = end_y
-    else:  # Jumping down or level
-        # Assume player jumps slightly up first
-        apex_y = min(start_y, end_y) - 1
-    
-    # Check clearance at apex (most restrictive point)
-    for check_y in range(apex_y, min(apex_y + config.PLAYER_TOTAL_HEIGHT, room.height)):
-        if check_y < 0:
-            continue
-        if mid_x < 0 or mid_x >= room.width:
-            continue
-        
-        tile = room.get_tile(mid_x, check_y)
-        
-        # Solid tiles block jump arc
-        if tile in [GROUND, WALL]:
-            return False
-        
-        # One-way platforms: Can jump through from below
-        # So only block if we're descending onto them
-        if tile == PLATFORM_ONEWAY:
-            if apex_y >= start_y:  # Descending
-                return False
-    
-    return True
+    if masks is None:
+        masks = arc_masks(room)
+    return arc_is_clear(masks, start_x, start_y, end_x, end_y, max_jump_vertical)
 
 
-def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4):
+def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4, masks=None):
     """
     Get all reachable neighbors from current node
     
@@ -155,6 +81,9 @@ def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4):
     - Jump in arc patterns (more realistic)
     - Fall down with gravity
     - Traverse slopes
+    
+    Pass the room's jump_arcs.arc_masks as masks when calling this for
+    many nodes of one room; otherwise they're rebuilt on every call.
     """
     neighbors = []
     x, y = node.x, node.y
@@ -185,6 +114,8 @@ def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4):
             neighbors.append((nx, y + 1, 1))
     
     # 2. Jump mechanics - more lenient rules
+    if masks is None:
+        masks = arc_masks(room)
     # Players can jump up to max_jump_horizontal horizontally and max_jump_vertical vertically
     # Use realistic arc patterns instead of all combinations
     
@@ -196,17 +127,7 @@ def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4):
         # Shorter horizontal jumps can go higher
         # Longer horizontal jumps tend to be flatter
         
-        abs_dx = abs(dx)
-        
-        # Can jump up when moving shorter distances
-        if abs_dx <= 2:
-            vertical_range = range(-max_jump_vertical, 2)  # Can jump high on short hops
-        elif abs_dx <= 4:
-            vertical_range = range(-2, 2)  # Medium jumps are flatter
-        else:
-            vertical_range = range(-1, 3)  # Long jumps can only go slightly up or fall
-        
-        for dy in vertical_range:
+        for dy in jump_vertical_range(abs(dx), max_jump_vertical):
             nx = x + dx
             ny = y + dy
             
@@ -224,7 +145,7 @@ def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4):
                         # Check if player can stand at landing position (3-tile clearance)
                         if can_stand_at(room, nx, ny):
                             # Check jump arc clearance (Week 4)
-                            if check_jump_arc_clearance(room, x, y, nx, ny):
+                            if check_jump_arc_clearance(room, x, y, nx, ny, masks, max_jump_vertical):
                                 # Valid landing spot with clearance
                                 cost = max(abs(dx), abs(dy))  # Chebyshev distance
                                 neighbors.append((nx, ny, cost))
@@ -253,7 +174,8 @@ def get_neighbors(room, node, max_jump_horizontal=5, max_jump_vertical=4):
     return neighbors
 
 
-def astar(room, start, goal, max_jump_horizontal=None, max_jump_vertical=None):
+@memoize_by_grid
+def astar(room, start, goal, max_jump_horizontal=None, max_jump_vertical=None, precheck=True):
     """
     A* pathfinding for platformer movement
     
@@ -263,9 +185,14 @@ def astar(room, start, goal, max_jump_horizontal=None, max_jump_vertical=None):
         goal: (x, y) tuple for goal position
         max_jump_horizontal: Max horizontal jump distance (default from config)
         max_jump_vertical: Max vertical jump height (default from config)
+        precheck: Run the bit-parallel reachability pass first
+                  (validation.reachability): rooms it proves unsolvable are
+                  rejected without searching, and the search skips cells
+                  that can't be on a path
     
     Returns:
         List of (x, y) positions if path exists, None otherwise
+        (memoized by the room's contents, see utils.grid_hash)
     """
     if max_jump_horizontal is None:
         max_jump_horizontal = config.MAX_JUMP_DISTANCE
@@ -275,45 +202,9 @@ def astar(room, start, goal, max_jump_horizontal=None, max_jump_vertical=None):
     start_x, start_y = start
     goal_x, goal_y = goal
     
-    # Improved door position handling - find nearest valid standing position
-    def find_nearest_standing_position(px, py, max_search=10):
-        """
-        Find nearest valid standing position from a point
-        
-        Platformer-aware search prioritizes vertical then horizontal
-        """
-        # First check if current position is valid
-        if can_stand_at(room, px, py):
-            return (px, py)
-        
-        # Strategy 1: Search vertically - player might be IN ground, try above/below
-        for dy in range(-5, 6):
-            test_y = py + dy
-            if 0 <= test_y < room.height and can_stand_at(room, px, test_y):
-                return (px, test_y)
-        
-        # Strategy 2: Search horizontally at similar Y levels
-        for dx in range(1, max_search):
-            for direction in [1, -1]:
-                test_x = px + (dx * direction)
-                if 0 <= test_x < room.width:
-                    # Try this X at various Y levels
-                    for dy in range(-4, 5):
-                        test_y = py + dy
-                        if 0 <= test_y < room.height and can_stand_at(room, test_x, test_y):
-                            return (test_x, test_y)
-        
-        # Last resort: find ANY valid position in the room
-        for y in range(room.height):
-            for x in range(room.width):
-                if can_stand_at(room, x, y):
-                    return (x, y)
-        
-        return None
-    
     # Find valid positions near doors
-    start_pos = find_nearest_standing_position(start_x, start_y)
-    goal_pos = find_nearest_standing_position(goal_x, goal_y)
+    start_pos = find_nearest_standing_position(room, start_x, start_y)
+    goal_pos = find_nearest_standing_position(room, goal_x, goal_y)
     
     # DEBUG: Uncomment to see door position finding
     #import sys
@@ -327,6 +218,18 @@ def astar(room, start, goal, max_jump_horizontal=None, max_jump_vertical=None):
     start_x, start_y = start_pos
     goal_x, goal_y = goal_pos
     
+    # Conservative flood fill: cells outside the mask can't be on a path
+    board = RoomBitboard(room)
+    mask = None
+    if precheck:
+        mask = reachability_mask(room, start_pos, goal_pos, max_jump_horizontal, max_jump_vertical,
+                                 board=board)
+        if mask is None:
+            return None
+    
+    # Jump arcs are checked against the room's bitboards
+    masks = arc_masks(room, board)
+    
     # Initialize open and closed sets
     open_set = []
     closed_set = set()
@@ -364,9 +267,11 @@ def astar(room, start, goal, max_jump_horizontal=None, max_jump_vertical=None):
         closed_set.add((current.x, current.y))
         
         # Explore neighbors
-        for nx, ny, move_cost in get_neighbors(room, current, max_jump_horizontal, max_jump_vertical):
+        for nx, ny, move_cost in get_neighbors(room, current, max_jump_horizontal, max_jump_vertical, masks):
             if (nx, ny) in closed_set:
                 continue
+            if mask is not None and not (mask[ny] >> nx) & 1:
+                continue
             
             # Calculate new g-score
             tentative_g = current.g + move_cost
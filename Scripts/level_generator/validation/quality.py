@@ -10,8 +10,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE, is_slope
 from collections import Counter
+from utils.grid_hash import memoize_by_grid
 
 
+@memoize_by_grid
 def score_room_quality(room, validation_results):
     """
     Comprehensive quality scoring for a room
@@ -0,0 +1,160 @@
+"""
+Bit-parallel reachability pre-check for pathfinding
+
+Floods the room's standing cells from a start position one whole row at
+a time on the bitboard view (utils.bitboard): a row of cells reached is
+smeared sideways with shifts by the widest jump that can land dy rows
+away, then ANDed with the standing cells of that row. Every move A*
+can make (walks, slope steps, jump landings, falls) lies inside these
+envelopes, and the landing-cell rule is the same, so the flood is an
+over-approximation: if it can't reach the goal, A* can't either.
+
+Flooding backwards from the goal as well gives the cells that are both
+reachable and can still reach the goal; A* skips every other cell.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from utils.bitboard import BLOCKING, RoomBitboard
+from utils.movement import jump_vertical_range
+import config
+
+
+def standing_rows(room, board: Optional[RoomBitboard] = None) -> List[int]:
+    """
+    Get the cells a player can stand at (see utils.movement.can_stand_at)
+    
+    Args:
+        room: RoomTemplate
+        board: Optional RoomBitboard of the room
+    
+    Returns:
+        One int per row (bit x set if the player can stand at (x, y))
+    """
+    if board is None:
+        board = RoomBitboard(room)
+    solid = board.rows('ground', 'wall')
+    support = board.rows(*BLOCKING)
+    
+    rows = [0] * room.height
+    # Feet at y, body up to y - (PLAYER_TOTAL_HEIGHT - 1), ground at y + 1
+    first = max(config.PLAYER_HEIGHT, config.PLAYER_TOTAL_HEIGHT - 1)
+    for y in range(first, room.height - 1):
+        body = 0
+        for dy in range(config.PLAYER_TOTAL_HEIGHT):
+            body |= solid[y - dy]
+        rows[y] = support[y + 1] & ~body & board.full
+    return rows
+
+
+def movement_envelope(max_jump_horizontal: int, max_jump_vertical: int) -> Dict[int, int]:
+    """
+    Get the widest horizontal move that can end dy rows away
+    
+    Covers the moves of pathfinding.get_neighbors except straight falls,
+    which can drop any distance.
+    
+    Returns:
+        Dict of dy (negative is up) -> max |dx|
+    """
+    # Walking (level or one step down) and slope steps (level or one up)
+    envelope = {-1: 1, 0: 1, 1: 1}
+    for abs_dx in range(1, max_jump_horizontal + 1):
+        for dy in jump_vertical_range(abs_dx, max_jump_vertical):
+            envelope[dy] = max(envelope.get(dy, 0), abs_dx)
+    return envelope
+
+
+def _spread(bits: int, distance: int, full: int) -> int:
+    """Smear set bits sideways by up to distance columns"""
+    spread = bits
+    for k in range(1, distance + 1):
+        spread |= (bits << k) | (bits >> k)
+    return spread & full
+
+
+def flood_rows(standing: List[int], start: Tuple[int, int], envelope: Dict[int, int],
+               full: int, backward: bool = False) -> List[int]:
+    """
+    Flood the standing cells from a start cell
+    
+    Args:
+        standing: Standing cells per row (standing_rows)
+        start: (x, y) start cell
+        envelope: movement_envelope of the player
+        full: Mask of one whole row
+        backward: Flood against the moves (cells that can reach start)
+    
+    Returns:
+        Cells reached, one int per row
+    """
+    height = len(standing)
+    sign = -1 if backward else 1
+    moves = [(sign * dy, distance) for dy, distance in envelope.items()]
+    
+    start_x, start_y = start
+    reached = [0] * height
+    reached[start_y] = 1 << start_x
+    frontier = {start_y: reached[start_y]}
+    
+    while frontier:
+        y, bits = frontier.popitem()
+        spreads = {}
+        for dy, distance in moves:
+            target_y = y + dy
+            if not 0 <= target_y < height:
+                continue
+            spread = spreads.get(distance)
+            if spread is None:
+                spread = spreads[distance] = _spread(bits, distance, full)
+            new = spread & standing[target_y] & ~reached[target_y]
+            if new:
+                reached[target_y] |= new
+                frontier[target_y] = frontier.get(target_y, 0) | new
+        
+        # Straight falls (straight climbs back up when flooding backward)
+        fall_rows = range(y + 1, height) if not backward else range(y - 1, -1, -1)
+        for target_y in fall_rows:
+            new = bits & standing[target_y] & ~reached[target_y]
+            if new:
+                reached[target_y] |= new
+                frontier[target_y] = frontier.get(target_y, 0) | new
+    
+    return reached
+
+
+def reachability_mask(room, start: Tuple[int, int], goal: Tuple[int, int],
+                      max_jump_horizontal: Optional[int] = None,
+                      max_jump_vertical: Optional[int] = None,
+                      board: Optional[RoomBitboard] = None) -> Optional[List[int]]:
+    """
+    Conservative reachability check between two standing cells
+    
+    Args:
+        room: RoomTemplate
+        start: (x, y) start cell (a standing position)
+        goal: (x, y) goal cell (a standing position)
+        max_jump_horizontal: Max horizontal jump distance (default from config)
+        max_jump_vertical: Max vertical jump height (default from config)
+        board: Optional RoomBitboard of the room
+    
+    Returns:
+        None if the goal is certainly unreachable, otherwise the cells
+        that may lie on a path (one int per row) for pruning the search
+    """
+    if max_jump_horizontal is None:
+        max_jump_horizontal = config.MAX_JUMP_DISTANCE
+    if max_jump_vertical is None:
+        max_jump_vertical = config.MAX_JUMP_HEIGHT
+    
+    if board is None:
+        board = RoomBitboard(room)
+    standing = standing_rows(room, board)
+    envelope = movement_envelope(max_jump_horizontal, max_jump_vertical)
+    
+    forward = flood_rows(standing, start, envelope, board.full)
+    goal_x, goal_y = goal
+    if not (forward[goal_y] >> goal_x) & 1:
+        return None
+    
+    backward = flood_rows(standing, goal, envelope, board.full, backward=True)
+    return [a & b for a, b in zip(forward, backward)]
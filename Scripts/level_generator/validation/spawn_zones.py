@@ -8,7 +8,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE
+from utils.tile_constants import EMPTY, WALL
+from utils.bitboard import BLOCKING, RoomBitboard, bit_runs
 import config
 
 
@@ -41,65 +42,33 @@ def detect_ground_zones(room):
         list: List of ground zone dicts with position and size
     """
     zones = []
+    board = RoomBitboard(room)
+    blocking = board.rows(*BLOCKING)
+    empty = board.rows('empty')
     
     # Scan each horizontal level
     for y in range(room.height - 1):
-        # Check if this row has ground below
-        has_ground_below = False
-        for x in range(room.width):
-            tile_below = room.get_tile(x, y + 1)
-            if tile_below in [GROUND, WALL, PLATFORM_ONEWAY]:
-                has_ground_below = True
-                break
+        # Standing spots: empty tile with ground (not spikes) below
+        safe = empty[y] & blocking[y + 1]
         
-        if not has_ground_below:
-            continue
+        # Check 3-tile headroom (Week 4)
+        # Y=0 is TOP, so we check y-1, y-2 (going upward)
+        for dy in range(1, config.PLAYER_TOTAL_HEIGHT):
+            if y - dy < 0:
+                break  # Top of room is OK
+            safe &= ~blocking[y - dy]
         
-        # Scan for continuous safe sections
-        safe_start = None
-        for x in range(room.width + 1):
-            # Check if current position is safe
-            is_safe = False
-            if x < room.width:
-                tile_at = room.get_tile(x, y)
-                tile_below = room.get_tile(x, y + 1)
-                is_safe = (
-                    tile_at == EMPTY and  # Empty space to stand in
-                    tile_below in [GROUND, WALL, PLATFORM_ONEWAY] and  # Solid below
-                    tile_below != SPIKE  # No spikes
-                )
-                
-                # Check 3-tile headroom (Week 4)
-                # Y=0 is TOP, so we check y-1, y-2 (going upward)
-                if is_safe:
-                    has_headroom = True
-                    for dy in range(config.PLAYER_TOTAL_HEIGHT):
-                        check_y = y - dy  # UPWARD from feet
-                        if check_y < 0:
-                            break  # Top of room is OK
-                        tile_above = room.get_tile(x, check_y)
-                        if tile_above in [GROUND, WALL, PLATFORM_ONEWAY]:
-                            has_headroom = False
-                            break
-                    is_safe = is_safe and has_headroom
-            
-            if is_safe:
-                if safe_start is None:
-                    safe_start = x
-            else:
-                if safe_start is not None:
-                    width = x - safe_start
-                    # Only record zones at least 3 tiles wide
-                    if width >= 3:
-                        zones.append({
-                            'x': safe_start,
-                            'y': y,
-                            'width': width,
-                            'height': 1,
-                            'type': 'ground',
-                            'allowed_enemies': ['light_walker', 'medium_walker', 'heavy_walker']
-                        })
-                    safe_start = None
+        # Continuous safe sections, at least 3 tiles wide
+        for safe_start, width in bit_runs(safe):
+            if width >= 3:
+                zones.append({
+                    'x': safe_start,
+                    'y': y,
+                    'width': width,
+                    'height': 1,
+                    'type': 'ground',
+                    'allowed_enemies': ['light_walker', 'medium_walker', 'heavy_walker']
+                })
     
     return zones
 
@@ -220,32 +189,26 @@ def assign_spawn_zones_to_room(room):
     
     # Add ground zones
     for i, zone in enumerate(zones['ground']):
-        room.spawn_zones['enemies'].append({
-            'id': f'ground_{i}',
-            'position': {'x': zone['x'] + zone['width'] // 2, 'y': zone['y']},
-            'type': 'ground',
-            'size': {'width': zone['width'], 'height': zone['height']},
-            'allowed_enemies': zone['allowed_enemies']
-        })
+        room.add_enemy_zone(
+            zone['x'] + zone['width'] // 2, zone['y'], 'ground',
+            zone['allowed_enemies'], zone_id=f'ground_{i}',
+            size=(zone['width'], zone['height'])
+        )
     
     # Add aerial zones
     for i, zone in enumerate(zones['aerial']):
-        room.spawn_zones['enemies'].append({
-            'id': f'aerial_{i}',
-            'position': {'x': zone['x'] + zone['width'] // 2, 'y': zone['y'] + zone['height'] // 2},
-            'type': 'aerial',
-            'size': {'width': zone['width'], 'height': zone['height']},
-            'allowed_enemies': zone['allowed_enemies']
-        })
+        room.add_enemy_zone(
+            zone['x'] + zone['width'] // 2, zone['y'] + zone['height'] // 2, 'aerial',
+            zone['allowed_enemies'], zone_id=f'aerial_{i}',
+            size=(zone['width'], zone['height'])
+        )
     
     # Add wall zones
     for i, zone in enumerate(zones['wall']):
-        room.spawn_zones['enemies'].append({
-            'id': f'wall_{i}',
-            'position': {'x': zone['x'], 'y': zone['y'] + zone['height'] // 2},
-            'type': 'wall',
-            'size': {'width': zone['width'], 'height': zone['height']},
-            'allowed_enemies': zone['allowed_enemies']
-        })
+        room.add_enemy_zone(
+            zone['x'], zone['y'] + zone['height'] // 2, 'wall',
+            zone['allowed_enemies'], zone_id=f'wall_{i}',
+            size=(zone['width'], zone['height'])
+        )
     
     return zones
@@ -9,6 +9,7 @@ import os
 # Add parent directories to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.movement import can_stand_at
 from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE, is_solid, is_slope
 from validation.pathfinding import astar, has_path
 import config
@@ -157,8 +158,6 @@ def check_reachability_astar(room):
     goal_y = exit_door["position"]["y"]
     
     # Find nearest valid standing position to entrance
-    from validation.pathfinding import can_stand_at
-    
     start = None
     for radius in range(5):
         for dx in range(-radius, radius + 1):
@@ -2,6 +2,10 @@
 Simplified validator for Week 2/3
 
 Shape-aware validation with basic checks + optional A* pathfinding.
+
+The checks work on a bitboard view of the room (utils.bitboard), built
+once per validation: counts, gap runs and spacing are computed per row
+or column with shifts and ANDs instead of per tile.
 """
 import sys
 import os
@@ -9,9 +13,16 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.tile_constants import EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE, is_slope
+from utils.bitboard import BLOCKING, RoomBitboard, bit_runs, popcount
+from utils.grid_hash import memoize_by_grid
 import config
 
+# Tile IDs -> bitboard class names, for count_tiles
+_TILE_CLASS_NAMES = {EMPTY: 'empty', GROUND: 'ground', WALL: 'wall',
+                     PLATFORM_ONEWAY: 'platform', SPIKE: 'spike'}
+
 
+@memoize_by_grid
 def validate_room_simple(room, use_pathfinding=False):
     """
     Validation with optional A* pathfinding
@@ -23,6 +34,9 @@ def validate_room_simple(room, use_pathfinding=False):
     
     Returns:
         dict: Validation results with tier
+    
+    Results are memoized by the room's contents (utils.grid_hash), so
+    validating an identical grid again costs one hash.
     """
     results = {
         "valid": True,
@@ -37,12 +51,14 @@ def validate_room_simple(room, use_pathfinding=False):
         "path_length": 0
     }
     
+    board = RoomBitboard(room)
+    
     # Count tiles
-    results["spike_count"] = count_tiles(room, SPIKE)
-    results["platform_count"] = count_tiles(room, PLATFORM_ONEWAY)
+    results["spike_count"] = count_tiles(room, SPIKE, board)
+    results["platform_count"] = count_tiles(room, PLATFORM_ONEWAY, board)
     
     # Check platform spacing (Week 4)
-    spacing_valid, spacing_errors = check_platform_spacing(room)
+    spacing_valid, spacing_errors = check_platform_spacing(room, board)
     if not spacing_valid:
         results["valid"] = False
         results["tier"] = "IMPOSSIBLE"
@@ -59,17 +75,17 @@ def validate_room_simple(room, use_pathfinding=False):
     
     # Shape-specific validation
     if room.shape_type in ["horizontal_right", "horizontal_left"]:
-        return validate_horizontal(room, results)
+        return validate_horizontal(room, results, board)
     elif room.shape_type in ["vertical_up", "vertical_down"]:
-        return validate_vertical(room, results)
+        return validate_vertical(room, results, board)
     elif room.shape_type == "box":
-        return validate_box(room, results)
+        return validate_box(room, results, board)
     else:
         # Unknown shape, use generic
-        return validate_horizontal(room, results)
+        return validate_horizontal(room, results, board)
 
 
-def check_platform_spacing(room):
+def check_platform_spacing(room, board=None):
     """
     Verify platforms don't violate MIN_PLATFORM_VERTICAL_SPACING
     
@@ -78,56 +94,65 @@ def check_platform_spacing(room):
     
     Args:
         room: RoomTemplate to validate
+        board: Optional RoomBitboard of the room (built if omitted)
     
     Returns:
         tuple: (is_valid: bool, errors: list)
     """
-    errors = []
+    errors = [
+        f"Insufficient vertical spacing at ({x},{y}): "
+        f"only {dy} tiles clearance (need {config.PLAYER_TOTAL_HEIGHT})"
+        for x, y, dy in platform_spacing_violations(room, board)
+    ]
+    return len(errors) == 0, errors
+
+
+def platform_spacing_violations(room, board=None):
+    """
+    Find the platform/ground tiles without enough clearance above
+    
+    Works a column at a time: bit y of a column is row y, so "a solid
+    tile dy rows above" is the column shifted left by dy.
     
-    # Find all platforms and ground tiles
-    solid_positions = set()
-    for y in range(room.height):
-        for x in range(room.width):
-            tile = room.get_tile(x, y)
-            if tile in [GROUND, WALL, PLATFORM_ONEWAY]:
-                solid_positions.add((x, y))
+    Args:
+        room: RoomTemplate to check
+        board: Optional RoomBitboard of the room (built if omitted)
+    
+    Returns:
+        list: (x, y, dy) per tile, where the nearest blocking tile above
+              is dy rows up
+    """
+    if board is None:
+        board = RoomBitboard(room)
+    violations = []
     
-    # Check each solid tile for spacing violations
     # Y=0 is TOP, Y=height-1 is BOTTOM
     # Floor level is typically at Y=height-2 (with wall boundary at height-1)
     floor_level = room.height - 2
     
-    for x, y in solid_positions:
-        tile = room.get_tile(x, y)
-        
-        # Only check spacing for platforms and ground (not walls)
-        if tile not in [GROUND, PLATFORM_ONEWAY]:
-            continue
-        
-        # Skip boundary tiles (floor and walls) - only check interior platforms
-        # Left wall: X=0, Right wall: X=width-1, Floor: Y>=floor_level
-        if x == 0 or x == room.width - 1 or y >= floor_level:
+    # Only interior platforms and ground are checked (not walls, the
+    # boundary columns, or the floor rows)
+    interior_rows = (1 << max(floor_level, 0)) - 1
+    candidates = board.columns('ground', 'platform')
+    blocking = board.columns(*BLOCKING)
+    
+    for x in range(1, room.width - 1):
+        checked = candidates[x] & interior_rows
+        if not checked:
             continue
         
-        # Check if there's a solid tile within PLAYER_TOTAL_HEIGHT above this tile
-        # Player needs PLAYER_TOTAL_HEIGHT (3 tiles) of clearance ABOVE the platform
-        for dy in range(1, config.PLAYER_TOTAL_HEIGHT + 1):
-            check_y = y - dy  # Going UPWARD (toward Y=0)
-            
-            if check_y < 0:
-                break  # Hit top of room, no violation
-            
-            check_tile = room.get_tile(x, check_y)
-            if check_tile in [GROUND, WALL, PLATFORM_ONEWAY]:
-                # Found a solid tile too close above
-                if dy < config.PLAYER_TOTAL_HEIGHT:
-                    errors.append(
-                        f"Insufficient vertical spacing at ({x},{y}): "
-                        f"only {dy} tiles clearance (need {config.PLAYER_TOTAL_HEIGHT})"
-                    )
-                break
-    
-    return len(errors) == 0, errors
+        # The player needs PLAYER_TOTAL_HEIGHT (3 tiles) of clearance ABOVE
+        # the tile: the nearest blocking tile above must be at least that far
+        above = blocking[x]
+        covered = 0
+        for dy in range(1, config.PLAYER_TOTAL_HEIGHT):
+            hits = checked & (above << dy) & ~covered
+            covered |= hits
+            for y, length in bit_runs(hits):
+                for row in range(y, y + length):
+                    violations.append((x, row, dy))
+    
+    return violations
 
 
 def check_pathfinding(room, results):
@@ -176,14 +201,12 @@ def check_pathfinding(room, results):
         return True  # Don't fail room just because pathfinding errored
 
 
-def validate_horizontal(room, results):
+def validate_horizontal(room, results, board=None):
     """Validate horizontal progression rooms"""
+    if board is None:
+        board = RoomBitboard(room)
     floor_y = room.height - 2
-    ground_count = 0
-    for x in range(room.width):
-        tile = room.get_tile(x, floor_y)
-        if tile in [GROUND, PLATFORM_ONEWAY]:
-            ground_count += 1
+    ground_count = popcount(board.rows('ground', 'platform')[floor_y])
     
     results["floor_coverage"] = ground_count / room.width if room.width > 0 else 0
     
@@ -195,7 +218,7 @@ def validate_horizontal(room, results):
         return results
     
     # Check gaps
-    max_gap = check_gaps_at_level(room, floor_y, results)
+    max_gap = check_gaps_at_level(room, floor_y, results, board)
     results["max_gap_width"] = max_gap
     
     if not results["valid"]:
@@ -206,19 +229,13 @@ def validate_horizontal(room, results):
     return results
 
 
-def validate_vertical(room, results):
+def validate_vertical(room, results, board=None):
     """Validate vertical climbing rooms"""
+    if board is None:
+        board = RoomBitboard(room)
     # For vertical rooms, check that there are enough platforms/walls to climb
-    wall_coverage = 0
-    platform_count = 0
-    
-    for y in range(room.height):
-        for x in range(room.width):
-            tile = room.get_tile(x, y)
-            if tile == WALL:
-                wall_coverage += 1
-            elif tile == PLATFORM_ONEWAY:
-                platform_count += 1
+    wall_coverage = board.count('wall')
+    platform_count = board.count('platform')
     
     total_tiles = room.width * room.height
     wall_pct = wall_coverage / total_tiles if total_tiles > 0 else 0
@@ -241,11 +258,13 @@ def validate_vertical(room, results):
     return results
 
 
-def validate_box(room, results):
+def validate_box(room, results, board=None):
     """Validate box arena rooms"""
+    if board is None:
+        board = RoomBitboard(room)
     # For arenas, just check that there are some platforms and it's not too deadly
-    platform_count = count_tiles(room, PLATFORM_ONEWAY)
-    ground_count = count_tiles(room, GROUND)
+    platform_count = board.count('platform')
+    ground_count = board.count('ground')
     
     total_solid = platform_count + ground_count
     total_tiles = room.width * room.height
@@ -266,47 +285,34 @@ def validate_box(room, results):
     return results
 
 
-def check_gaps_at_level(room, y, results):
-    """Check gaps at specific Y level"""
+def check_gaps_at_level(room, y, results, board=None):
+    """Check gaps at specific Y level (runs of empty tiles in the row)"""
+    if board is None:
+        board = RoomBitboard(room)
     max_gap = 0
-    gap_start = None
-    
-    for x in range(room.width + 1):
-        if x < room.width:
-            tile = room.get_tile(x, y)
-            is_gap = tile == EMPTY
-        else:
-            is_gap = False
+    
+    for _, gap_width in bit_runs(board.rows('empty')[y]):
+        max_gap = max(max_gap, gap_width)
         
-        if is_gap:
-            if gap_start is None:
-                gap_start = x
-        else:
-            if gap_start is not None:
-                gap_width = x - gap_start
-                max_gap = max(max_gap, gap_width)
-                
-                if gap_width > config.MAX_JUMP_DISTANCE:
-                    results["valid"] = False
-                    results["tier"] = "IMPOSSIBLE"
-                    results["errors"].append(f"Impossible gap: {gap_width} tiles")
-                    return max_gap
-                elif gap_width >= config.MAX_JUMP_DISTANCE - 1:
-                    results["warnings"].append(f"Challenging gap: {gap_width} tiles")
-                
-                gap_start = None
+        if gap_width > config.MAX_JUMP_DISTANCE:
+            results["valid"] = False
+            results["tier"] = "IMPOSSIBLE"
+            results["errors"].append(f"Impossible gap: {gap_width} tiles")
+            return max_gap
+        elif gap_width >= config.MAX_JUMP_DISTANCE - 1:
+            results["warnings"].append(f"Challenging gap: {gap_width} tiles")
     
     return max_gap
 
 
-def count_tiles(room, tile_type):
+def count_tiles(room, tile_type, board=None):
     """Count tiles of given type"""
-    count = 0
-    for y in range(room.height):
-        for x in range(room.width):
-            if room.get_tile(x, y) == tile_type:
-                count += 1
-    return count
+    name = _TILE_CLASS_NAMES.get(tile_type)
+    if name is None:
+        return room.tile_bytes().count(tile_type)
+    if board is None:
+        board = RoomBitboard(room)
+    return board.count(name)
 
 
 def calculate_tier_simple(results):
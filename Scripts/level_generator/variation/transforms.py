@@ -0,0 +1,179 @@
+"""
+Room transforms - Mirroring and rotation of whole rooms
+
+Transforms work on the packed tile bytes instead of cell by cell:
+- tile IDs are remapped with a 256-entry lookup table (bytes.translate)
+- rows/columns are reordered with slicing
+- connections and spawn zones are remapped in one pass each
+
+Positions are remapped geometrically; the room's shape type and door
+directions are updated to match (e.g. a mirrored horizontal_right room
+becomes a horizontal_left room).
+"""
+from typing import Callable, Dict, List, Tuple
+from utils.room_template import RoomTemplate
+from utils.tile_constants import (
+    SLOPE_UP_RIGHT, SLOPE_UP_LEFT, SLOPE_DOWN_RIGHT, SLOPE_DOWN_LEFT
+)
+
+
+def _make_lut(swaps: Dict[int, int]) -> bytes:
+    """Build a bytes.translate table that swaps the given tile pairs"""
+    table = bytearray(range(256))
+    for a, b in swaps.items():
+        table[a] = b
+        table[b] = a
+    return bytes(table)
+
+
+# Slope orientation under each transform
+MIRROR_H_LUT = _make_lut({SLOPE_UP_RIGHT: SLOPE_UP_LEFT, SLOPE_DOWN_RIGHT: SLOPE_DOWN_LEFT})
+MIRROR_V_LUT = _make_lut({SLOPE_UP_RIGHT: SLOPE_DOWN_RIGHT, SLOPE_UP_LEFT: SLOPE_DOWN_LEFT})
+# A quarter turn is a transpose (which keeps '/' and '\') followed by a mirror
+ROTATE_CW_LUT = MIRROR_H_LUT
+ROTATE_CCW_LUT = MIRROR_V_LUT
+
+MIRROR_H_DIRECTIONS = {"left": "right", "right": "left", "up": "up", "down": "down"}
+MIRROR_V_DIRECTIONS = {"left": "left", "right": "right", "up": "down", "down": "up"}
+ROTATE_CW_DIRECTIONS = {"left": "up", "up": "right", "right": "down", "down": "left"}
+ROTATE_CCW_DIRECTIONS = {"left": "down", "down": "right", "right": "up", "up": "left"}
+
+MIRROR_H_SHAPES = {"horizontal_right": "horizontal_left", "horizontal_left": "horizontal_right"}
+MIRROR_V_SHAPES = {"vertical_up": "vertical_down", "vertical_down": "vertical_up"}
+
+
+def mirror_horizontal(room: RoomTemplate) -> RoomTemplate:
+    """
+    Mirror a room left-right
+    
+    Args:
+        room: Room to mirror (not modified)
+    
+    Returns:
+        New RoomTemplate; horizontal_right/left shapes are swapped
+    """
+    width, height = room.width, room.height
+    flat = room.tile_bytes().translate(MIRROR_H_LUT)
+    rows = [bytearray(flat[y * width:(y + 1) * width][::-1]) for y in range(height)]
+    
+    return _rebuild(room, rows, width, height,
+                    lambda x, y: (width - 1 - x, y),
+                    MIRROR_H_DIRECTIONS,
+                    MIRROR_H_SHAPES.get(room.shape_type, room.shape_type))
+
+
+def mirror_vertical(room: RoomTemplate) -> RoomTemplate:
+    """
+    Mirror a room top-bottom
+    
+    Args:
+        room: Room to mirror (not modified)
+    
+    Returns:
+        New RoomTemplate; vertical_up/down shapes are swapped
+    """
+    width, height = room.width, room.height
+    flat = room.tile_bytes().translate(MIRROR_V_LUT)
+    rows = [bytearray(flat[y * width:(y + 1) * width]) for y in range(height - 1, -1, -1)]
+    
+    return _rebuild(room, rows, width, height,
+                    lambda x, y: (x, height - 1 - y),
+                    MIRROR_V_DIRECTIONS,
+                    MIRROR_V_SHAPES.get(room.shape_type, room.shape_type))
+
+
+def rotate_90(room: RoomTemplate, clockwise: bool = True) -> RoomTemplate:
+    """
+    Rotate a box arena by a quarter turn
+    
+    Width and height are swapped. Only box rooms can be rotated, since the
+    directional shapes are defined by their orientation.
+    
+    Args:
+        room: Box room to rotate (not modified)
+        clockwise: Rotate clockwise (True) or counter-clockwise (False)
+    
+    Returns:
+        New RoomTemplate of size height x width
+    
+    Raises:
+        ValueError: If the room is not a box
+    """
+    if room.shape_type != "box":
+        raise ValueError(f"Only box rooms can be rotated, got {room.shape_type}")
+    
+    width, height = room.width, room.height
+    
+    if clockwise:
+        flat = room.tile_bytes().translate(ROTATE_CW_LUT)
+        # New row y is old column y read bottom to top
+        rows = [bytearray(flat[y::width][::-1]) for y in range(width)]
+        point = lambda x, y: (height - 1 - y, x)
+        directions = ROTATE_CW_DIRECTIONS
+    else:
+        flat = room.tile_bytes().translate(ROTATE_CCW_LUT)
+        # New row y is old column (width - 1 - y) read top to bottom
+        rows = [bytearray(flat[width - 1 - y::width]) for y in range(width)]
+        point = lambda x, y: (y, width - 1 - x)
+        directions = ROTATE_CCW_DIRECTIONS
+    
+    return _rebuild(room, rows, height, width, point, directions, room.shape_type,
+                    swap_size=True)
+
+
+def _rebuild(room: RoomTemplate, rows: List[bytearray], width: int, height: int,
+             point: Callable[[int, int], Tuple[int, int]],
+             directions: Dict[str, str], shape_type: str,
+             swap_size: bool = False) -> RoomTemplate:
+    """
+    Build the transformed room from new rows, remapping doors and zones
+    
+    Args:
+        room: Source room
+        rows: Transformed tile rows
+        width: New width
+        height: New height
+        point: Maps an (x, y) position in the source to the new room
+        directions: Maps door directions in the source to the new room
+        shape_type: Shape type of the new room
+        swap_size: Swap (width, height) of sized spawn zones
+    
+    Returns:
+        New RoomTemplate
+    """
+    result = RoomTemplate.__new__(RoomTemplate)
+    result.id = room.id
+    result.width = width
+    result.height = height
+    result.shape_type = shape_type
+    result.tiles = rows
+    result.metadata = {
+        key: (list(value) if isinstance(value, list) else value)
+        for key, value in room.metadata.items()
+    }
+    
+    connections = {}
+    for name, conn in room.connections.items():
+        x, y = point(conn["position"]["x"], conn["position"]["y"])
+        connections[name] = {
+            "position": {"x": x, "y": y},
+            "direction": directions.get(conn["direction"], conn["direction"]),
+            "type": conn["type"]
+        }
+    result.connections = connections
+    
+    spawn_zones = {}
+    for kind, zones in room.spawn_zones.items():
+        moved = []
+        for zone in zones:
+            x, y = point(zone.x, zone.y)
+            if swap_size and getattr(zone, "size", None) is not None:
+                moved.append(zone._replace(x=x, y=y, size=(zone.size[1], zone.size[0])))
+            else:
+                moved.append(zone._replace(x=x, y=y))
+        spawn_zones[kind] = moved
+    result.spawn_zones = spawn_zones
+    
+    # Validation results describe the untransformed room
+    result.validation = None
+    return result
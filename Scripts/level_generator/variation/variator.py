@@ -2,14 +2,14 @@
 Room variation generator - Creates variations of base templates
 """
 import random
-import copy
 from typing import List
 from utils.room_template import RoomTemplate
+from utils.door_signature import annotate_door_signatures
 from utils.tile_constants import (
     EMPTY, GROUND, WALL, PLATFORM_ONEWAY, SPIKE, 
-    SLOPE_UP_RIGHT, SLOPE_UP_LEFT, SLOPE_DOWN_RIGHT, SLOPE_DOWN_LEFT,
     is_platform, is_hazard, is_slope
 )
+from variation import transforms
 
 
 def swap_platform_positions(room: RoomTemplate, swap_probability: float = 0.3) -> RoomTemplate:
@@ -29,13 +29,13 @@ def swap_platform_positions(room: RoomTemplate, swap_probability: float = 0.3) -
     Returns:
         New room template with swapped platforms
     """
-    variant = room.copy()
+    variant = room.derive()
     
     # Find all platform positions
     platforms = []
     for y in range(room.height):
         for x in range(room.width):
-            if is_platform(room.tiles[y][x]):
+            if is_platform(room.get_tile(x, y)):
                 platforms.append((x, y))
     
     if len(platforms) < 2:
@@ -59,10 +59,10 @@ def swap_platform_positions(room: RoomTemplate, swap_probability: float = 0.3) -
             x2, y2 = random.choice(candidates)
             
             # Swap the platforms
-            variant.tiles[y1][x1] = EMPTY
-            variant.tiles[y2][x2] = EMPTY
-            variant.tiles[y2][x1] = PLATFORM_ONEWAY
-            variant.tiles[y1][x2] = PLATFORM_ONEWAY
+            variant.set_tile(x1, y1, EMPTY)
+            variant.set_tile(x2, y2, EMPTY)
+            variant.set_tile(x1, y2, PLATFORM_ONEWAY)
+            variant.set_tile(x2, y1, PLATFORM_ONEWAY)
             
             swapped.add((x1, y1))
             swapped.add((x2, y2))
@@ -86,29 +86,29 @@ def substitute_obstacles(room: RoomTemplate, substitution_rate: float = 0.4) ->
     Returns:
         New room template with substituted obstacles
     """
-    variant = room.copy()
+    variant = room.derive()
     
     # Find all spikes
     spikes = []
     for y in range(room.height):
         for x in range(room.width):
-            if variant.tiles[y][x] == SPIKE:
+            if variant.get_tile(x, y) == SPIKE:
                 spikes.append((x, y))
     
     # Find potential spike locations (empty spaces on ground/platform)
     empty_on_ground = []
     for y in range(1, room.height):
         for x in range(room.width):
-            if variant.tiles[y][x] == EMPTY:
+            if variant.get_tile(x, y) == EMPTY:
                 # Check if there's solid ground below
-                below = variant.tiles[y-1][x] if y > 0 else EMPTY
+                below = variant.get_tile(x, y - 1) if y > 0 else EMPTY
                 if below in [GROUND, WALL, PLATFORM_ONEWAY]:
                     empty_on_ground.append((x, y))
     
     # Remove some spikes
     spikes_to_remove = random.sample(spikes, min(len(spikes), int(len(spikes) * substitution_rate)))
     for x, y in spikes_to_remove:
-        variant.tiles[y][x] = EMPTY
+        variant.set_tile(x, y, EMPTY)
     
     # Add some new spikes
     spikes_to_add = random.sample(
@@ -116,7 +116,7 @@ def substitute_obstacles(room: RoomTemplate, substitution_rate: float = 0.4) ->
         min(len(empty_on_ground), int(len(spikes_to_remove) * 0.7))  # Add fewer than removed
     )
     for x, y in spikes_to_add:
-        variant.tiles[y][x] = SPIKE
+        variant.set_tile(x, y, SPIKE)
     
     return variant
 
@@ -130,57 +130,16 @@ def mirror_horizontal(room: RoomTemplate) -> RoomTemplate:
     - Reverse slope orientations appropriately
     - Update door connections (entrance <-> exit positions)
     
+    The flip itself is done by variation.transforms (lookup-table remap
+    and row slicing).
+    
     Args:
         room: Base room template
     
     Returns:
         New room template mirrored horizontally
     """
-    variant = room.copy()
-    
-    # Create mirrored tilemap
-    mirrored_tiles = []
-    for y in range(room.height):
-        row = []
-        for x in range(room.width - 1, -1, -1):  # Iterate backwards
-            tile = room.tiles[y][x]
-            
-            # Flip slope orientations
-            if tile == SLOPE_UP_RIGHT:
-                tile = SLOPE_UP_LEFT
-            elif tile == SLOPE_UP_LEFT:
-                tile = SLOPE_UP_RIGHT
-            elif tile == SLOPE_DOWN_RIGHT:
-                tile = SLOPE_DOWN_LEFT
-            elif tile == SLOPE_DOWN_LEFT:
-                tile = SLOPE_DOWN_RIGHT
-            
-            row.append(tile)
-        mirrored_tiles.append(row)
-    
-    variant.tiles = mirrored_tiles
-    
-    # Update door connections
-    new_connections = {}
-    for name, conn in room.connections.items():
-        new_x = room.width - 1 - conn["position"]["x"]
-        new_direction = conn["direction"]
-        
-        # Flip horizontal directions
-        if new_direction == "left":
-            new_direction = "right"
-        elif new_direction == "right":
-            new_direction = "left"
-        
-        new_connections[name] = {
-            "position": {"x": new_x, "y": conn["position"]["y"]},
-            "direction": new_direction,
-            "type": conn["type"]
-        }
-    
-    variant.connections = new_connections
-    
-    return variant
+    return transforms.mirror_horizontal(room)
 
 
 def shift_vertical(room: RoomTemplate, max_shift: int = 2) -> RoomTemplate:
@@ -199,13 +158,13 @@ def shift_vertical(room: RoomTemplate, max_shift: int = 2) -> RoomTemplate:
     Returns:
         New room template with shifted elements
     """
-    variant = room.copy()
+    variant = room.derive()
     
     # Find all platforms
     platforms = []
     for y in range(1, room.height):  # Don't shift ground floor
         for x in range(room.width):
-            if is_platform(variant.tiles[y][x]):
+            if is_platform(variant.get_tile(x, y)):
                 platforms.append((x, y))
     
     # Shift random platforms
@@ -214,9 +173,9 @@ def shift_vertical(room: RoomTemplate, max_shift: int = 2) -> RoomTemplate:
             shift = random.randint(-max_shift, max_shift)
             new_y = max(1, min(room.height - 1, y + shift))
             
-            if new_y != y and variant.tiles[new_y][x] == EMPTY:
-                variant.tiles[y][x] = EMPTY
-                variant.tiles[new_y][x] = PLATFORM_ONEWAY
+            if new_y != y and variant.get_tile(x, new_y) == EMPTY:
+                variant.set_tile(x, y, EMPTY)
+                variant.set_tile(x, new_y, PLATFORM_ONEWAY)
     
     return variant
 
@@ -237,7 +196,7 @@ def add_random_noise(room: RoomTemplate, noise_level: float = 0.05) -> RoomTempl
     Returns:
         New room template with noise added
     """
-    variant = room.copy()
+    variant = room.derive()
     
     total_tiles = room.width * room.height
     modifications = int(total_tiles * noise_level)
@@ -246,16 +205,16 @@ def add_random_noise(room: RoomTemplate, noise_level: float = 0.05) -> RoomTempl
         x = random.randint(0, room.width - 1)
         y = random.randint(1, room.height - 1)  # Don't modify ground floor
         
-        current = variant.tiles[y][x]
+        current = variant.get_tile(x, y)
         
         # Small random changes
         if current == EMPTY and random.random() < 0.3:
             # Maybe add a platform
-            if y > 0 and variant.tiles[y-1][x] == EMPTY:
-                variant.tiles[y][x] = PLATFORM_ONEWAY
+            if y > 0 and variant.get_tile(x, y - 1) == EMPTY:
+                variant.set_tile(x, y, PLATFORM_ONEWAY)
         elif current == SPIKE and random.random() < 0.5:
             # Maybe remove spike
-            variant.tiles[y][x] = EMPTY
+            variant.set_tile(x, y, EMPTY)
     
     return variant
 
@@ -270,6 +229,11 @@ def generate_variations(base_room: RoomTemplate, count: int = 5,
     - Combine techniques randomly
     - Ensure each variation is unique
     
+    Variants are copy-on-write (see RoomTemplate.derive): they share the
+    base room's tiles and only store the cells they change, so base_room
+    must not be modified while the variations are in use. Door signatures
+    are recomputed for each variant, since edits can change a door's landing.
+    
     Args:
         base_room: Base template to create variations from
         count: Number of variations to generate
@@ -295,7 +259,7 @@ def generate_variations(base_room: RoomTemplate, count: int = 5,
     }
     
     for i in range(count):
-        variant = base_room.copy()
+        variant = base_room.derive()
         
         # Randomly select variation type
         if 'combined' in variation_types and random.random() < 0.3:
@@ -313,8 +277,9 @@ def generate_variations(base_room: RoomTemplate, count: int = 5,
                 variant = variation_funcs[var_type](variant)
         
         # Update metadata
-        variant.metadata['tags'] = variant.metadata.get('tags', []) + [f'variation_{i+1}']
+        variant.add_tag(f'variation_{i+1}')
         variant.id = variant._generate_id()  # New unique ID
+        annotate_door_signatures(variant)
         
         variations.append(variant)
     
@@ -332,17 +297,18 @@ def create_difficulty_variant(base_room: RoomTemplate, target_difficulty: str) -
     Returns:
         Room template adjusted for target difficulty
     """
-    variant = base_room.copy()
+    variant = base_room.derive()
     
     if target_difficulty == 'EASY':
         # Remove spikes, add platforms
         for y in range(variant.height):
             for x in range(variant.width):
-                if variant.tiles[y][x] == SPIKE:
-                    variant.tiles[y][x] = EMPTY
+                if variant.get_tile(x, y) == SPIKE:
+                    variant.set_tile(x, y, EMPTY)
     
     elif target_difficulty == 'EXPERT':
         # Add more spikes, remove some platforms
         variant = substitute_obstacles(variant, substitution_rate=0.6)
     
+    annotate_door_signatures(variant)
     return variant
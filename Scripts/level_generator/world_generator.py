@@ -4,13 +4,19 @@ World structure generator for multi-level generation
 Generates complete worlds with difficulty progression and thematic variety.
 """
 import random
-from typing import List, Dict, Any
-from generators.room_generator import generate_room
+from typing import List, Dict, Any, Iterator, Set, Tuple
+from generators.room_generator import VALID_BY_CONSTRUCTION, generate_room
+from generators.room_repair import repair_room
 from validation.validator_simple import validate_room_simple
 from validation.quality import score_room_quality
 from validation.spawn_zones import assign_spawn_zones_to_room
-from entities.enemy_placer import place_enemies, get_enemy_distribution_stats
+from validation.hierarchical import blocked_level, world_route
+from entities.enemy_placer import place_enemies, apply_enemy_theme, get_enemy_distribution_stats
 from entities.obstacle_placer import place_obstacles, add_save_point, get_obstacle_distribution_stats
+from curation.assembly_index import AssemblyIndex
+from utils.door_signature import DoorSignature, door_signature
+from utils.world_layout import OccupancyIndex, Rect, chain_positions, level_positions, next_room_position
+import config
 
 
 class LevelConfig:
@@ -29,7 +35,10 @@ class LevelConfig:
         obstacle_theme: str = 'mixed',
         obstacle_density: str = 'normal',
         enemy_density: float = 1.0,
-        include_save_point: bool = False
+        include_save_point: bool = False,
+        extra_doors: Dict[str, str] = None,
+        enemy_theme: str = 'balanced',
+        quality_attempts: int = 10
     ):
         self.level_id = level_id
         self.difficulty = max(1, min(10, difficulty))
@@ -43,6 +52,13 @@ class LevelConfig:
         self.obstacle_density = obstacle_density
         self.enemy_density = enemy_density
         self.include_save_point = include_save_point
+        self.extra_doors = extra_doors or {}  # Box only: door name -> direction
+        self.enemy_theme = enemy_theme
+        self.quality_attempts = max(1, quality_attempts)  # Room generation attempts
+
+
+# Obstacle themes cycled through when a world doesn't choose its own
+DEFAULT_OBSTACLE_THEMES = ['platforming', 'hazards', 'mixed', 'combat']
 
 
 class WorldConfig:
@@ -56,13 +72,21 @@ class WorldConfig:
         horizontal_vertical_ratio: float = 0.5,
         slope_count: int = 2,
         max_elevation_change: int = 8,
-        predominance: str = None  # Deprecated, use horizontal_vertical_ratio instead
+        predominance: str = None,  # Deprecated, use horizontal_vertical_ratio instead
+        obstacle_themes: List[str] = None,
+        enemy_theme: str = 'balanced',
+        save_point_frequency: int = 3,
+        quality_attempts: int = 10
     ):
         self.world_name = world_name
         self.level_count = level_count
         self.difficulty_curve = difficulty_curve
         self.slope_count = max(0, slope_count)  # Number of slopes in horizontal rooms
         self.max_elevation_change = max(0, max_elevation_change)  # Max elevation change in tiles
+        self.obstacle_themes = list(obstacle_themes or DEFAULT_OBSTACLE_THEMES)  # Cycled per level
+        self.enemy_theme = enemy_theme
+        self.save_point_frequency = max(0, save_point_frequency)  # Every Nth level (0 = first only)
+        self.quality_attempts = max(1, quality_attempts)  # Room generation attempts per level
         
         # Support both new ratio system and old predominance system
         if predominance is not None:
@@ -286,10 +310,9 @@ def generate_level_config(
     
     size = select_size_for_difficulty(difficulty, shape)
     
-    # Select theme based on difficulty and variety
-    themes = ['platforming', 'hazards', 'mixed', 'combat']
-    theme_index = level_index % len(themes)
-    obstacle_theme = themes[theme_index]
+    # Cycle through the world's obstacle themes for variety
+    themes = world_config.obstacle_themes
+    obstacle_theme = themes[level_index % len(themes)]
     
     # Density increases with difficulty
     if difficulty <= 3:
@@ -302,8 +325,9 @@ def generate_level_config(
     # Enemy density also scales
     enemy_density = 0.7 + (difficulty / 10.0) * 0.6  # 0.7 to 1.3
     
-    # Save points every 3 levels
-    include_save_point = (level_index + 1) % 3 == 0 or level_index == 0
+    # Save point in the first level and every Nth level after
+    frequency = world_config.save_point_frequency
+    include_save_point = level_index == 0 or (frequency > 0 and (level_index + 1) % frequency == 0)
     
     level_id = f"{world_config.world_name}_L{level_index+1:02d}"
     
@@ -319,30 +343,155 @@ def generate_level_config(
         obstacle_theme=obstacle_theme,
         obstacle_density=density,
         enemy_density=enemy_density,
-        include_save_point=include_save_point
+        include_save_point=include_save_point,
+        enemy_theme=world_config.enemy_theme,
+        quality_attempts=world_config.quality_attempts
     )
     
     return level_config, actual_exit_dir
 
 
+def level_dimensions(level_config: LevelConfig) -> Tuple[int, int]:
+    """Get the (width, height) a level's room will be generated with"""
+    return config.SIZE_DIMENSIONS[level_config.shape_type][level_config.size]
+
+
+def level_exit_dir(level_config: LevelConfig) -> str:
+    """Get the side a level's exit door will be on"""
+    if level_config.shape_type == 'box':
+        return level_config.exit_dir
+    return {
+        'horizontal_right': 'right',
+        'horizontal_left': 'left',
+        'vertical_up': 'up',
+        'vertical_down': 'down'
+    }.get(level_config.shape_type, 'right')
+
+
+def solve_world_layout(
+    world_config: WorldConfig,
+    candidates_per_level: int = 6,
+    max_backtracks: int = None
+) -> List[Tuple[LevelConfig, Rect]]:
+    """
+    Choose level configs whose rooms can be laid out without overlapping
+    
+    Levels are placed one at a time from a few configs drawn with
+    generate_level_config. A config whose room would overlap an earlier
+    room (checked against an OccupancyIndex) is rejected; when every
+    candidate of a level is rejected, the previous level is backtracked to
+    its next candidate. Only configs are chosen here, so backtracking is
+    cheap - rooms are generated afterwards.
+    
+    Args:
+        world_config: World configuration
+        candidates_per_level: Distinct configs drawn per level
+        max_backtracks: Backtracking budget (default: 50 per level)
+    
+    Returns:
+        (LevelConfig, room rectangle) per level, in level order
+    
+    Raises:
+        ValueError: If no overlap-free layout is found within the budget
+    """
+    if max_backtracks is None:
+        max_backtracks = 50 * world_config.level_count
+    
+    index = OccupancyIndex()
+    placed: List[Tuple[LevelConfig, str, Rect]] = []  # (config, exit_dir, rect)
+    candidates: List[List[Tuple[LevelConfig, str]]] = []
+    backtracks = 0
+    
+    # Backtracking one level at a time cannot climb out of a pocket the
+    # chain has walled itself into, so a run of backtracks without new
+    # progress jumps back further (doubling) and redraws from there
+    deepest = 0
+    stalled = 0
+    jump = 4
+    stall_limit = candidates_per_level * 8
+    
+    while len(placed) < world_config.level_count:
+        level_index = len(placed)
+        
+        if len(candidates) == level_index:
+            # Draw this level's candidates, in the order they were drawn
+            prev_config, prev_exit, _ = placed[-1] if placed else (None, None, None)
+            prev_shape = prev_config.shape_type if prev_config else None
+            drawn = {}
+            for _ in range(candidates_per_level if placed else 1):
+                level_config, exit_dir = generate_level_config(level_index, world_config, prev_exit, prev_shape)
+                key = (level_config.shape_type, level_config.entrance_dir, exit_dir, level_config.size)
+                drawn.setdefault(key, (level_config, exit_dir))
+            candidates.append(list(reversed(drawn.values())))
+        
+        level_candidates = candidates[level_index]
+        while level_candidates:
+            level_config, exit_dir = level_candidates.pop()
+            width, height = level_dimensions(level_config)
+            if placed:
+                _, prev_exit, prev_rect = placed[-1]
+                x, y = next_room_position(prev_rect, prev_exit, width, height)
+            else:
+                x, y = 0, 0
+            rect = (x, y, width, height)
+            
+            if index.find_overlap(rect) is None:
+                index.add(level_index, rect)
+                placed.append((level_config, exit_dir, rect))
+                if len(placed) > deepest:
+                    deepest, stalled, jump = len(placed), 0, 4
+                break
+        else:
+            # Dead end: retry an earlier level with its next candidate
+            candidates.pop()
+            backtracks += 1
+            stalled += 1
+            if not placed or backtracks > max_backtracks:
+                raise ValueError(f"No overlap-free layout found for {world_config.world_name} "
+                                 f"({world_config.level_count} levels)")
+            
+            if stalled > stall_limit and len(placed) > 1:
+                # Jump: every level jumped over is redrawn from scratch
+                for _ in range(min(jump, len(placed) - 1)):
+                    candidates.pop()
+                    index.remove(len(placed) - 1)
+                    placed.pop()
+                jump *= 2
+                stalled = 0
+            else:
+                index.remove(len(placed) - 1)
+                placed.pop()
+    
+    return [(level_config, rect) for level_config, _, rect in placed]
+
+
 def generate_populated_room(
     level_config: LevelConfig,
-    max_attempts: int = 10
+    max_attempts: int = None
 ) -> Dict[str, Any]:
     """
     Generate a room with enemies and obstacles
     
+    Rooms that fail validation are patched in place first (see
+    generators.room_repair) and only dropped if they still fail.
+    
     Args:
         level_config: Level configuration
         max_attempts: Max attempts to generate valid room
+                      (default: level_config.quality_attempts)
     
     Returns:
         Dict with room, validation, quality, entities
     """
-    best_room = None
+    if max_attempts is None:
+        max_attempts = level_config.quality_attempts
+    
+    best = None
     best_quality = 0
+    attempts = 0
     
     for attempt in range(max_attempts):
+        attempts += 1
         # Generate base room
         room = generate_room(
             level_config.shape_type,
@@ -352,10 +501,15 @@ def generate_populated_room(
             entrance_dir=level_config.entrance_dir,
             exit_dir=level_config.exit_dir,
             slope_count=level_config.slope_count,
-            max_elevation_change=level_config.max_elevation_change
+            max_elevation_change=level_config.max_elevation_change,
+            extra_doors=level_config.extra_doors
         )
         
-        # Validate
+        # Patch local problems, then validate (horizontal rooms are built
+        # valid, so they skip the repairs; validation still gives the tier).
+        # The repairs recheck their own violations; one full bitboard
+        # validation afterwards costs less than the repairs themselves
+        repairs = [] if level_config.shape_type in VALID_BY_CONSTRUCTION else repair_room(room)
         validation = validate_room_simple(room, use_pathfinding=False)
         
         if not validation['valid']:
@@ -368,29 +522,55 @@ def generate_populated_room(
         quality = score_room_quality(room, validation)
         
         # Keep best
-        if quality['overall'] > best_quality:
+        if best is None or quality['overall'] > best_quality:
             best_quality = quality['overall']
-            best_room = room
+            best = (room, validation, quality, repairs)
         
         # If we got a good one, use it
         if quality['overall'] >= 6.0:
             break
     
-    if best_room is None:
+    if best is None:
         # Fallback to last attempt even if poor quality
-        best_room = room
-        validation = validate_room_simple(best_room, use_pathfinding=False)
-        quality = score_room_quality(best_room, validation)
+        validation = validate_room_simple(room, use_pathfinding=False)
+        quality = score_room_quality(room, validation)
+        best = (room, validation, quality, repairs)
     
+    room, validation, quality, repairs = best
+    level_data = populate_level(level_config, room, validation, quality)
+    level_data['stats']['attempts'] = attempts
+    level_data['stats']['repairs'] = repairs
+    return level_data
+
+
+def populate_level(
+    level_config: LevelConfig,
+    room,
+    validation: Dict[str, Any],
+    quality: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Place enemies, obstacles and save point in a finished room
+    
+    Args:
+        level_config: Level configuration
+        room: RoomTemplate with spawn zones assigned
+        validation: Room validation results
+        quality: Room quality scores
+    
+    Returns:
+        Dict with room, validation, quality, entities
+    """
     # Place entities
     enemies = place_enemies(
-        best_room,
+        room,
         level_config.difficulty,
         level_config.enemy_density
     )
+    enemies = apply_enemy_theme(enemies, level_config.enemy_theme)
     
     obstacles = place_obstacles(
-        best_room,
+        room,
         level_config.difficulty,
         level_config.obstacle_theme,
         level_config.obstacle_density
@@ -399,12 +579,12 @@ def generate_populated_room(
     # Add save point if needed
     save_point = None
     if level_config.include_save_point:
-        save_point = add_save_point(best_room)
+        save_point = add_save_point(room)
     
     # Package results
     result = {
         'level_id': level_config.level_id,
-        'room': best_room,
+        'room': room,
         'validation': validation,
         'quality': quality,
         'entities': {
@@ -426,16 +606,85 @@ def generate_populated_room(
     return result
 
 
-def generate_world(world_config: WorldConfig, verbose: bool = True) -> List[Dict[str, Any]]:
+def assemble_populated_room(
+    level_config: LevelConfig,
+    library: AssemblyIndex,
+    used: Set[str] = None,
+    after: DoorSignature = None
+) -> Dict[str, Any]:
     """
-    Generate a complete world with multiple levels
+    Populate a room picked from a template library
+    
+    Falls back to generate_populated_room when no library room fits the
+    level (or the level needs extra doors, which library rooms don't have).
+    
+    Args:
+        level_config: Level configuration
+        library: Assembly index over the template library
+        used: Template ids already used in this world (updated)
+        after: Door signature of the previous level's exit; rooms whose
+               entrance lines up with it are preferred
+    
+    Returns:
+        Dict with room, validation, quality, entities; stats['source'] is
+        'library' or 'generated'
+    """
+    picked = None
+    if not level_config.extra_doors:
+        picked = library.select(
+            level_config.shape_type,
+            level_config.entrance_dir,
+            level_exit_dir(level_config),
+            level_config.difficulty,
+            level_config.size,
+            exclude=used,
+            after=after
+        )
+    
+    if picked is None:
+        level_data = generate_populated_room(level_config)
+        level_data['stats']['source'] = 'generated'
+        return level_data
+    
+    room, validation, quality = picked
+    if validation is None:
+        validation = validate_room_simple(room, use_pathfinding=False)
+    if not room.spawn_zones.get('enemies'):
+        assign_spawn_zones_to_room(room)
+    if quality is None:
+        quality = score_room_quality(room, validation)
+    
+    level_data = populate_level(level_config, room, validation, quality)
+    level_data['stats']['source'] = 'library'
+    return level_data
+
+
+def iter_world(
+    world_config: WorldConfig,
+    verbose: bool = False,
+    library: AssemblyIndex = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate a world one level at a time
+    
+    Level configs and room positions are planned up front with
+    solve_world_layout (a few small objects per level). Each populated
+    room is then yielded as soon as it is ready and not kept, so memory use
+    does not grow with the rooms of earlier levels. Stop iterating to stop
+    generating.
+    
+    With a library, rooms are picked from it (see assemble_populated_room)
+    and only generated when nothing fits, so a world is mostly index
+    lookups plus entity placement.
     
     Args:
         world_config: World configuration
         verbose: Print progress messages
+        library: Assembly index over a template library (default: generate
+                 every room)
     
-    Returns:
-        List of level dicts
+    Yields:
+        Level dicts, in level order
     """
     if verbose:
         print("=" * 60)
@@ -447,35 +696,53 @@ def generate_world(world_config: WorldConfig, verbose: bool = True) -> List[Dict
         print(f"Horizontal/Vertical: {100-ratio_pct}%/{ratio_pct}%")
         print()
     
-    levels = []
-    prev_shape = None
-    prev_exit_dir = None  # Track exit direction for connection matching
+    # Plan all level configs first so rooms never overlap on the world map
+    layout = solve_world_layout(world_config)
+    used_templates = set()
+    prev_exit = None
     
-    for i in range(world_config.level_count):
+    for i, (level_config, rect) in enumerate(layout):
         if verbose:
             print(f"Generating Level {i+1}/{world_config.level_count}...", end=' ')
         
-        # Generate level config with direction tracking
-        level_config, exit_dir = generate_level_config(
-            i, 
-            world_config, 
-            prev_exit_dir, 
-            prev_shape
-        )
-        
-        # Generate populated room
-        level_data = generate_populated_room(level_config)
-        
-        levels.append(level_data)
-        prev_shape = level_config.shape_type
-        prev_exit_dir = exit_dir  # Track for next iteration
+        # Pick or generate populated room
+        if library is not None:
+            level_data = assemble_populated_room(level_config, library, used_templates, prev_exit)
+            prev_exit = door_signature(level_data['room'], 'exit')
+        else:
+            level_data = generate_populated_room(level_config)
+        level_data['position'] = {'x': rect[0], 'y': rect[1]}
         
         if verbose:
             stats = level_data['stats']
-            print(f"✓ {stats['shape']} (Diff {stats['difficulty']}, "
+            source = " [library]" if stats.get('source') == 'library' else ""
+            print(f"✓ {stats['shape']}{source} (Diff {stats['difficulty']}, "
                   f"Quality {stats['quality_score']:.1f}, "
                   f"{stats['enemy_count']} enemies, "
                   f"{stats['obstacle_count']} obstacles)")
+        
+        yield level_data
+
+
+def generate_world(
+    world_config: WorldConfig,
+    verbose: bool = True,
+    library: AssemblyIndex = None
+) -> List[Dict[str, Any]]:
+    """
+    Generate a complete world with multiple levels
+    
+    Holds every level in memory; use iter_world to stream levels instead.
+    
+    Args:
+        world_config: World configuration
+        verbose: Print progress messages
+        library: Assembly index to pick rooms from (see iter_world)
+    
+    Returns:
+        List of level dicts
+    """
+    levels = list(iter_world(world_config, verbose=verbose, library=library))
     
     if verbose:
         print()
@@ -484,6 +751,290 @@ def generate_world(world_config: WorldConfig, verbose: bool = True) -> List[Dict
     return levels
 
 
+def generate_world_graph(
+    world_config: WorldConfig,
+    branch_count: int = 2,
+    branch_length: Tuple[int, int] = (2, 3),
+    max_branch_attempts: int = 20,
+    candidates_per_room: int = 6,
+    verbose: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Generate a world whose path branches and rejoins
+    
+    The main path is laid out as in generate_world. Each branch then leaves
+    a box arena on the main path through an extra door ('exit_2', ...),
+    runs a few rooms chained with select_next_level_shape_and_directions,
+    and comes back into a later box arena through another extra door
+    ('entrance_2', ...). The last branch room sits right against that box,
+    whose new door faces the branch's exit, so linked doors always meet.
+    
+    Branch rooms are placed like solve_world_layout places levels: a few
+    configs are drawn per room, those overlapping other rooms (checked
+    against an OccupancyIndex) are rejected, and the chain backtracks until
+    it ends next to a later box with that side free. An attempt that finds
+    no such chain counts against max_branch_attempts; a branch that runs
+    out of attempts is skipped.
+    
+    Args:
+        world_config: World configuration
+        branch_count: Number of branches to add
+        branch_length: (min, max) rooms per branch
+        max_branch_attempts: Placement attempts (fork and door picks) per branch
+        candidates_per_room: Distinct configs drawn per branch room
+        verbose: Print progress messages
+    
+    Returns:
+        Level dicts: the main path in order, then each branch's rooms.
+        Every level has 'links' (its outgoing doors, see utils.world_graph)
+        and 'branch' (None on the main path, else the branch number).
+    """
+    layout = solve_world_layout(world_config)
+    configs = [level_config for level_config, _ in layout]
+    rects = [rect for _, rect in layout]
+    
+    index = OccupancyIndex()
+    for i, rect in enumerate(rects):
+        index.add(('main', i), rect)
+    
+    def free_sides(i: int) -> List[str]:
+        level_config = configs[i]
+        used = {level_config.entrance_dir, level_config.exit_dir} | set(level_config.extra_doors.values())
+        return [side for side in ('left', 'right', 'up', 'down') if side not in used]
+    
+    def extra_door_name(i: int, kind: str) -> str:
+        count = sum(1 for name in configs[i].extra_doors if name.startswith(kind))
+        return f"{kind}_{count + 2}"
+    
+    opposite_dir = {
+        'left': 'right',
+        'right': 'left',
+        'up': 'down',
+        'down': 'up'
+    }
+    
+    boxes = [i for i, level_config in enumerate(configs) if level_config.shape_type == 'box']
+    branches = []  # (fork index, fork door, rejoin index, rejoin door, [(config, rect)])
+    
+    def find_rejoin(fork: int, rect: Rect, exit_dir: str):
+        """Get a later box this room's exit leads straight into, or None"""
+        for j in boxes:
+            if j > fork and opposite_dir[exit_dir] in free_sides(j):
+                x, y, width, height = rects[j]
+                if next_room_position(rect, exit_dir, width, height) == (x, y):
+                    return j
+        return None
+    
+    def extend(fork: int, branch: int, rooms: list, prev_exit: str, prev_shape: str, prev_rect: Rect):
+        """Chain branch rooms depth-first until one exits into a later box (its index, or None)"""
+        k = len(rooms)
+        if k >= branch_length[0]:
+            rejoin = find_rejoin(fork, prev_rect, prev_exit)
+            if rejoin is not None:
+                return rejoin
+        if k >= branch_length[1]:
+            return None
+        
+        drawn = {}
+        for _ in range(candidates_per_room):
+            level_config, exit_dir = generate_level_config(fork, world_config, prev_exit, prev_shape)
+            key = (level_config.shape_type, level_config.entrance_dir, exit_dir, level_config.size)
+            drawn.setdefault(key, (level_config, exit_dir))
+        
+        for level_config, exit_dir in drawn.values():
+            width, height = level_dimensions(level_config)
+            x, y = next_room_position(prev_rect, prev_exit, width, height)
+            rect = (x, y, width, height)
+            if index.find_overlap(rect) is not None:
+                continue
+            index.add(('branch', branch, k), rect)
+            rooms.append((level_config, rect))
+            rejoin = extend(fork, branch, rooms, exit_dir, level_config.shape_type, rect)
+            if rejoin is not None:
+                return rejoin
+            rooms.pop()
+            index.remove(('branch', branch, k))
+        return None
+    
+    for branch in range(1, branch_count + 1):
+        for attempt in range(max_branch_attempts):
+            forks = [i for i in boxes if free_sides(i) and any(j > i and free_sides(j) for j in boxes)]
+            if not forks:
+                break
+            fork = random.choice(forks)
+            side = random.choice(free_sides(fork))
+            
+            # Chain the branch rooms out of the fork's new door
+            rooms = []
+            rejoin = extend(fork, branch, rooms, side, 'box', rects[fork])
+            if rejoin is None:
+                continue
+            
+            for k, (level_config, _) in enumerate(rooms):
+                level_config.level_id = f"{configs[fork].level_id}_B{branch}_{k + 1}"
+                level_config.include_save_point = False
+            fork_door = extra_door_name(fork, 'exit')
+            configs[fork].extra_doors[fork_door] = side
+            rejoin_door = extra_door_name(rejoin, 'entrance')
+            configs[rejoin].extra_doors[rejoin_door] = opposite_dir[level_exit_dir(rooms[-1][0])]
+            branches.append((fork, fork_door, rejoin, rejoin_door, rooms))
+            break
+    
+    if verbose:
+        print(f"World graph: {len(configs)} main levels, {len(branches)} branches")
+    
+    # Generate the rooms and link their doors
+    levels = []
+    for i, (level_config, rect) in enumerate(zip(configs, rects)):
+        level_data = generate_populated_room(level_config)
+        level_data['position'] = {'x': rect[0], 'y': rect[1]}
+        level_data['branch'] = None
+        level_data['links'] = []
+        if i + 1 < len(configs):
+            level_data['links'].append({'door': 'exit', 'to': configs[i + 1].level_id, 'to_door': 'entrance'})
+        levels.append(level_data)
+    
+    for branch, (fork, fork_door, rejoin, rejoin_door, rooms) in enumerate(branches, 1):
+        levels[fork]['links'].append({'door': fork_door, 'to': rooms[0][0].level_id, 'to_door': 'entrance'})
+        for k, (level_config, rect) in enumerate(rooms):
+            level_data = generate_populated_room(level_config)
+            level_data['position'] = {'x': rect[0], 'y': rect[1]}
+            level_data['branch'] = branch
+            if k + 1 < len(rooms):
+                link = {'door': 'exit', 'to': rooms[k + 1][0].level_id, 'to_door': 'entrance'}
+            else:
+                link = {'door': 'exit', 'to': configs[rejoin].level_id, 'to_door': rejoin_door}
+            level_data['links'] = [link]
+            levels.append(level_data)
+        
+        if verbose:
+            print(f"  Branch {branch}: {configs[fork].level_id} ({fork_door}) -> "
+                  f"{len(rooms)} rooms -> {configs[rejoin].level_id} ({rejoin_door})")
+    
+    return levels
+
+
+def regenerate_levels(
+    world_config: WorldConfig,
+    levels: List[Dict[str, Any]],
+    start: int,
+    end: int = None,
+    max_chain_attempts: int = 200
+) -> List[Dict[str, Any]]:
+    """
+    Regenerate a range of levels of an existing world
+    
+    The door chain stays consistent with the untouched neighbors: the first
+    regenerated level enters where the previous level exits, and the last
+    one exits where the following level enters. Shapes and directions are
+    drawn with select_next_level_shape_and_directions, retrying the (cheap)
+    config chain until it lands on the required exit, overlaps no other
+    room and leaves the following levels where they are. If no drawn chain
+    fits, the levels keep their current shapes, sizes and doors.
+    
+    Args:
+        world_config: Configuration the world was generated with
+        levels: Current level dicts of the whole world (e.g. from
+                export.json_exporter.load_world); not modified
+        start: 0-based index of the first level to regenerate
+        end: 0-based index of the last level to regenerate (default: start)
+        max_chain_attempts: Config chains to draw before keeping the
+                            current shapes
+    
+    Returns:
+        New level dicts for levels start..end
+    
+    Raises:
+        ValueError: If the range is out of bounds
+    """
+    if end is None:
+        end = start
+    if not 0 <= start <= end < len(levels):
+        raise ValueError(f"Level range {start}-{end} out of bounds for world of {len(levels)} levels")
+    
+    opposite_dir = {
+        'left': 'right',
+        'right': 'left',
+        'up': 'down',
+        'down': 'up'
+    }
+    
+    positions = level_positions(levels)
+    
+    # Rooms outside the range stay where they are
+    others = OccupancyIndex()
+    for i, level in enumerate(levels):
+        if not start <= i <= end:
+            others.add(i, (positions[i][0], positions[i][1], level['room'].width, level['room'].height))
+    
+    prev_exit_dir = None
+    prev_shape = None
+    if start > 0:
+        prev_exit_dir = levels[start - 1]['room'].connections['exit']['direction']
+        prev_shape = levels[start - 1]['stats']['shape']
+    
+    required_exit = None
+    if end + 1 < len(levels):
+        required_exit = opposite_dir[levels[end + 1]['room'].connections['entrance']['direction']]
+    
+    def place_chain(configs, exit_dirs):
+        """Get the range's room positions, or None if the chain does not fit"""
+        rooms = [level_dimensions(c) + (d,) for c, d in zip(configs, exit_dirs)]
+        if start > 0:
+            prev_room = levels[start - 1]['room']
+            rooms.insert(0, (prev_room.width, prev_room.height, prev_exit_dir))
+            chain = chain_positions(rooms, positions[start - 1])[1:]
+            rooms.pop(0)
+        else:
+            chain = chain_positions(rooms, positions[0])
+        
+        for (x, y), (width, height, _) in zip(chain, rooms):
+            if others.find_overlap((x, y, width, height)) is not None:
+                return None
+        if end + 1 < len(levels):
+            next_room = levels[end + 1]['room']
+            last_rect = chain[-1] + rooms[-1][:2]
+            if next_room_position(last_rect, exit_dirs[-1], next_room.width, next_room.height) != positions[end + 1]:
+                return None
+        return chain
+    
+    chain = None
+    for attempt in range(max_chain_attempts):
+        configs = []
+        exit_dirs = []
+        exit_dir, shape = prev_exit_dir, prev_shape
+        for i in range(start, end + 1):
+            level_config, exit_dir = generate_level_config(i, world_config, exit_dir, shape)
+            shape = level_config.shape_type
+            configs.append(level_config)
+            exit_dirs.append(exit_dir)
+        
+        if required_exit is None or exit_dir == required_exit:
+            chain = place_chain(configs, exit_dirs)
+            if chain is not None:
+                break
+    
+    if chain is None:
+        # Nothing fits: keep each level's current shape, size and doors
+        configs = []
+        for i in range(start, end + 1):
+            room = levels[i]['room']
+            level_config, _ = generate_level_config(i, world_config, 'right', None)
+            level_config.shape_type = levels[i]['stats']['shape']
+            level_config.size = levels[i]['stats']['size']
+            level_config.entrance_dir = room.connections['entrance']['direction']
+            level_config.exit_dir = room.connections['exit']['direction'] if level_config.shape_type == 'box' else None
+            configs.append(level_config)
+        chain = positions[start:end + 1]
+    
+    new_levels = []
+    for level_config, (x, y) in zip(configs, chain):
+        level_data = generate_populated_room(level_config)
+        level_data['position'] = {'x': x, 'y': y}
+        new_levels.append(level_data)
+    return new_levels
+
+
 def print_world_summary(levels: List[Dict[str, Any]]):
     """Print summary statistics for generated world"""
     print("=" * 60)
@@ -500,6 +1051,11 @@ def print_world_summary(levels: List[Dict[str, Any]]):
     print(f"Total Enemies: {total_enemies}")
     print(f"Total Obstacles: {total_obstacles}")
     print(f"Save Points: {save_point_count}")
+    route = world_route(levels)
+    if route:
+        print(f"Final Exit: reachable ({len(route)} doors on the way)")
+    else:
+        print(f"Final Exit: NOT reachable (blocked in L{blocked_level(levels) + 1:02d})")
     print()
     
     print("Difficulty Progression:")